@@ -1,23 +1,40 @@
+import asyncio
 import contextlib
+import base64
 import gzip
+import hashlib
 import json
 import io
+import multiprocessing
 import os
 import secrets
+import shutil
 import sqlite3
+import tempfile
 import threading
-from functools import lru_cache
-from datetime import date, datetime, timedelta
+import time
+import zipfile
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait as futures_wait
+from functools import partial
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator
 from uuid import uuid4
+import numpy as np
 import requests
 from dotenv import load_dotenv
 from fitparse import FitFile
-from fastapi import Body, FastAPI, HTTPException, Query, Request
-from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse
+from fastapi import BackgroundTasks, Body, FastAPI, File, HTTPException, Query, Request, UploadFile
+from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
 
+try:
+    import brotli
+except ImportError:  # optional; compressed responses fall back to gzip
+    brotli = None
+
 load_dotenv()
 
 app = FastAPI()
@@ -29,6 +46,20 @@ app.mount("/static", StaticFiles(directory="app/static"), name="static")
 def on_startup() -> None:
     init_db()
     migrate_from_json()
+    ensure_tp_export_index()
+    ensure_activity_loads()
+    ensure_activity_view()
+    start_strava_sync_worker()
+    resume_strava_backfill()
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    stop_strava_backfill()
+    stop_strava_sync_worker()
+    stop_tss_recalc()
+    stop_fit_import_pool()
+    close_db_pool()
 
 TOKEN_FILE = Path("data/strava_tokens.json")
 CALENDAR_FILE = Path("data/calendar_items.json")
@@ -44,8 +75,15 @@ TP_EXPORT_WORKOUT_ROOTS = (
     Path("tp_export/athlete_4211127/full_history/workouts"),
     Path("tp_export/athlete_4211127/manual_test/workouts"),
 )
-STRAVA_TOKEN_URL = "https://www.strava.com/oauth/token"
-STRAVA_ACTIVITIES_URL = "https://www.strava.com/api/v3/athlete/activities"
+# STRAVA_API_BASE lets the sync run against a local stand-in server.
+STRAVA_API_BASE = os.getenv("STRAVA_API_BASE", "https://www.strava.com").rstrip("/")
+STRAVA_TOKEN_URL = f"{STRAVA_API_BASE}/oauth/token"
+STRAVA_ACTIVITIES_URL = f"{STRAVA_API_BASE}/api/v3/athlete/activities"
+STRAVA_ACTIVITY_URL = f"{STRAVA_API_BASE}/api/v3/activities"
+# Once a webhook subscription exists, STRAVA_SYNC_INTERVAL_S=0 turns polling off.
+STRAVA_SYNC_INTERVAL_S = int(os.getenv("STRAVA_SYNC_INTERVAL_S", "900"))
+STRAVA_WEBHOOK_VERIFY_TOKEN = os.getenv("STRAVA_WEBHOOK_VERIFY_TOKEN", "")
+STRAVA_BACKFILL_PER_PAGE = 200
 FILE_LOCK = threading.Lock()
 _pending_oauth_state: str = ""
 
@@ -70,11 +108,49 @@ def write_json_file(path: Path, payload: Any) -> None:
 # SQLite helpers
 # ---------------------------------------------------------------------------
 
-@contextlib.contextmanager
-def get_db():
+DB_POOL_SIZE = max(1, int(os.getenv("DB_POOL_SIZE", "8")))
+_db_pool: list[sqlite3.Connection] = []
+_db_pool_lock = threading.Lock()
+_db_slots = threading.BoundedSemaphore(DB_POOL_SIZE)
+_db_local = threading.local()
+
+
+def _open_db() -> sqlite3.Connection:
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
+    conn = sqlite3.connect(str(DB_PATH), timeout=30, check_same_thread=False, cached_statements=256)
     conn.row_factory = sqlite3.Row
+    # WAL lets readers run alongside the single writer; NORMAL sync is durable
+    # across application crashes in WAL mode and avoids an fsync per commit.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+@contextlib.contextmanager
+def get_db():
+    """Check out a pooled connection for one transaction.
+
+    At most DB_POOL_SIZE connections exist; callers beyond that wait for a
+    free one. A nested get_db() on the same thread joins the outer
+    transaction instead of taking a second connection.
+    """
+    conn = getattr(_db_local, "conn", None)
+    if conn is not None:
+        yield conn
+        return
+    _db_slots.acquire()
+    try:
+        with _db_pool_lock:
+            conn = _db_pool.pop() if _db_pool else None
+        if conn is None:
+            conn = _open_db()
+    except Exception:
+        _db_slots.release()
+        raise
+    _db_local.conn = conn
     try:
         yield conn
         conn.commit()
@@ -82,7 +158,16 @@ def get_db():
         conn.rollback()
         raise
     finally:
-        conn.close()
+        _db_local.conn = None
+        with _db_pool_lock:
+            _db_pool.append(conn)
+        _db_slots.release()
+
+
+def close_db_pool() -> None:
+    with _db_pool_lock:
+        while _db_pool:
+            _db_pool.pop().close()
 
 
 def init_db() -> None:
@@ -118,8 +203,7 @@ def init_db() -> None:
                 elev_gain_m REAL,
                 fit_id TEXT,
                 fit_filename TEXT,
-                fit_data BLOB,
-                fit_parsed_json TEXT,
+                fit_sha256 TEXT,
                 duration_min REAL,
                 distance_km REAL,
                 distance_m REAL,
@@ -167,6 +251,306 @@ def init_db() -> None:
                 hidden INTEGER NOT NULL DEFAULT 0
             )
         """)
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS activity_blobs (
+                activity_id TEXT PRIMARY KEY,
+                fit_data BLOB,
+                fit_parsed_json TEXT
+            )
+        """)
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS fit_series (
+                fit_id TEXT PRIMARY KEY,
+                format_version INTEGER NOT NULL,
+                start_time TEXT,
+                sample_count INTEGER NOT NULL DEFAULT 0,
+                present_channels TEXT,
+                offsets BLOB,
+                mask BLOB,
+                heart_rate BLOB,
+                power BLOB,
+                cadence BLOB,
+                speed BLOB,
+                distance BLOB,
+                altitude BLOB,
+                lat BLOB,
+                lng BLOB,
+                meta_json TEXT,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS activity_curves (
+                activity_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                x REAL NOT NULL,
+                value REAL NOT NULL,
+                start_date TEXT NOT NULL,
+                sport_key TEXT NOT NULL,
+                PRIMARY KEY (activity_id, kind, x)
+            )
+        """)
+        db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_activity_curves_envelope "
+            "ON activity_curves (kind, sport_key, x, value, start_date)"
+        )
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS activity_load (
+                source_id TEXT PRIMARY KEY,
+                date TEXT,
+                sport_key TEXT,
+                tss REAL NOT NULL DEFAULT 0,
+                base_json TEXT
+            )
+        """)
+        db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_activity_load_day ON activity_load (date, sport_key)"
+        )
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS daily_load (
+                date TEXT NOT NULL,
+                sport_key TEXT NOT NULL,
+                tss REAL NOT NULL,
+                PRIMARY KEY (date, sport_key)
+            )
+        """)
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS pmc_daily (
+                sport_key TEXT NOT NULL,
+                date TEXT NOT NULL,
+                tss REAL NOT NULL,
+                ctl REAL NOT NULL,
+                atl REAL NOT NULL,
+                tsb REAL NOT NULL,
+                PRIMARY KEY (sport_key, date)
+            )
+        """)
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS pmc_state (
+                sport_key TEXT PRIMARY KEY,
+                dirty_from TEXT
+            )
+        """)
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS strava_activities (
+                id TEXT PRIMARY KEY,
+                start_date TEXT,
+                start_date_local TEXT,
+                payload_json TEXT NOT NULL,
+                synced_at TEXT
+            )
+        """)
+        db.execute("CREATE INDEX IF NOT EXISTS idx_strava_activities_start ON strava_activities (start_date)")
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS activity_view (
+                id TEXT PRIMARY KEY,
+                start_date_local TEXT NOT NULL,
+                row_json TEXT NOT NULL,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        db.execute("CREATE INDEX IF NOT EXISTS idx_activity_view_start ON activity_view (start_date_local, id)")
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS calendar_items (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                date TEXT NOT NULL,
+                created_at TEXT,
+                item_json TEXT NOT NULL,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        db.execute("CREATE INDEX IF NOT EXISTS idx_calendar_items_date_kind ON calendar_items (date, kind)")
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS workout_pairs (
+                id TEXT PRIMARY KEY,
+                planned_id TEXT NOT NULL,
+                strava_id TEXT NOT NULL,
+                created_at TEXT
+            )
+        """)
+        db.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_workout_pairs_planned ON workout_pairs (planned_id)")
+        db.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_workout_pairs_strava ON workout_pairs (strava_id)")
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS strava_sync_state (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS threshold_history (
+                kind TEXT NOT NULL,
+                sport_key TEXT NOT NULL,
+                effective_from TEXT NOT NULL,
+                value REAL,
+                PRIMARY KEY (kind, sport_key, effective_from)
+            )
+        """)
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS tp_export_files (
+                workout_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                path TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                start_time TEXT,
+                laps_json TEXT,
+                PRIMARY KEY (workout_id, kind)
+            )
+        """)
+        migrate_schema(db)
+        _ensure_tp_stream_index(db)
+
+
+def _ensure_tp_stream_index(db: sqlite3.Connection) -> None:
+    # tp_streams is written by the TrainingPeaks export importer, so it may
+    # appear after the schema step ran; check on every startup.
+    if db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tp_streams'").fetchone():
+        db.execute("CREATE INDEX IF NOT EXISTS idx_tp_streams_workout_id ON tp_streams (workout_id)")
+
+
+def _schema_v1_hot_path_indexes(db: sqlite3.Connection) -> None:
+    db.execute("CREATE INDEX IF NOT EXISTS idx_activities_fit_id ON activities (fit_id)")
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_activities_source_hidden_start "
+        "ON activities (source, hidden, start_date_local)"
+    )
+    _ensure_tp_stream_index(db)
+
+
+def _schema_v2_split_activity_blobs(db: sqlite3.Connection) -> None:
+    """Move raw FIT bytes and legacy parsed JSON out of the activities row."""
+    columns = {r["name"] for r in db.execute("PRAGMA table_info(activities)").fetchall()}
+    if "fit_data" not in columns:
+        return
+    db.execute(
+        """
+        INSERT OR IGNORE INTO activity_blobs (activity_id, fit_data, fit_parsed_json)
+        SELECT id, fit_data, fit_parsed_json FROM activities
+        WHERE fit_data IS NOT NULL OR fit_parsed_json IS NOT NULL
+        """
+    )
+    try:
+        db.execute("ALTER TABLE activities DROP COLUMN fit_data")
+        db.execute("ALTER TABLE activities DROP COLUMN fit_parsed_json")
+    except sqlite3.OperationalError:
+        # SQLite < 3.35 cannot drop columns; empty them so rows stay narrow.
+        db.execute("UPDATE activities SET fit_data = NULL, fit_parsed_json = NULL")
+
+
+def _schema_v3_calendar_items_table(db: sqlite3.Connection) -> None:
+    """Import calendar_items.json once; the file is left in place as a backup."""
+    _save_calendar_rows(db, _legacy_calendar_items())
+
+
+def _schema_v4_workout_pairs_table(db: sqlite3.Connection) -> None:
+    """Import workout_pairs.json once; later links win if the file holds duplicates."""
+    raw = read_json_file(PAIRS_FILE, [])
+    db.executemany(
+        "INSERT OR REPLACE INTO workout_pairs (id, planned_id, strava_id, created_at) VALUES (?, ?, ?, ?)",
+        [
+            (str(p.get("id") or uuid4()), str(p["planned_id"]), str(p["strava_id"]), p.get("created_at"))
+            for p in (raw if isinstance(raw, list) else [])
+            if p.get("planned_id") and p.get("strava_id")
+        ],
+    )
+
+
+def _schema_v5_activity_keyset_indexes(db: sqlite3.Connection) -> None:
+    """Cover the (start_date_local, id) keyset order used by /ui/activities."""
+    db.execute("DROP INDEX IF EXISTS idx_activities_source_hidden_start")
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_activities_source_hidden_start_id "
+        "ON activities (source, hidden, start_date_local, id)"
+    )
+    db.execute("DROP INDEX IF EXISTS idx_strava_activities_start_local")
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_strava_activities_start_local_id ON strava_activities (start_date_local, id)"
+    )
+    db.execute("CREATE INDEX IF NOT EXISTS idx_activity_overrides_date ON activity_overrides (date)")
+
+
+def _schema_v6_row_versions(db: sqlite3.Connection) -> None:
+    """Per-row versions behind the ETags on /fit, /ui/activities and /calendar-items."""
+    for table in ("fit_series", "activity_view", "calendar_items"):
+        columns = {r["name"] for r in db.execute(f"PRAGMA table_info({table})").fetchall()}
+        if "version" not in columns:
+            db.execute(f"ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+
+
+def _schema_v7_fit_content_hashes(db: sqlite3.Connection) -> None:
+    """Hash stored FIT bytes so re-uploads can be matched.
+
+    Existing duplicates are left visible; POST /import-fit/dedup reports them
+    (dry_run=true) and hides them on request.
+    """
+    columns = {r["name"] for r in db.execute("PRAGMA table_info(activities)").fetchall()}
+    if "fit_sha256" not in columns:
+        db.execute("ALTER TABLE activities ADD COLUMN fit_sha256 TEXT")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_activities_fit_sha256 ON activities (fit_sha256)")
+    rows = db.execute(
+        """
+        SELECT b.activity_id, b.fit_data FROM activity_blobs b JOIN activities a ON a.id = b.activity_id
+        WHERE a.fit_sha256 IS NULL AND b.fit_data IS NOT NULL
+        """
+    )
+    for row in rows:
+        db.execute(
+            "UPDATE activities SET fit_sha256 = ? WHERE id = ?",
+            (hashlib.sha256(row["fit_data"]).hexdigest(), row["activity_id"]),
+        )
+
+
+def _schema_v8_activity_curves_backfill(db: sqlite3.Connection) -> None:
+    """Curves for activities whose series was stored before curves were computed on import.
+
+    Legacy JSON and TrainingPeaks series get theirs when load_fit_parsed first
+    moves them into fit_series.
+    """
+    rows = db.execute(
+        """
+        SELECT a.id, a.start_date_local, a.type, f.*
+        FROM activities a JOIN fit_series f ON f.fit_id = a.fit_id
+        WHERE NOT EXISTS (SELECT 1 FROM activity_curves c WHERE c.activity_id = a.id)
+        """
+    )
+    for row in rows:
+        cols = _fit_series_row_columns(row)
+        if cols is not None:
+            _save_activity_curves(db, row["id"], dict(row), cols)
+
+
+# Ordered schema steps; PRAGMA user_version records how many have been applied.
+_SCHEMA_STEPS = (
+    _schema_v1_hot_path_indexes,
+    _schema_v2_split_activity_blobs,
+    _schema_v3_calendar_items_table,
+    _schema_v4_workout_pairs_table,
+    _schema_v5_activity_keyset_indexes,
+    _schema_v6_row_versions,
+    _schema_v7_fit_content_hashes,
+    _schema_v8_activity_curves_backfill,
+)
+
+
+def migrate_schema(db: sqlite3.Connection) -> None:
+    """Apply pending schema steps, each in its own transaction with its user_version bump.
+
+    A step that fails rolls back with its version number, so the next start
+    retries it from a clean state instead of skipping or half-applying it.
+    """
+    if db.in_transaction:
+        db.commit()
+    version = db.execute("PRAGMA user_version").fetchone()[0]
+    for number, step in enumerate(_SCHEMA_STEPS[version:], start=version + 1):
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            step(db)
+            db.execute(f"PRAGMA user_version = {number}")
+        except Exception:
+            db.rollback()
+            raise
+        db.commit()
 
 
 def migrate_from_json() -> None:
@@ -191,8 +575,10 @@ def migrate_from_json() -> None:
                 ae = item.get("analysis_edits", {})
                 db.execute(
                     _activity_insert_sql(),
-                    _activity_insert_params(item, fit_data, fit_parsed_json, cf, ae),
+                    _activity_insert_params(item, cf, ae),
                 )
+                _save_activity_blobs(db, item["id"], fit_data, fit_parsed_json)
+                refresh_activity_view(db, item["id"])
 
     if ACTIVITY_OVERRIDES_FILE.exists():
         overrides = read_json_file(ACTIVITY_OVERRIDES_FILE, {})
@@ -211,7 +597,7 @@ def _activity_insert_sql() -> str:
             tss_override, tss_source, if_value, np_value, hr_tss,
             work_kj, calories, avg_speed, avg_power, avg_hr, min_hr, max_hr,
             min_power, max_power, elev_gain_m,
-            fit_id, fit_filename, fit_data, fit_parsed_json,
+            fit_id, fit_filename, fit_sha256,
             duration_min, distance_km, distance_m, elevation_m,
             distance_unit, elevation_unit,
             analysis_edits, hidden, created_at
@@ -221,7 +607,7 @@ def _activity_insert_sql() -> str:
             ?,?,?,?,?,
             ?,?,?,?,?,?,?,
             ?,?,?,
-            ?,?,?,?,
+            ?,?,?,
             ?,?,?,?,
             ?,?,
             ?,?,?
@@ -231,8 +617,6 @@ def _activity_insert_sql() -> str:
 
 def _activity_insert_params(
     item: dict[str, Any],
-    fit_data: bytes | None,
-    fit_parsed_json: str | None,
     cf: list,
     ae: dict,
 ) -> tuple:
@@ -266,8 +650,7 @@ def _activity_insert_params(
         item.get("elev_gain_m"),
         item.get("fit_id"),
         item.get("fit_filename"),
-        fit_data,
-        fit_parsed_json,
+        item.get("fit_sha256"),
         item.get("duration_min"),
         item.get("distance_km"),
         item.get("distance_m"),
@@ -280,6 +663,29 @@ def _activity_insert_params(
     )
 
 
+def _save_activity_blobs(
+    db: sqlite3.Connection,
+    activity_id: str,
+    fit_data: bytes | None,
+    fit_parsed_json: str | None = None,
+) -> None:
+    if fit_data is None and fit_parsed_json is None:
+        db.execute("DELETE FROM activity_blobs WHERE activity_id = ?", (activity_id,))
+        return
+    db.execute(
+        "INSERT OR REPLACE INTO activity_blobs (activity_id, fit_data, fit_parsed_json) VALUES (?,?,?)",
+        (activity_id, fit_data, fit_parsed_json),
+    )
+
+
+def load_activity_fit_data(activity_id: str) -> bytes | None:
+    with get_db() as db:
+        row = db.execute(
+            "SELECT fit_data FROM activity_blobs WHERE activity_id = ?", (activity_id,)
+        ).fetchone()
+    return bytes(row["fit_data"]) if row and row["fit_data"] else None
+
+
 def _upsert_override(db: sqlite3.Connection, aid: str, override: dict[str, Any]) -> None:
     cf = override.get("comments_feed", [])
     ae = override.get("analysis_edits", {})
@@ -366,13 +772,34 @@ def load_tokens() -> dict:
     return data
 
 
+# Keep-alive connections per Strava host: webhook fetches, the sync worker and
+# the backfill can each hold one.
+STRAVA_HTTP_POOL_SIZE = max(1, int(os.getenv("STRAVA_HTTP_POOL_SIZE", "4")))
+
+
+def _new_strava_session() -> requests.Session:
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=STRAVA_HTTP_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# One keep-alive session for every Strava call so TLS handshakes are reused.
+_strava_http = _new_strava_session()
+_strava_token_lock = threading.Lock()
+STRAVA_TOKEN_REFRESH_MARGIN_S = 300
+STRAVA_MAX_RETRIES = 3
+STRAVA_MAX_BACKOFF_S = 30.0
+
+
 def refresh_access_token(refresh_token: str) -> dict:
     client_id = os.getenv("STRAVA_CLIENT_ID")
     client_secret = os.getenv("STRAVA_CLIENT_SECRET")
     if not client_id or not client_secret:
         raise HTTPException(status_code=500, detail="Missing Strava client credentials.")
 
-    resp = requests.post(
+    resp = _strava_http.post(
         STRAVA_TOKEN_URL,
         data={
             "client_id": client_id,
@@ -385,183 +812,689 @@ def refresh_access_token(refresh_token: str) -> dict:
     if resp.status_code != 200:
         raise HTTPException(status_code=resp.status_code, detail=resp.text)
 
-    token_data = resp.json()
+    # Refresh responses omit the athlete block; keep what the OAuth exchange saved.
+    token_data = {**read_json_file(TOKEN_FILE, {}), **resp.json()}
     save_tokens(token_data)
     return token_data
 
 
-def fetch_activities(after: int | None = None, before: int | None = None, per_page: int = 100) -> list[dict[str, Any]]:
-    token_data = load_tokens()
-    access_token = token_data.get("access_token")
-    if not access_token:
-        raise HTTPException(status_code=400, detail="Saved token file is missing access_token.")
-
-    def do_fetch(token: str) -> list[dict[str, Any]] | None:
-        all_items: list[dict[str, Any]] = []
-        page = 1
-        max_pages = 10
-        while page <= max_pages:
-            params: dict[str, Any] = {"per_page": per_page, "page": page}
-            if after is not None:
-                params["after"] = after
-            if before is not None:
-                params["before"] = before
-            resp = requests.get(
-                STRAVA_ACTIVITIES_URL,
-                headers={"Authorization": f"Bearer {token}"},
-                params=params,
-                timeout=30,
-            )
-            if resp.status_code == 401:
-                return None
-            if resp.status_code != 200:
-                raise HTTPException(status_code=resp.status_code, detail=resp.text)
-            batch = resp.json()
-            if not isinstance(batch, list):
-                break
-            all_items.extend(batch)
-            if len(batch) < per_page:
-                break
-            page += 1
-        return all_items
+def _token_expiring(token_data: dict) -> bool:
+    try:
+        expires_at = float(token_data.get("expires_at") or 0)
+    except (TypeError, ValueError):
+        return False
+    return bool(expires_at) and expires_at - time.time() < STRAVA_TOKEN_REFRESH_MARGIN_S
 
-    fetched = do_fetch(access_token)
-    if fetched is None:
+
+def strava_access_token(stale_token: str | None = None) -> str:
+    """Return a usable access token, refreshing shortly before expires_at.
+
+    Pass the token a request was rejected with as stale_token to force a
+    refresh. Concurrent callers serialize on one lock and re-read the token
+    file inside it, so a single refresh serves all of them.
+    """
+    token_data = load_tokens()
+    if stale_token is None and not _token_expiring(token_data) and token_data.get("access_token"):
+        return token_data["access_token"]
+    with _strava_token_lock:
+        token_data = load_tokens()
+        current = token_data.get("access_token")
+        if current and current != stale_token and not _token_expiring(token_data):
+            return current
         refresh_token = token_data.get("refresh_token")
         if not refresh_token:
+            if current and stale_token is None:
+                return current
             raise HTTPException(status_code=401, detail="Access token expired and no refresh_token available.")
-        token_data = refresh_access_token(refresh_token)
-        fetched = do_fetch(token_data.get("access_token", ""))
-        if fetched is None:
-            raise HTTPException(status_code=401, detail="Failed to refresh Strava token.")
-    return fetched
+        return refresh_access_token(refresh_token).get("access_token", "")
 
 
-def load_calendar_items() -> list[dict[str, Any]]:
-    if not CALENDAR_FILE.exists():
-        items: list[dict[str, Any]] = []
-        if PLANNED_FILE.exists():
-            try:
-                legacy = read_json_file(PLANNED_FILE, [])
-                if isinstance(legacy, list):
-                    for row in legacy:
-                        items.append(
-                            {
-                                "id": row.get("id") or str(uuid4()),
-                                "kind": "workout",
-                                "workout_type": row.get("workout_type", "Other"),
-                                "date": row.get("date"),
-                                "title": row.get("title", "Untitled Workout"),
-                                "duration_min": row.get("planned_duration_min", 0),
-                                "distance_km": row.get("planned_distance_km", 0),
-                                "intensity": row.get("planned_intensity", 6),
-                                "description": row.get("description", ""),
-                                "created_at": row.get("created_at")
-                                or datetime.utcnow().isoformat(timespec="seconds") + "Z",
-                            }
-                        )
-            except json.JSONDecodeError:
-                items = []
-        save_calendar_items(items)
-        return items
+def _retry_delay(resp: requests.Response | None, attempt: int) -> float:
+    retry_after = resp.headers.get("Retry-After") if resp is not None else None
+    try:
+        return float(retry_after) if retry_after is not None else min(0.5 * 2**attempt, STRAVA_MAX_BACKOFF_S)
+    except ValueError:
+        return min(0.5 * 2**attempt, STRAVA_MAX_BACKOFF_S)
 
-    raw = read_json_file(CALENDAR_FILE, [])
-    if isinstance(raw, list):
-        return raw
-    return []
 
-def save_calendar_items(items: list[dict[str, Any]]) -> None:
-    write_json_file(CALENDAR_FILE, items)
+def _strava_get(url: str, params: dict[str, Any]) -> requests.Response:
+    """GET a Strava API URL on the shared session.
 
-def load_pairs() -> list[dict[str, Any]]:
-    raw = read_json_file(PAIRS_FILE, [])
-    if isinstance(raw, list):
-        return raw
-    return []
+    A 401 forces one token refresh. 429, 5xx and connection errors back off
+    exponentially (or per Retry-After) for up to STRAVA_MAX_RETRIES tries; a
+    wait longer than STRAVA_MAX_BACKOFF_S is left to the caller.
+    """
+    token = strava_access_token()
+    refreshed = False
+    attempt = 0
+    while True:
+        try:
+            resp = _strava_http.get(url, headers={"Authorization": f"Bearer {token}"}, params=params, timeout=30)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= STRAVA_MAX_RETRIES:
+                raise
+            time.sleep(_retry_delay(None, attempt))
+            attempt += 1
+            continue
+        if resp.status_code == 401:
+            if refreshed:
+                raise HTTPException(status_code=401, detail="Failed to refresh Strava token.")
+            token = strava_access_token(stale_token=token)
+            refreshed = True
+            continue
+        if resp.status_code == 429 or resp.status_code >= 500:
+            delay = _retry_delay(resp, attempt)
+            if attempt < STRAVA_MAX_RETRIES and delay <= STRAVA_MAX_BACKOFF_S:
+                time.sleep(delay)
+                attempt += 1
+                continue
+        return resp
 
-def save_pairs(items: list[dict[str, Any]]) -> None:
-    write_json_file(PAIRS_FILE, items)
 
-def load_activity_overrides() -> dict[str, dict[str, Any]]:
-    with get_db() as db:
-        rows = db.execute("SELECT * FROM activity_overrides").fetchall()
-    return {r["id"]: override_to_dict(r) for r in rows}
+def fetch_activities(after: int | None = None, before: int | None = None, per_page: int = 100) -> list[dict[str, Any]]:
+    all_items: list[dict[str, Any]] = []
+    page = 1
+    max_pages = 10
+    while page <= max_pages:
+        params: dict[str, Any] = {"per_page": per_page, "page": page}
+        if after is not None:
+            params["after"] = after
+        if before is not None:
+            params["before"] = before
+        resp = _strava_get(STRAVA_ACTIVITIES_URL, params)
+        if resp.status_code != 200:
+            raise HTTPException(status_code=resp.status_code, detail=resp.text)
+        batch = resp.json()
+        if not isinstance(batch, list):
+            break
+        all_items.extend(batch)
+        if len(batch) < per_page:
+            break
+        page += 1
+    return all_items
 
 
-def save_activity_overrides(items: dict[str, dict[str, Any]]) -> None:
-    with get_db() as db:
-        for aid, override in items.items():
-            _upsert_override(db, aid, override)
+# ---------------------------------------------------------------------------
+# Strava mirror
+# ---------------------------------------------------------------------------
 
+_strava_sync_lock = threading.Lock()
+_strava_sync_stop = threading.Event()
+_strava_sync_thread: threading.Thread | None = None
 
-def load_imported_activities() -> list[dict[str, Any]]:
-    with get_db() as db:
-        rows = db.execute(
-            "SELECT * FROM activities WHERE source = 'fit' AND hidden = 0"
-        ).fetchall()
-    return [row_to_activity(r) for r in rows]
+
+def _strava_epoch(value: Any) -> int | None:
+    text = _iso(value)
+    if not text:
+        return None
+    try:
+        return int(datetime.fromisoformat(text.replace("Z", "+00:00")).timestamp())
+    except ValueError:
+        return None
 
 
-def get_imported_activity(activity_id: str) -> dict[str, Any] | None:
+def get_strava_activity(activity_id: str) -> dict[str, Any] | None:
     with get_db() as db:
         row = db.execute(
-            "SELECT * FROM activities WHERE id = ?", (activity_id,)
+            "SELECT payload_json FROM strava_activities WHERE id = ?", (activity_id,)
         ).fetchone()
-    return row_to_activity(row) if row else None
+    return json.loads(row["payload_json"]) if row else None
 
 
-def get_imported_activity_raw(activity_id: str) -> sqlite3.Row | None:
+def _upsert_strava_activities(db: sqlite3.Connection, rows: list[dict[str, Any]]) -> None:
+    synced_at = datetime.utcnow().isoformat(timespec="seconds") + "Z"
+    db.executemany(
+        """
+        INSERT INTO strava_activities (id, start_date, start_date_local, payload_json, synced_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            start_date = excluded.start_date,
+            start_date_local = excluded.start_date_local,
+            payload_json = excluded.payload_json,
+            synced_at = excluded.synced_at
+        """,
+        [
+            (
+                str(r.get("id")),
+                _iso(r.get("start_date")),
+                _iso(r.get("start_date_local")),
+                json.dumps(r),
+                synced_at,
+            )
+            for r in rows
+        ],
+    )
+    for r in rows:
+        refresh_activity_view(db, str(r.get("id")))
+
+
+def _set_strava_sync_state(db: sqlite3.Connection, key: str, value: str | None) -> None:
+    db.execute(
+        "INSERT INTO strava_sync_state (key, value) VALUES (?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (key, value),
+    )
+
+
+def strava_sync_state() -> dict[str, Any]:
     with get_db() as db:
-        return db.execute(
-            "SELECT * FROM activities WHERE id = ?", (activity_id,)
-        ).fetchone()
+        state = {r["key"]: r["value"] for r in db.execute("SELECT key, value FROM strava_sync_state").fetchall()}
+        count, newest = db.execute("SELECT COUNT(*), MAX(start_date) FROM strava_activities").fetchone()
+    return {
+        "mirrored": count,
+        "newest_start_date": newest,
+        "last_synced_at": state.get("last_synced_at"),
+        "last_webhook_at": state.get("last_webhook_at"),
+    }
 
 
-def apply_parsed_fit_to_activity(item: dict[str, Any], parsed: dict[str, Any], file_id: str, filename: str) -> dict[str, Any]:
-    summary = parsed.get("summary", {})
-    laps = parsed.get("laps", []) if isinstance(parsed.get("laps"), list) else []
-    lap_duration_s = 0.0
-    for lap in laps:
-        if isinstance(lap, dict):
-            try:
-                lap_duration_s += float(lap.get("duration_s") or 0)
-            except (TypeError, ValueError):
-                pass
-    duration_s = float(summary.get("duration_s") or 0)
-    if duration_s <= 0 and lap_duration_s > 0:
-        duration_s = lap_duration_s
-    if duration_s <= 0:
-        series = parsed.get("series", [])
-        if isinstance(series, list) and len(series) >= 2:
-            try:
-                start_ts = datetime.fromisoformat(str(series[0].get("timestamp")))
-                end_ts = datetime.fromisoformat(str(series[-1].get("timestamp")))
-                duration_s = max(0.0, (end_ts - start_ts).total_seconds())
-            except Exception:
-                pass
+def sync_strava_activities() -> dict[str, Any]:
+    """Pull activities newer than the sync cursor into strava_activities.
 
-    distance_m = float(summary.get("distance_m") or 0)
-    if distance_m <= 0 and laps:
-        lap_dist = 0.0
-        for lap in laps:
-            if isinstance(lap, dict):
-                try:
-                    lap_dist += float(lap.get("distance_m") or 0)
-                except (TypeError, ValueError):
-                    pass
-        if lap_dist > 0:
-            distance_m = lap_dist
+    Strava returns `after` queries oldest first, so a run cut short by the
+    page cap in fetch_activities() picks up where it stopped next time. The
+    cursor is kept apart from MAX(start_date) because webhook events can
+    mirror a new activity before older ones were polled.
 
-    item["fit_id"] = file_id
-    item["fit_filename"] = Path(filename).name
-    item["distance"] = float(distance_m or item.get("distance") or 0)
-    item["moving_time"] = float(duration_s or item.get("moving_time") or 0)
-    if summary.get("start"):
-        item["start_date_local"] = str(summary.get("start"))
-    sport = str(summary.get("sport") or item.get("type") or "Ride").title()
-    item["type"] = sport
-    item["if_value"] = summary.get("if")
-    item["np_value"] = summary.get("normalized_power")
+    The cursor stops one second short of the newest start seen: more
+    activities may share that second beyond the last page read, and the ones
+    already mirrored are simply upserted again.
+    """
+    with _strava_sync_lock:
+        with get_db() as db:
+            row = db.execute("SELECT value FROM strava_sync_state WHERE key = 'sync_cursor'").fetchone()
+            if row:
+                cursor = int(row["value"])
+            else:
+                cursor = _strava_epoch(db.execute("SELECT MAX(start_date) FROM strava_activities").fetchone()[0]) or 0
+        fetched = [r for r in fetch_activities(after=cursor) if r.get("id") is not None]
+        cursor = max([cursor, *(e - 1 for e in (_strava_epoch(r.get("start_date")) for r in fetched) if e is not None)])
+        with get_db() as db:
+            _upsert_strava_activities(db, fetched)
+            _set_strava_sync_state(db, "sync_cursor", str(cursor))
+            _set_strava_sync_state(db, "last_synced_at", datetime.utcnow().isoformat(timespec="seconds") + "Z")
+            sync_external_loads(fetched)
+    return {"fetched": len(fetched), **strava_sync_state()}
+
+
+def _background_strava_sync() -> None:
+    if not read_json_file(TOKEN_FILE, {}).get("access_token"):
+        return
+    try:
+        sync_strava_activities()
+    except (HTTPException, requests.RequestException):
+        # Offline or revoked; the next tick or a manual sync retries.
+        pass
+
+
+def _strava_sync_loop() -> None:
+    while True:
+        _background_strava_sync()
+        if _strava_sync_stop.wait(STRAVA_SYNC_INTERVAL_S):
+            return
+
+
+def start_strava_sync_worker() -> None:
+    global _strava_sync_thread
+    if STRAVA_SYNC_INTERVAL_S <= 0 or (_strava_sync_thread and _strava_sync_thread.is_alive()):
+        return
+    _strava_sync_stop.clear()
+    _strava_sync_thread = threading.Thread(target=_strava_sync_loop, name="strava-sync", daemon=True)
+    _strava_sync_thread.start()
+
+
+def stop_strava_sync_worker() -> None:
+    global _strava_sync_thread
+    _strava_sync_stop.set()
+    if _strava_sync_thread:
+        _strava_sync_thread.join(timeout=5)
+        _strava_sync_thread = None
+
+
+# Strava reports usage as "<15-minute>,<daily>" pairs. The read-specific
+# headers are newer and stricter, so both are honoured when present.
+_STRAVA_RATE_HEADERS = (
+    ("X-RateLimit-Limit", "X-RateLimit-Usage"),
+    ("X-ReadRateLimit-Limit", "X-ReadRateLimit-Usage"),
+)
+_strava_backfill_stop = threading.Event()
+_strava_backfill_thread: threading.Thread | None = None
+
+
+def _rate_pair(raw: str | None) -> tuple[int, int] | None:
+    try:
+        short, daily = (int(x) for x in str(raw or "").split(","))
+    except ValueError:
+        return None
+    return short, daily
+
+
+def strava_rate_limit_delay(headers: Any, throttled: bool = False, now: datetime | None = None) -> float:
+    """Seconds to wait before the next Strava request.
+
+    Once a budget is half spent the remaining calls are spread evenly over
+    what is left of its window; the last 10% is kept for interactive use
+    and waits for the reset (quarter-hour boundaries, midnight UTC).
+    """
+    now = now or datetime.now(timezone.utc)
+    short_reset = 900 - (now.minute % 15) * 60 - now.second
+    daily_reset = 86400 - (now.hour * 3600 + now.minute * 60 + now.second)
+    delay = float(short_reset) if throttled else 0.0
+    for limit_key, usage_key in _STRAVA_RATE_HEADERS:
+        limits = _rate_pair(headers.get(limit_key))
+        usage = _rate_pair(headers.get(usage_key))
+        if not limits or not usage:
+            continue
+        for limit, used, reset in ((limits[0], usage[0], short_reset), (limits[1], usage[1], daily_reset)):
+            remaining = limit - used
+            if remaining <= max(1, limit // 10):
+                delay = max(delay, float(reset))
+            elif used * 2 >= limit:
+                delay = max(delay, reset / remaining)
+    return delay
+
+
+def strava_backfill_state() -> dict[str, Any]:
+    with get_db() as db:
+        row = db.execute("SELECT value FROM strava_sync_state WHERE key = 'backfill'").fetchone()
+    state = json.loads(row["value"]) if row and row["value"] else {"status": "idle"}
+    state["active"] = bool(_strava_backfill_thread and _strava_backfill_thread.is_alive())
+    return state
+
+
+def _save_strava_backfill_state(db: sqlite3.Connection, state: dict[str, Any]) -> None:
+    state = {k: v for k, v in state.items() if k != "active"}
+    state["updated_at"] = datetime.utcnow().isoformat(timespec="seconds") + "Z"
+    _set_strava_sync_state(db, "backfill", json.dumps(state))
+
+
+def _run_strava_backfill() -> None:
+    """Page forward through the athlete's history from the checkpointed cursor.
+
+    Each page is an `after=cursor` window bounded by the job's `before`, so
+    the cursor alone says where to resume after a restart.
+    """
+    state = strava_backfill_state()
+    while not _strava_backfill_stop.is_set():
+        params = {"after": state["cursor"], "before": state["before"], "per_page": STRAVA_BACKFILL_PER_PAGE}
+        try:
+            resp = _strava_get(STRAVA_ACTIVITIES_URL, params)
+            if resp.status_code == 429 or resp.status_code >= 500:
+                delay = strava_rate_limit_delay(resp.headers, throttled=resp.status_code == 429)
+                state.update(
+                    status="rate_limited" if resp.status_code == 429 else "retrying",
+                    sleep_s=max(delay, 30.0),
+                )
+                with get_db() as db:
+                    _save_strava_backfill_state(db, state)
+                _strava_backfill_stop.wait(state["sleep_s"])
+                continue
+            if resp.status_code != 200:
+                raise HTTPException(status_code=resp.status_code, detail=resp.text)
+            batch = resp.json()
+        except (HTTPException, requests.RequestException, ValueError) as err:
+            state.update(status="error", error=str(getattr(err, "detail", err)))
+            with get_db() as db:
+                _save_strava_backfill_state(db, state)
+            return
+        rows = [r for r in batch if isinstance(r, dict) and r.get("id") is not None] if isinstance(batch, list) else []
+        epochs = [e for e in (_strava_epoch(r.get("start_date")) for r in rows) if e is not None]
+        # Re-read the newest second next page: the page may have cut through
+        # activities sharing it, and repeats are absorbed by the upsert.
+        cursor = max([state["cursor"], *(e - 1 for e in epochs)])
+        if rows and cursor == state["cursor"]:
+            # A full page sharing one start second; step past it rather than loop.
+            cursor += 1
+        state.update(
+            cursor=cursor,
+            fetched=state.get("fetched", 0) + len(rows),
+            pages=state.get("pages", 0) + 1,
+            status="done" if len(rows) < STRAVA_BACKFILL_PER_PAGE else "running",
+            error=None,
+        )
+        starts = [x for x in (_iso(r.get("start_date")) for r in rows) if x]
+        if starts:
+            state["newest_start_date"] = max(starts)
+        delay = strava_rate_limit_delay(resp.headers)
+        state["sleep_s"] = delay
+        with get_db() as db:
+            _upsert_strava_activities(db, rows)
+            sync_external_loads(rows)
+            _save_strava_backfill_state(db, state)
+        if state["status"] == "done":
+            return
+        if delay:
+            _strava_backfill_stop.wait(delay)
+
+
+def start_strava_backfill(restart: bool = False) -> dict[str, Any]:
+    """Start the backfill, resuming from the stored checkpoint unless it finished or restart is set."""
+    global _strava_backfill_thread
+    if _strava_backfill_thread and _strava_backfill_thread.is_alive():
+        return strava_backfill_state()
+    state = strava_backfill_state()
+    if restart or state.get("status") in ("idle", "done"):
+        state = {
+            "status": "running",
+            "cursor": 0,
+            "before": int(datetime.now(timezone.utc).timestamp()),
+            "fetched": 0,
+            "pages": 0,
+            "started_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        }
+    else:
+        state.update(status="running", error=None)
+    with get_db() as db:
+        _save_strava_backfill_state(db, state)
+    _strava_backfill_stop.clear()
+    _strava_backfill_thread = threading.Thread(target=_run_strava_backfill, name="strava-backfill", daemon=True)
+    _strava_backfill_thread.start()
+    return strava_backfill_state()
+
+
+def resume_strava_backfill() -> None:
+    """Restart a backfill that was interrupted by shutdown."""
+    if strava_backfill_state().get("status") in ("running", "rate_limited", "retrying"):
+        start_strava_backfill()
+
+
+def stop_strava_backfill() -> None:
+    global _strava_backfill_thread
+    _strava_backfill_stop.set()
+    if _strava_backfill_thread:
+        _strava_backfill_thread.join(timeout=5)
+        _strava_backfill_thread = None
+
+
+# Fields a webhook "update" event can carry, mapped onto the activity payload.
+_STRAVA_EVENT_FIELDS = {"title": "name", "type": "type", "sport_type": "sport_type", "private": "private"}
+# Detail-only arrays the calendar never reads; dropped to keep mirrored rows small.
+_STRAVA_DETAIL_ONLY_FIELDS = ("segment_efforts", "splits_metric", "splits_standard", "laps", "best_efforts", "photos")
+
+
+def _mirror_strava_activity(activity_id: str) -> None:
+    resp = _strava_get(f"{STRAVA_ACTIVITY_URL}/{activity_id}", {})
+    if resp.status_code == 404:
+        _forget_strava_activity(activity_id)
+        return
+    if resp.status_code != 200:
+        raise HTTPException(status_code=resp.status_code, detail=resp.text)
+    row = {k: v for k, v in resp.json().items() if k not in _STRAVA_DETAIL_ONLY_FIELDS}
+    with get_db() as db:
+        _upsert_strava_activities(db, [row])
+        sync_external_loads([row])
+
+
+def _forget_strava_activity(activity_id: str, settings: dict[str, Any] | None = None) -> None:
+    settings = settings or effective_settings()
+    with get_db() as db:
+        db.execute("DELETE FROM strava_activities WHERE id = ?", (activity_id,))
+        refresh_activity_view(db, activity_id)
+        _write_activity_load(db, activity_id, None, None, settings)
+        for pair in _delete_pairs(db, "strava_id", activity_id):
+            refresh_planned_load(db, get_calendar_item(pair["planned_id"]), pair["planned_id"], settings)
+
+
+def _forget_strava_athlete() -> None:
+    """Drop the whole mirror and the saved tokens once the athlete revokes access."""
+    stop_strava_backfill()
+    settings = effective_settings()
+    with get_db() as db:
+        for row in db.execute("SELECT id FROM strava_activities").fetchall():
+            _forget_strava_activity(row["id"], settings)
+        db.execute("DELETE FROM strava_sync_state WHERE key IN ('sync_cursor', 'backfill')")
+    with FILE_LOCK:
+        TOKEN_FILE.unlink(missing_ok=True)
+
+
+def handle_strava_event(event: dict[str, Any]) -> None:
+    """Apply one webhook event to the local mirror.
+
+    Deletes and title/type updates are applied without calling Strava; a
+    create, or an update for an activity not yet mirrored, fetches just that
+    activity. Load rows changed here mark the PMC dirty from their day. An
+    athlete deauthorization removes everything mirrored from Strava.
+    """
+    if event.get("object_type") == "athlete":
+        if str((event.get("updates") or {}).get("authorized")).lower() == "false":
+            _forget_strava_athlete()
+        return
+    if event.get("object_type") != "activity" or event.get("object_id") is None:
+        return
+    activity_id = str(event["object_id"])
+    aspect = event.get("aspect_type")
+    if aspect == "delete":
+        _forget_strava_activity(activity_id)
+        return
+    if aspect == "update":
+        updates = event.get("updates") or {}
+        current = get_strava_activity(activity_id)
+        if current is not None and set(updates) <= set(_STRAVA_EVENT_FIELDS):
+            for key, value in updates.items():
+                current[_STRAVA_EVENT_FIELDS[key]] = value
+            with get_db() as db:
+                _upsert_strava_activities(db, [current])
+                sync_external_loads([current])
+            return
+    if aspect in ("create", "update"):
+        _mirror_strava_activity(activity_id)
+
+
+def _background_strava_event(event: dict[str, Any]) -> None:
+    try:
+        handle_strava_event(event)
+    except (HTTPException, requests.RequestException):
+        # The periodic or manual sync picks the activity up later.
+        pass
+
+
+def _legacy_calendar_items() -> list[dict[str, Any]]:
+    """Items from calendar_items.json, or from the planned_workouts.json that preceded it."""
+    if CALENDAR_FILE.exists():
+        raw = read_json_file(CALENDAR_FILE, [])
+        return raw if isinstance(raw, list) else []
+    items: list[dict[str, Any]] = []
+    if PLANNED_FILE.exists():
+        legacy = read_json_file(PLANNED_FILE, [])
+        if isinstance(legacy, list):
+            for row in legacy:
+                items.append(
+                    {
+                        "id": row.get("id") or str(uuid4()),
+                        "kind": "workout",
+                        "workout_type": row.get("workout_type", "Other"),
+                        "date": row.get("date"),
+                        "title": row.get("title", "Untitled Workout"),
+                        "duration_min": row.get("planned_duration_min", 0),
+                        "distance_km": row.get("planned_distance_km", 0),
+                        "intensity": row.get("planned_intensity", 6),
+                        "description": row.get("description", ""),
+                        "created_at": row.get("created_at")
+                        or datetime.utcnow().isoformat(timespec="seconds") + "Z",
+                    }
+                )
+    return items
+
+
+def load_calendar_items(
+    date_from: str | None = None,
+    date_to: str | None = None,
+    kind: str | None = None,
+) -> list[dict[str, Any]]:
+    """Calendar items ordered by (date, created_at), optionally limited to a date window and kind."""
+    with get_db() as db:
+        rows = _calendar_rows(db, "item_json", date_from, date_to, kind)
+    return [json.loads(r["item_json"]) for r in rows]
+
+
+def _calendar_rows(
+    db: sqlite3.Connection,
+    columns: str,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    kind: str | None = None,
+) -> list[sqlite3.Row]:
+    clauses: list[str] = []
+    params: list[Any] = []
+    if date_from:
+        clauses.append("date >= ?")
+        params.append(date_from)
+    if date_to:
+        clauses.append("date <= ?")
+        params.append(date_to)
+    if kind:
+        clauses.append("kind = ?")
+        params.append(kind)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return db.execute(f"SELECT {columns} FROM calendar_items {where} ORDER BY date, created_at", params).fetchall()
+
+
+def get_calendar_item(item_id: str) -> dict[str, Any] | None:
+    with get_db() as db:
+        row = db.execute("SELECT item_json FROM calendar_items WHERE id = ?", (str(item_id),)).fetchone()
+    return json.loads(row["item_json"]) if row else None
+
+
+def _save_calendar_rows(db: sqlite3.Connection, items: list[dict[str, Any]]) -> None:
+    db.executemany(
+        """
+        INSERT INTO calendar_items (id, kind, date, created_at, item_json, version) VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            kind = excluded.kind,
+            date = excluded.date,
+            created_at = excluded.created_at,
+            item_json = excluded.item_json,
+            version = excluded.version
+        WHERE calendar_items.item_json IS NOT excluded.item_json
+        """,
+        [
+            (
+                str(i.get("id")),
+                str(i.get("kind") or ""),
+                str(i.get("date") or ""),
+                i.get("created_at"),
+                json.dumps(i),
+                time.time_ns(),
+            )
+            for i in items
+        ],
+    )
+
+
+def save_calendar_item(item: dict[str, Any]) -> None:
+    with get_db() as db:
+        _save_calendar_rows(db, [item])
+
+
+def delete_calendar_item_row(item_id: str) -> bool:
+    with get_db() as db:
+        return db.execute("DELETE FROM calendar_items WHERE id = ?", (str(item_id),)).rowcount > 0
+
+
+def load_pairs() -> list[dict[str, Any]]:
+    with get_db() as db:
+        rows = db.execute(
+            "SELECT id, planned_id, strava_id, created_at FROM workout_pairs ORDER BY created_at, id"
+        ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def _delete_pairs(db: sqlite3.Connection, column: str, value: str) -> list[dict[str, Any]]:
+    """Delete the pairs whose planned_id or strava_id equals value and return them."""
+    assert column in ("id", "planned_id", "strava_id")
+    rows = db.execute(
+        f"SELECT id, planned_id, strava_id, created_at FROM workout_pairs WHERE {column} = ?", (value,)
+    ).fetchall()
+    if rows:
+        db.execute(f"DELETE FROM workout_pairs WHERE {column} = ?", (value,))
+    return [dict(r) for r in rows]
+
+
+def load_activity_overrides() -> dict[str, dict[str, Any]]:
+    with get_db() as db:
+        rows = db.execute("SELECT * FROM activity_overrides").fetchall()
+    return {r["id"]: override_to_dict(r) for r in rows}
+
+
+def load_activity_override(db: sqlite3.Connection, activity_id: str) -> dict[str, Any]:
+    row = db.execute("SELECT * FROM activity_overrides WHERE id = ?", (activity_id,)).fetchone()
+    return override_to_dict(row) if row else {}
+
+
+def save_activity_overrides(items: dict[str, dict[str, Any]]) -> None:
+    with get_db() as db:
+        for aid, override in items.items():
+            _upsert_override(db, aid, override)
+
+
+def load_imported_activities() -> list[dict[str, Any]]:
+    with get_db() as db:
+        rows = db.execute(
+            "SELECT * FROM activities WHERE source = 'fit' AND hidden = 0"
+        ).fetchall()
+    return [row_to_activity(r) for r in rows]
+
+
+def get_imported_activity(activity_id: str) -> dict[str, Any] | None:
+    with get_db() as db:
+        row = db.execute(
+            "SELECT * FROM activities WHERE id = ?", (activity_id,)
+        ).fetchone()
+    return row_to_activity(row) if row else None
+
+
+def get_imported_activity_raw(activity_id: str) -> sqlite3.Row | None:
+    with get_db() as db:
+        return db.execute(
+            "SELECT * FROM activities WHERE id = ?", (activity_id,)
+        ).fetchone()
+
+
+def apply_parsed_fit_to_activity(item: dict[str, Any], parsed: dict[str, Any], file_id: str, filename: str) -> dict[str, Any]:
+    summary = parsed.get("summary", {})
+    laps = parsed.get("laps", []) if isinstance(parsed.get("laps"), list) else []
+    lap_duration_s = 0.0
+    for lap in laps:
+        if isinstance(lap, dict):
+            try:
+                lap_duration_s += float(lap.get("duration_s") or 0)
+            except (TypeError, ValueError):
+                pass
+    duration_s = float(summary.get("duration_s") or 0)
+    if duration_s <= 0 and lap_duration_s > 0:
+        duration_s = lap_duration_s
+    if duration_s <= 0:
+        series = parsed.get("series", [])
+        if isinstance(series, list) and len(series) >= 2:
+            try:
+                start_ts = datetime.fromisoformat(str(series[0].get("timestamp")))
+                end_ts = datetime.fromisoformat(str(series[-1].get("timestamp")))
+                duration_s = max(0.0, (end_ts - start_ts).total_seconds())
+            except Exception:
+                pass
+
+    distance_m = float(summary.get("distance_m") or 0)
+    if distance_m <= 0 and laps:
+        lap_dist = 0.0
+        for lap in laps:
+            if isinstance(lap, dict):
+                try:
+                    lap_dist += float(lap.get("distance_m") or 0)
+                except (TypeError, ValueError):
+                    pass
+        if lap_dist > 0:
+            distance_m = lap_dist
+
+    item["fit_id"] = file_id
+    item["fit_filename"] = Path(filename).name
+    item["distance"] = float(distance_m or item.get("distance") or 0)
+    item["moving_time"] = float(duration_s or item.get("moving_time") or 0)
+    if summary.get("start"):
+        item["start_date_local"] = str(summary.get("start"))
+    sport = str(summary.get("sport") or item.get("type") or "Ride").title()
+    item["type"] = sport
+    item["if_value"] = summary.get("if")
+    item["np_value"] = summary.get("normalized_power")
     item["tss_override"] = summary.get("tss")
     item["work_kj"] = summary.get("work_kj")
     item["calories"] = summary.get("calories")
@@ -654,6 +1587,150 @@ def save_settings(settings: dict[str, Any]) -> dict[str, Any]:
     return merged
 
 
+# ---------------------------------------------------------------------------
+# Threshold history
+# ---------------------------------------------------------------------------
+
+# Dated FTP/LTHR values per sport, each effective from its date until the next
+# one; before a sport's first entry the earliest value applies. Kept in memory
+# as "<kind>:<sport_key>" -> (sorted dates, values) for bisect lookups, and
+# rebuilt after every write.
+_THRESHOLD_BASELINE_DATE = "0001-01-01"
+_THRESHOLD_KINDS = ("ftp", "lthr")
+
+_threshold_lock = threading.Lock()
+_threshold_cache: dict[str, tuple[list[str], list[float | None]]] | None = None
+
+
+def threshold_index() -> dict[str, tuple[list[str], list[float | None]]]:
+    global _threshold_cache
+    with _threshold_lock:
+        if _threshold_cache is None:
+            index: dict[str, tuple[list[str], list[float | None]]] = {}
+            with get_db() as db:
+                rows = db.execute(
+                    "SELECT kind, sport_key, effective_from, value FROM threshold_history "
+                    "ORDER BY kind, sport_key, effective_from"
+                ).fetchall()
+            for row in rows:
+                dates, values = index.setdefault(f"{row['kind']}:{row['sport_key']}", ([], []))
+                dates.append(row["effective_from"])
+                values.append(row["value"])
+            _threshold_cache = index
+        return _threshold_cache
+
+
+def _invalidate_threshold_index() -> None:
+    global _threshold_cache
+    with _threshold_lock:
+        _threshold_cache = None
+
+
+def effective_settings() -> dict[str, Any]:
+    """Settings plus the threshold history, for anything that computes IF/TSS."""
+    return {**load_settings(), "threshold_history": threshold_index()}
+
+
+def threshold_value(settings: dict[str, Any], kind: str, key: str, day: str | None = None) -> Any:
+    """One FTP/LTHR value on a day (default today); dated history wins over the flat settings value."""
+    entry = (settings.get("threshold_history") or {}).get(f"{kind}:{key}")
+    if entry and entry[0]:
+        dates, values = entry
+        on = date.today().isoformat() if day is None else day
+        return values[max(0, bisect_right(dates, on) - 1)]
+    return (settings.get(kind) or {}).get(key)
+
+
+def sport_thresholds(
+    settings: dict[str, Any], sport_key: str, day: str | None = None
+) -> tuple[float | None, float | None]:
+    """(FTP, LTHR) for a sport key on a day; LTHR falls back to the global value."""
+    ftp = sanitize_ftp_value(threshold_value(settings, "ftp", sport_key, day))
+    lthr = threshold_value(settings, "lthr", sport_key, day) or threshold_value(settings, "lthr", "global", day)
+    return ftp, sanitize_lthr_value(lthr)
+
+
+def threshold_changes(before: dict[str, Any], after: dict[str, Any]) -> dict[str, list[tuple[str | None, str | None]]]:
+    """Per sport key, the [start, end) date ranges where effective FTP or LTHR differ.
+
+    Thresholds are step functions of the date, so comparing one day from each
+    segment between the union of both histories' dates is exact. None bounds
+    are open-ended.
+    """
+    changes: dict[str, list[tuple[str | None, str | None]]] = {}
+    for key in default_settings()["ftp"]:
+        names = (f"ftp:{key}", f"lthr:{key}", "lthr:global")
+        points = sorted({
+            d for side in (before, after) for name in names
+            for d in ((side.get("threshold_history") or {}).get(name) or ([], []))[0]
+        })
+        ranges: list[tuple[str | None, str | None]] = []
+        for i, start in enumerate([None, *points]):
+            end = points[i] if i < len(points) else None
+            if sport_thresholds(before, key, start or "") == sport_thresholds(after, key, start or ""):
+                continue
+            if ranges and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((start, end))
+        if ranges:
+            changes[key] = ranges
+    return changes
+
+
+def load_threshold_history() -> list[dict[str, Any]]:
+    with get_db() as db:
+        rows = db.execute(
+            "SELECT kind, sport_key, effective_from, value FROM threshold_history "
+            "ORDER BY kind, sport_key, effective_from"
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def save_threshold(kind: str, sport_key: str, effective_from: str, value: float | None, delete: bool = False) -> None:
+    with get_db() as db:
+        if delete:
+            db.execute(
+                "DELETE FROM threshold_history WHERE kind = ? AND sport_key = ? AND effective_from = ?",
+                (kind, sport_key, effective_from),
+            )
+        else:
+            db.execute(
+                "INSERT OR REPLACE INTO threshold_history (kind, sport_key, effective_from, value) VALUES (?,?,?,?)",
+                (kind, sport_key, effective_from, value),
+            )
+    _invalidate_threshold_index()
+
+
+def record_settings_thresholds(before: dict[str, Any], after: dict[str, Any]) -> None:
+    """Date a settings-page FTP/LTHR change from today, keeping earlier dates on the old value.
+
+    A threshold set for the first time has nothing to preserve, so it covers all history.
+    """
+    today = date.today().isoformat()
+    index = threshold_index()
+    with get_db() as db:
+        for kind in _THRESHOLD_KINDS:
+            for key, value in (after.get(kind) or {}).items():
+                old = (before.get(kind) or {}).get(key)
+                if value == old:
+                    continue
+                effective_from = today
+                if f"{kind}:{key}" not in index:
+                    if old is None:
+                        effective_from = _THRESHOLD_BASELINE_DATE
+                    else:
+                        db.execute(
+                            "INSERT OR REPLACE INTO threshold_history (kind, sport_key, effective_from, value) VALUES (?,?,?,?)",
+                            (kind, key, _THRESHOLD_BASELINE_DATE, old),
+                        )
+                db.execute(
+                    "INSERT OR REPLACE INTO threshold_history (kind, sport_key, effective_from, value) VALUES (?,?,?,?)",
+                    (kind, key, effective_from, value),
+                )
+    _invalidate_threshold_index()
+
+
 def sport_to_ftp_key(sport: str) -> str:
     s = str(sport or "").lower()
     if "ride" in s or "cycle" in s or "bike" in s:
@@ -739,46 +1816,145 @@ def _normalize_time_of_day(raw: Any) -> str:
         return ""
 
 
-@lru_cache(maxsize=8)
-def _tp_export_workout_file_index(filename: str) -> dict[str, Path]:
-    out: dict[str, Path] = {}
+# ---------------------------------------------------------------------------
+# TrainingPeaks export index
+# ---------------------------------------------------------------------------
+
+# Per-workout export files kept in tp_export_files. Only the fields read at
+# request time are stored: workout.json's startTime and detaildata.json's lapsStats.
+TP_EXPORT_INDEXED_FILES = ("workout.json", "detaildata.json")
+
+
+def _scan_tp_export_files() -> dict[tuple[str, str], tuple[Path, int, int]]:
+    """(workout_id, kind) -> (path, mtime_ns, size) for every indexed export file; earlier roots win."""
+    out: dict[tuple[str, str], tuple[Path, int, int]] = {}
     for root in TP_EXPORT_WORKOUT_ROOTS:
-        if not root.exists():
+        if not root.is_dir():
             continue
-        for path in root.glob(f"*/{filename}"):
-            workout_id = path.parent.name.strip()
-            if workout_id and workout_id not in out:
-                out[workout_id] = path
+        with os.scandir(root) as entries:
+            for entry in entries:
+                workout_id = entry.name.strip()
+                if not workout_id or not entry.is_dir():
+                    continue
+                for kind in TP_EXPORT_INDEXED_FILES:
+                    if (workout_id, kind) in out:
+                        continue
+                    path = Path(entry.path) / kind
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    out[(workout_id, kind)] = (path, stat.st_mtime_ns, stat.st_size)
     return out
 
 
-def _tp_export_workout_file(workout_id: str, filename: str) -> Path | None:
-    return _tp_export_workout_file_index(filename).get(str(workout_id))
-
-
-@lru_cache(maxsize=1)
-def _tp_export_start_time_map() -> dict[str, str]:
-    out: dict[str, str] = {}
-    for workout_id, path in _tp_export_workout_file_index("workout.json").items():
-        try:
-            raw = json.loads(path.read_text())
-        except (OSError, json.JSONDecodeError):
-            continue
+def _read_tp_export_file(kind: str, path: Path) -> tuple[str | None, str | None]:
+    """The (start_time, laps_json) a file contributes; unreadable files index as empty."""
+    try:
+        raw = json.loads(path.read_text())
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        return None, None
+    if not isinstance(raw, dict):
+        return None, None
+    if kind == "workout.json":
         start_raw = str(raw.get("startTime") or "").strip()
-        if not start_raw:
-            continue
         try:
-            dt = datetime.fromisoformat(start_raw.replace("Z", "+00:00"))
-            out[workout_id] = dt.strftime("%H:%M:%S")
+            datetime.fromisoformat(start_raw.replace("Z", "+00:00"))
         except ValueError:
-            continue
-    return out
+            return None, None
+        return start_raw, None
+    laps_stats = raw.get("lapsStats")
+    return None, json.dumps(laps_stats) if isinstance(laps_stats, list) else None
+
+
+def refresh_tp_export_index() -> list[str]:
+    """Bring tp_export_files up to date, re-reading only files whose mtime or size changed.
+
+    Returns the workout ids whose start time changed. Every workout whose
+    indexed start time or laps changed also gets a new fit_series version,
+    since /fit overlays both and is cached by that version.
+    """
+    found = _scan_tp_export_files()
+    with get_db() as db:
+        known = {
+            (r["workout_id"], r["kind"]): r
+            for r in db.execute("SELECT workout_id, kind, mtime_ns, size, start_time, laps_json FROM tp_export_files")
+        }
+    stale = [
+        (key, entry) for key, entry in found.items()
+        if key not in known or (known[key]["mtime_ns"], known[key]["size"]) != entry[1:]
+    ]
+    rows = [
+        (workout_id, kind, str(path), mtime_ns, size, *_read_tp_export_file(kind, path))
+        for (workout_id, kind), (path, mtime_ns, size) in stale
+    ]
+    removed = [key for key in known if key not in found]
+    changed = [
+        row[0] for row in rows
+        if row[1] == "workout.json" and row[5] != (known[row[:2]]["start_time"] if row[:2] in known else None)
+    ]
+    changed += [workout_id for workout_id, kind in removed if kind == "workout.json" and known[(workout_id, kind)]["start_time"]]
+
+    def indexed(key: tuple[str, str]) -> tuple[str | None, str | None]:
+        row = known.get(key)
+        return (row["start_time"], row["laps_json"]) if row else (None, None)
+
+    overlay_changed = {row[0] for row in rows if tuple(row[5:]) != indexed(row[:2])}
+    overlay_changed.update(key[0] for key in removed if indexed(key) != (None, None))
+    version = time.time_ns()
+    with get_db() as db:
+        db.executemany(
+            "INSERT OR REPLACE INTO tp_export_files "
+            "(workout_id, kind, path, mtime_ns, size, start_time, laps_json) VALUES (?,?,?,?,?,?,?)",
+            rows,
+        )
+        db.executemany("DELETE FROM tp_export_files WHERE workout_id = ? AND kind = ?", removed)
+        db.executemany(
+            "UPDATE fit_series SET version = ? WHERE fit_id = ?",
+            [(version, workout_id) for workout_id in sorted(overlay_changed)],
+        )
+    return changed
+
+
+def _refresh_tp_export_views() -> None:
+    changed = refresh_tp_export_index()
+    with get_db() as db:
+        for workout_id in changed:
+            if db.execute("SELECT 1 FROM activity_view WHERE id = ?", (workout_id,)).fetchone():
+                refresh_activity_view(db, workout_id)
+
+
+def ensure_tp_export_index() -> None:
+    """Build the index on first start; afterwards refresh it in the background."""
+    with get_db() as db:
+        seeded = db.execute("SELECT 1 FROM tp_export_files LIMIT 1").fetchone()
+    if not seeded:
+        # Activity views take their start times from the index, so the first build must finish first.
+        refresh_tp_export_index()
+        return
+    threading.Thread(target=_refresh_tp_export_views, name="tp-export-index", daemon=True).start()
+
+
+def _tp_export_entry(workout_id: str, kind: str) -> sqlite3.Row | None:
+    with get_db() as db:
+        return db.execute(
+            "SELECT start_time, laps_json FROM tp_export_files WHERE workout_id = ? AND kind = ?",
+            (str(workout_id), kind),
+        ).fetchone()
+
+
+def _tp_export_start(workout_id: str) -> datetime | None:
+    entry = _tp_export_entry(workout_id, "workout.json")
+    if not entry or not entry["start_time"]:
+        return None
+    return datetime.fromisoformat(entry["start_time"].replace("Z", "+00:00"))
 
 
 def _merge_tp_start_time(current_start: Any, workout_id: str) -> str | None:
-    tp_time = _tp_export_start_time_map().get(str(workout_id))
-    if not tp_time:
+    tp_start = _tp_export_start(workout_id)
+    if not tp_start:
         return _iso(current_start)
+    tp_time = tp_start.strftime("%H:%M:%S")
 
     current_iso = _iso(current_start)
     if not current_iso:
@@ -794,18 +1970,6 @@ def _merge_tp_start_time(current_start: Any, workout_id: str) -> str | None:
     return f"{cur_dt.date().isoformat()}T{tp_time}"
 
 
-def _mean(values: list[float]) -> float | None:
-    if not values:
-        return None
-    return sum(values) / len(values)
-
-
-def _max(values: list[float]) -> float | None:
-    if not values:
-        return None
-    return max(values)
-
-
 def sanitize_lthr_value(value: Any) -> float | None:
     if value is None:
         return None
@@ -821,54 +1985,77 @@ def sanitize_lthr_value(value: Any) -> float | None:
 
 
 # Coggan HR zone upper-bound percentages of LTHR (Z1–Z4; Z5 = above last bound)
-_HR_ZONE_BOUNDS = [68.0, 84.0, 95.0, 106.0]
-_HR_ZONE_RATES = [30.0, 55.0, 70.0, 90.0, 110.0]  # TSS/hr for zones 1–5
+_HR_ZONE_BOUNDS = np.array([68.0, 84.0, 95.0, 106.0])
+_HR_ZONE_RATES = np.array([30.0, 55.0, 70.0, 90.0, 110.0])  # TSS/hr for zones 1–5
+_NP_WINDOW_S = 30.0
+# Sample intervals longer than this are pauses: the sample only covers one
+# nominal interval and the rest of the gap carries no time.
+_SAMPLE_GAP_S = 10.0
+
 
+def _sample_durations(t: np.ndarray) -> np.ndarray:
+    """Seconds each sample covers, ending at its own timestamp.
 
-def _hr_tss(points: list[dict[str, Any]], lthr: float) -> float | None:
-    """Calculate hrTSS from per-second HR series using Coggan zones."""
-    if not lthr or lthr <= 0:
+    Works for any sample rate; the first sample and samples after a pause
+    get the nominal (median) interval.
+    """
+    if len(t) == 0:
+        return np.zeros(0)
+    dt = np.diff(t, prepend=t[0])
+    positive = dt[dt > 0]
+    nominal = float(np.median(positive)) if len(positive) else 1.0
+    nominal = min(nominal, _SAMPLE_GAP_S)
+    dt[0] = nominal
+    return np.where((dt > 0) & (dt <= _SAMPLE_GAP_S), dt, np.where(dt > 0, nominal, 0.0))
+
+
+def _hr_tss(t: np.ndarray, heart_rate: np.ndarray, lthr: float | None) -> float | None:
+    """hrTSS from time-in-zone using Coggan zones; ``heart_rate`` is NaN where missing."""
+    if not lthr or lthr <= 0 or len(t) == 0:
         return None
-    time_in_zone = [0.0] * 5
-    for p in points:
-        hr = _as_float(p.get("heart_rate"))
-        if hr is None or hr <= 0:
-            continue
-        pct = hr / lthr * 100.0
-        zone = next((i for i, bound in enumerate(_HR_ZONE_BOUNDS) if pct < bound), 4)
-        time_in_zone[zone] += 1.0  # one record ≈ one second
-    total = sum(t / 3600.0 * _HR_ZONE_RATES[z] for z, t in enumerate(time_in_zone))
+    dt = _sample_durations(t)
+    valid = np.isfinite(heart_rate) & (heart_rate > 0)
+    if not valid.any():
+        return None
+    zones = np.searchsorted(_HR_ZONE_BOUNDS, heart_rate[valid] / lthr * 100.0, side="right")
+    time_in_zone = np.bincount(zones, weights=dt[valid], minlength=len(_HR_ZONE_RATES))
+    total = float(np.dot(time_in_zone / 3600.0, _HR_ZONE_RATES))
     return total if total > 0 else None
 
 
-def _normalized_power(points: list[dict[str, Any]]) -> float | None:
-    samples: list[tuple[float, float]] = []
-    for row in points:
-        p = _as_float(row.get("power"))
-        ts = row.get("timestamp")
-        if p is None or p <= 0 or not isinstance(ts, str):
-            continue
-        try:
-            t = datetime.fromisoformat(ts).timestamp()
-        except ValueError:
-            continue
-        samples.append((t, p))
-    if not samples:
+def _normalized_power(t: np.ndarray, power: np.ndarray) -> float | None:
+    """NP from a time-weighted 30 s rolling mean, computed with cumulative sums.
+
+    Each sample holds its power over the interval it covers; non-positive and
+    missing samples carry no time, so they neither dilute nor extend windows.
+    """
+    if len(t) == 0:
+        return None
+    dt = _sample_durations(t)
+    valid = np.isfinite(power) & (power > 0)
+    if not valid.any():
         return None
-    window: list[tuple[float, float]] = []
-    rolling_avgs: list[float] = []
-    sum_power = 0.0
-    for t, p in samples:
-        window.append((t, p))
-        sum_power += p
-        while window and (t - window[0][0]) > 30.0:
-            sum_power -= window[0][1]
-            window.pop(0)
-        if window:
-            rolling_avgs.append(sum_power / len(window))
-    if not rolling_avgs:
+    w = np.where(valid, dt, 0.0)
+    pw = np.where(valid, power, 0.0) * w
+    cum_w = np.concatenate(([0.0], np.cumsum(w)))
+    cum_pw = np.concatenate(([0.0], np.cumsum(pw)))
+
+    # Cumulative totals at t - window: whole samples ending before it plus the
+    # covered share of the sample straddling it.
+    edge = t - _NP_WINDOW_S
+    j = np.searchsorted(t, edge, side="right")
+    jc = np.minimum(j, len(t) - 1)
+    share = np.clip(edge - (t[jc] - dt[jc]), 0.0, dt[jc])
+    share = np.where(dt[jc] > 0, share / np.where(dt[jc] > 0, dt[jc], 1.0), 0.0)
+    start_w = cum_w[j] + w[jc] * share
+    start_pw = cum_pw[j] + pw[jc] * share
+
+    win_w = cum_w[1:] - start_w
+    rolling = (cum_pw[1:] - start_pw) / np.where(win_w > 0, win_w, 1.0)
+    keep = valid & (win_w > 0)
+    if not keep.any():
         return None
-    mean_p4 = sum(v ** 4 for v in rolling_avgs) / len(rolling_avgs)
+    mean_p4 = float(np.average(rolling[keep] ** 4, weights=w[keep]))
     return mean_p4 ** 0.25
 
 
@@ -882,32 +2069,102 @@ def parse_fit_bytes_to_json(content: bytes, settings: dict[str, Any] | None = No
 
 
 def parse_fit_stream_to_json(stream: Any, settings: dict[str, Any] | None = None) -> dict[str, Any]:
+    cols, meta = decode_fit_stream(stream, settings=settings)
+    return {**meta, "series": columns_to_series(cols)}
+
+
+# Record fields decoded into series columns; the only message types read.
+_FIT_RECORD_FIELDS = ("heart_rate", "speed", "distance", "cadence", "power", "altitude", "position_lat", "position_long")
+# Record fields stored under a different channel name.
+_FIT_FIELD_CHANNELS = {"position_lat": "lat", "position_long": "lng"}
+_SEMICIRCLES_TO_DEGREES = 180.0 / 2**31
+_FIT_MESSAGES = ("record", "lap", "session", "sport")
+# Smallest plausible encoded record, used to size the column buffers up front.
+_FIT_MIN_RECORD_BYTES = 12
+
+
+class _StreamingFitFile(FitFile):
+    """FitFile that hands each message out without keeping every one in memory.
+
+    Overrides fitparse's private ``_parse_message``, so fitparse is pinned in
+    requirements.txt and tests/test_fit_decode.py compares the output with
+    stock ``FitFile``.
+    """
+
+    def _parse_message(self):
+        message = super()._parse_message()
+        self._messages.clear()
+        return message
+
+
+def _power_tss(duration_s: float, np_value: float | None, ftp: float | None) -> tuple[float | None, float | None]:
+    """(IF, TSS) from normalized power; None where FTP or power is missing."""
+    if not (ftp and np_value and np_value > 0):
+        return None, None
+    if_value = np_value / ftp
+    tss = (duration_s * np_value * if_value) / (ftp * 3600.0) * 100.0 if duration_s > 0 else None
+    return if_value, tss
+
+
+def _present_values(values: np.ndarray) -> np.ndarray:
+    return values[~np.isnan(values)]
+
+
+def _array_mean(values: np.ndarray) -> float | None:
+    return float(values.mean()) if values.size else None
+
+
+def _array_max(values: np.ndarray) -> float | None:
+    return float(values.max()) if values.size else None
+
+
+def decode_fit_stream(stream: Any, settings: dict[str, Any] | None = None) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Decode a FIT file in one pass into series columns plus summary/lap metadata."""
     # Analysis pipeline source of truth:
-    # records -> chart series points, laps -> lap table and lap-range selection.
-    fit = FitFile(stream)
-    points: list[dict[str, Any]] = []
+    # records -> chart series columns, laps -> lap table and lap-range selection.
+    try:
+        size = stream.seek(0, io.SEEK_END)
+        stream.seek(0)
+    except (AttributeError, OSError):
+        size = 0
+    capacity = max(1024, size // _FIT_MIN_RECORD_BYTES)
+    offsets = np.empty(capacity)
+    data = np.full((len(_FIT_RECORD_FIELDS), capacity), np.nan)
+    field_index = {name: i for i, name in enumerate(_FIT_RECORD_FIELDS)}
+    n = 0
+    first_ts: datetime | None = None
+    last_ts: datetime | None = None
     laps: list[dict[str, Any]] = []
     session_values: dict[str, Any] = {}
     sport = "Ride"
 
-    for msg in fit.get_messages():
-        vals = msg.get_values()
+    for msg in _StreamingFitFile(stream).get_messages(_FIT_MESSAGES):
         name = msg.name
         if name == "record":
-            ts = vals.get("timestamp")
+            if n == capacity:
+                capacity *= 2
+                offsets = np.concatenate((offsets, np.empty(capacity - n)))
+                data = np.concatenate((data, np.full((len(_FIT_RECORD_FIELDS), capacity - n), np.nan)), axis=1)
+            ts = None
+            for field in msg.fields:
+                if field.name == "timestamp":
+                    ts = field.value
+                    continue
+                i = field_index.get(field.name)
+                if i is not None:
+                    v = _as_float(field.value)
+                    data[i, n] = np.nan if v is None else v
             if not isinstance(ts, datetime):
+                data[:, n] = np.nan
                 continue
-            row = {
-                "timestamp": ts.isoformat(),
-                "heart_rate": _as_float(vals.get("heart_rate")),
-                "speed": _as_float(vals.get("speed")),
-                "distance": _as_float(vals.get("distance")),
-                "cadence": _as_float(vals.get("cadence")),
-                "power": _as_float(vals.get("power")),
-                "altitude": _as_float(vals.get("altitude")),
-            }
-            points.append(row)
-        elif name == "lap":
+            if first_ts is None:
+                first_ts = ts
+            offsets[n] = (ts - first_ts).total_seconds()
+            last_ts = ts
+            n += 1
+            continue
+        vals = msg.get_values()
+        if name == "lap":
             start_ts = vals.get("start_time") or vals.get("timestamp")
             start_iso = _iso(start_ts)
             dur_s = _as_float(vals.get("total_timer_time")) or _as_float(vals.get("total_elapsed_time")) or 0.0
@@ -946,29 +2203,36 @@ def parse_fit_stream_to_json(stream: Any, settings: dict[str, Any] | None = None
             if s:
                 sport = s.title()
 
-    if not points:
+    if first_ts is None or last_ts is None:
         raise HTTPException(status_code=400, detail="No record points found in FIT file.")
 
-    first_ts = datetime.fromisoformat(points[0]["timestamp"])
-    last_ts = datetime.fromisoformat(points[-1]["timestamp"])
+    t = offsets[:n]
+    raw = {_FIT_FIELD_CHANNELS.get(name, name): data[i, :n] for i, name in enumerate(_FIT_RECORD_FIELDS)}
+    raw["lat"] = raw["lat"] * _SEMICIRCLES_TO_DEGREES
+    raw["lng"] = raw["lng"] * _SEMICIRCLES_TO_DEGREES
+    # GPS channels are only listed when the file has a fix, so indoor rides
+    # don't carry null lat/lng on every point.
+    present = [
+        name for name in (_FIT_FIELD_CHANNELS.get(f, f) for f in _FIT_RECORD_FIELDS)
+        if name not in ("lat", "lng") or not np.isnan(raw[name]).all()
+    ]
     duration_s = max(1.0, (last_ts - first_ts).total_seconds())
 
-    distances = [p["distance"] for p in points if p.get("distance") is not None]
+    distances = _present_values(raw["distance"])
     distance_m = 0.0
-    if distances:
-        distance_m = max(0.0, distances[-1] - distances[0]) if len(distances) > 1 else max(0.0, distances[0])
+    if distances.size:
+        distance_m = max(0.0, float(distances[-1] - distances[0])) if distances.size > 1 else max(0.0, float(distances[0]))
     session_distance = _as_float(session_values.get("total_distance"))
     if session_distance and session_distance > 0:
         distance_m = session_distance
 
-    hr_values = [p["heart_rate"] for p in points if p.get("heart_rate") is not None]
-    speed_values = [p["speed"] for p in points if p.get("speed") is not None]
-    power_values = [p["power"] for p in points if p.get("power") is not None]
-    cadence_values = [p["cadence"] for p in points if p.get("cadence") is not None]
-    alt_values = [p["altitude"] for p in points if p.get("altitude") is not None]
+    hr_values = _present_values(raw["heart_rate"])
+    speed_values = _present_values(raw["speed"])
+    power_values = _present_values(raw["power"])
+    cadence_values = _present_values(raw["cadence"])
 
-    avg_speed = _mean(speed_values)
-    max_speed = _max(speed_values)
+    avg_speed = _array_mean(speed_values)
+    max_speed = _array_max(speed_values)
     session_timer = _as_float(session_values.get("total_timer_time")) or _as_float(session_values.get("total_elapsed_time"))
     if session_timer and session_timer > 0:
         duration_s = session_timer
@@ -981,47 +2245,37 @@ def parse_fit_stream_to_json(stream: Any, settings: dict[str, Any] | None = None
                 "end": last_ts.isoformat(),
                 "duration_s": duration_s,
                 "distance_m": distance_m,
-                "avg_hr": _mean(hr_values),
-                "max_hr": _max(hr_values),
+                "avg_hr": _array_mean(hr_values),
+                "max_hr": _array_max(hr_values),
                 "avg_speed": avg_speed,
                 "max_speed": max_speed,
-                "avg_power": _mean(power_values),
-                "max_power": _max(power_values),
-                "avg_cadence": _mean(cadence_values),
-                "max_cadence": _max(cadence_values),
+                "avg_power": _array_mean(power_values),
+                "max_power": _array_max(power_values),
+                "avg_cadence": _array_mean(cadence_values),
+                "max_cadence": _array_max(cadence_values),
             }
         )
 
     ftp_key = sport_to_ftp_key(sport)
-    ftp_value = None
-    lthr_value = None
-    if settings:
-        ftp_value = sanitize_ftp_value((settings.get("ftp") or {}).get(ftp_key))
-        lthr_raw = settings.get("lthr") or {}
-        lthr_value = sanitize_lthr_value(lthr_raw.get(ftp_key) or lthr_raw.get("global"))
-    np_value = _normalized_power(points)
-    if_value = None
-    if ftp_value and np_value and np_value > 0:
-        if_value = np_value / ftp_value
-    tss_value = None
-    if if_value and np_value and ftp_value and duration_s > 0:
-        tss_value = (duration_s * np_value * if_value) / (ftp_value * 3600.0) * 100.0
-    hr_tss_value = _hr_tss(points, lthr_value) if lthr_value else None
+    ftp_value, lthr_value = sport_thresholds(settings or {}, ftp_key, first_ts.date().isoformat())
+    np_value = _normalized_power(t, raw["power"])
+    if_value, tss_value = _power_tss(duration_s, np_value, ftp_value)
+    hr_tss_value = _hr_tss(t, raw["heart_rate"], lthr_value) if lthr_value else None
 
-    return {
+    meta = {
         "summary": {
             "start": first_ts.isoformat(),
             "end": last_ts.isoformat(),
             "duration_s": duration_s,
             "distance_m": distance_m,
-            "avg_hr": _as_float(session_values.get("avg_heart_rate")) or _mean(hr_values),
-            "max_hr": _as_float(session_values.get("max_heart_rate")) or _max(hr_values),
+            "avg_hr": _as_float(session_values.get("avg_heart_rate")) or _array_mean(hr_values),
+            "max_hr": _as_float(session_values.get("max_heart_rate")) or _array_max(hr_values),
             "avg_speed": _as_float(session_values.get("avg_speed")) or avg_speed,
             "max_speed": _as_float(session_values.get("max_speed")) or max_speed,
-            "avg_power": _as_float(session_values.get("avg_power")) or _mean(power_values),
-            "max_power": _as_float(session_values.get("max_power")) or _max(power_values),
-            "avg_cadence": _as_float(session_values.get("avg_cadence")) or _mean(cadence_values),
-            "max_cadence": _as_float(session_values.get("max_cadence")) or _max(cadence_values),
+            "avg_power": _as_float(session_values.get("avg_power")) or _array_mean(power_values),
+            "max_power": _as_float(session_values.get("max_power")) or _array_max(power_values),
+            "avg_cadence": _as_float(session_values.get("avg_cadence")) or _array_mean(cadence_values),
+            "max_cadence": _as_float(session_values.get("max_cadence")) or _array_max(cadence_values),
             "elev_gain_m": _as_float(session_values.get("total_ascent")),
             "work_kj": (_as_float(session_values.get("total_work")) / 1000.0) if _as_float(session_values.get("total_work")) else None,
             "calories": _as_float(session_values.get("total_calories")),
@@ -1034,18 +2288,436 @@ def parse_fit_stream_to_json(stream: Any, settings: dict[str, Any] | None = None
             "hr_tss": hr_tss_value,
             "normalized_power": np_value,
         },
-        "series": points,
         "laps": laps,
     }
+    return _build_series_columns(first_ts.isoformat(), t, raw, present), meta
+
+
+# ---------------------------------------------------------------------------
+# Columnar series store
+# ---------------------------------------------------------------------------
+
+# Per-channel storage dtype and the decimals float32 channels are rounded to on
+# read (FIT resolution), so values round-trip without float32 noise. Bit i of
+# the per-sample validity mask marks whether channel i has a value.
+# heart_rate and cadence are whole numbers in FIT (bpm, rpm) and are stored as
+# int16, so fractional values from TrainingPeaks streams or legacy JSON are
+# rounded to the nearest integer on write.
+_SERIES_CHANNELS: tuple[tuple[str, str, int | None], ...] = (
+    ("heart_rate", "<i2", None),
+    ("power", "<f4", 2),
+    ("cadence", "<i2", None),
+    ("speed", "<f4", 3),
+    ("distance", "<f8", None),
+    ("altitude", "<f4", 2),
+    ("lat", "<f8", None),
+    ("lng", "<f8", None),
+)
+_SERIES_OFFSET_DTYPE = "<f8"
+_SERIES_MASK_DTYPE = "u1"
+_SERIES_FORMAT_VERSION = 1
+
+
+def _parse_series_start(start_iso: str) -> datetime:
+    return datetime.fromisoformat(start_iso.replace("Z", "+00:00"))
+
+
+def series_to_columns(points: list[dict[str, Any]]) -> dict[str, Any]:
+    """Convert a list of series point dicts into columnar arrays."""
+    start_dt: datetime | None = None
+    offsets: list[float] = []
+    raw: dict[str, list[float]] = {name: [] for name, _, _ in _SERIES_CHANNELS}
+    present: set[str] = set()
+    for p in points:
+        ts = p.get("timestamp")
+        if not isinstance(ts, str):
+            continue
+        try:
+            dt = _parse_series_start(ts)
+        except ValueError:
+            continue
+        if start_dt is None:
+            start_dt = dt
+        offsets.append((dt - start_dt).total_seconds())
+        for name, _, _ in _SERIES_CHANNELS:
+            if name in p:
+                present.add(name)
+            v = _as_float(p.get(name))
+            raw[name].append(np.nan if v is None else v)
+
+    return _build_series_columns(
+        start_dt.isoformat() if start_dt else None,
+        np.asarray(offsets, dtype=np.float64),
+        {name: np.asarray(values, dtype=np.float64) for name, values in raw.items()},
+        [name for name, _, _ in _SERIES_CHANNELS if name in present],
+    )
+
+
+def _build_series_columns(
+    start: str | None, offsets: np.ndarray, raw: dict[str, np.ndarray], present: list[str]
+) -> dict[str, Any]:
+    """Pack float64 channels (NaN = missing) into the stored dtypes and validity mask."""
+    n = len(offsets)
+    mask = np.zeros(n, dtype=_SERIES_MASK_DTYPE)
+    channels: dict[str, np.ndarray] = {}
+    for bit, (name, dtype, _) in enumerate(_SERIES_CHANNELS):
+        values = raw[name] if name in raw else np.full(n, np.nan)
+        valid = ~np.isnan(values)
+        mask |= (valid.astype(_SERIES_MASK_DTYPE) << bit)
+        if np.dtype(dtype).kind == "i":
+            values = np.rint(np.where(valid, values, 0.0))
+        else:
+            values = np.where(valid, values, 0.0)
+        channels[name] = values.astype(dtype)
+    return {
+        "start": start,
+        "offsets": offsets.astype(_SERIES_OFFSET_DTYPE),
+        "mask": mask,
+        "channels": channels,
+        "present": [name for name, _, _ in _SERIES_CHANNELS if name in present],
+    }
+
+
+def split_fit_series(parsed: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Split a parsed FIT into its column arrays and the remaining metadata."""
+    series = parsed.get("series")
+    cols = series_to_columns(series if isinstance(series, list) else [])
+    meta = {k: v for k, v in parsed.items() if k != "series"}
+    return cols, meta
+
+
+def _save_fit_series(db: sqlite3.Connection, fit_id: str, parsed: dict[str, Any]) -> dict[str, Any]:
+    cols, meta = split_fit_series(parsed)
+    _write_fit_series(db, fit_id, cols, meta)
+    return cols
+
+
+def _write_fit_series(db: sqlite3.Connection, fit_id: str, cols: dict[str, Any], meta: dict[str, Any]) -> None:
+    db.execute(
+        """
+        INSERT OR REPLACE INTO fit_series (
+            fit_id, format_version, start_time, sample_count, present_channels,
+            offsets, mask, heart_rate, power, cadence, speed, distance, altitude, lat, lng,
+            meta_json, version
+        ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+        """,
+        (
+            fit_id,
+            _SERIES_FORMAT_VERSION,
+            cols["start"],
+            len(cols["offsets"]),
+            json.dumps(cols["present"]),
+            cols["offsets"].tobytes(),
+            cols["mask"].tobytes(),
+            *(cols["channels"][name].tobytes() for name, _, _ in _SERIES_CHANNELS),
+            json.dumps(meta),
+            time.time_ns(),
+        ),
+    )
 
 
 def save_fit_parsed(fit_id: str, data: dict[str, Any]) -> None:
     with get_db() as db:
+        cols = _save_fit_series(db, fit_id, data)
+        _save_fit_curves(db, fit_id, cols)
         db.execute(
-            "UPDATE activities SET fit_parsed_json = ? WHERE fit_id = ?",
-            (json.dumps(data), fit_id),
+            "UPDATE activity_blobs SET fit_parsed_json = NULL "
+            "WHERE activity_id IN (SELECT id FROM activities WHERE fit_id = ?)",
+            (fit_id,),
+        )
+
+
+def load_fit_columns(fit_id: str) -> dict[str, Any] | None:
+    """Read a stored series back as zero-copy NumPy views over the row blobs."""
+    with get_db() as db:
+        row = db.execute("SELECT * FROM fit_series WHERE fit_id = ?", (fit_id,)).fetchone()
+    cols = _fit_series_row_columns(row)
+    if cols is None or cols["meta"].get("source") != "tp_stream":
+        return cols
+    fresh = refresh_tp_meta(fit_id, cols)
+    if fresh is not None:
+        return fresh
+    # The workout's start moved since its stream was decoded: place it again.
+    try:
+        decoded, meta = decode_tp_stream(fit_id)
+    except HTTPException:
+        return cols
+    with get_db() as db:
+        _write_fit_series(db, fit_id, decoded, meta)
+        _save_fit_curves(db, fit_id, decoded)
+    return {**decoded, "meta": meta}
+
+
+def _fit_series_row_columns(row: sqlite3.Row | None) -> dict[str, Any] | None:
+    if not row or row["format_version"] != _SERIES_FORMAT_VERSION:
+        return None
+    try:
+        meta = json.loads(row["meta_json"] or "{}")
+        present = json.loads(row["present_channels"] or "[]")
+    except json.JSONDecodeError as err:
+        raise HTTPException(status_code=500, detail="Corrupted FIT series data.") from err
+    return {
+        "start": row["start_time"],
+        "offsets": np.frombuffer(row["offsets"] or b"", dtype=_SERIES_OFFSET_DTYPE),
+        "mask": np.frombuffer(row["mask"] or b"", dtype=_SERIES_MASK_DTYPE),
+        "channels": {
+            name: np.frombuffer(row[name] or b"", dtype=dtype) for name, dtype, _ in _SERIES_CHANNELS
+        },
+        "present": present,
+        "meta": meta,
+    }
+
+
+def columns_to_series(
+    cols: dict[str, Any],
+    index: np.ndarray | None = None,
+    channels: list[str] | None = None,
+) -> list[dict[str, Any]]:
+    """Render columnar arrays back into the series point dicts the UI consumes."""
+    offsets = cols["offsets"]
+    mask = cols["mask"]
+    if index is not None:
+        offsets = offsets[index]
+        mask = mask[index]
+    if not cols.get("start") or not len(offsets):
+        return []
+    start_dt = _parse_series_start(cols["start"])
+    tz_suffix = start_dt.replace(microsecond=0).isoformat()[19:] if start_dt.tzinfo else ""
+    base = np.datetime64(start_dt.replace(tzinfo=None), "us")
+    stamps = base + np.rint(offsets * 1e6).astype("timedelta64[us]")
+    whole = start_dt.microsecond == 0 and bool(np.all(offsets == np.floor(offsets)))
+    stamp_text = np.datetime_as_string(stamps, unit="s" if whole else "us")
+
+    names: list[str] = []
+    columns: list[list[Any]] = []
+    for bit, (name, _, decimals) in enumerate(_SERIES_CHANNELS):
+        if name not in cols["present"] or (channels is not None and name not in channels):
+            continue
+        values = cols["channels"][name]
+        if index is not None:
+            values = values[index]
+        values = values.astype(np.float64)
+        if decimals is not None:
+            values = np.round(values, decimals)
+        valid = ((mask >> bit) & 1).astype(bool)
+        names.append(name)
+        columns.append([float(v) if ok else None for v, ok in zip(values.tolist(), valid.tolist())])
+
+    out: list[dict[str, Any]] = []
+    for i, ts in enumerate(stamp_text.tolist()):
+        point: dict[str, Any] = {"timestamp": f"{ts}{tz_suffix}"}
+        for name, column in zip(names, columns):
+            point[name] = column[i]
+        out.append(point)
+    return out
+
+
+def _channel_values(cols: dict[str, Any], name: str) -> np.ndarray:
+    """Channel as float64 with masked samples set to NaN."""
+    bit = next(i for i, (n, _, _) in enumerate(_SERIES_CHANNELS) if n == name)
+    valid = ((cols["mask"] >> bit) & 1).astype(bool)
+    return np.where(valid, cols["channels"][name].astype(np.float64), np.nan)
+
+
+def lttb_indices(x: np.ndarray, ys: list[np.ndarray], threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets over one or more channels sharing an x axis.
+
+    Each channel is normalised to its own range and the per-bucket triangle
+    areas are summed, so one index set keeps the shape of every channel.
+    NaN samples contribute no area.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    if not ys:
+        return np.unique(np.rint(np.linspace(0, n - 1, threshold)).astype(np.int64))
+
+    y = np.vstack(ys)
+    with np.errstate(all="ignore"):
+        lo = np.nanmin(y, axis=1, keepdims=True)
+        span = np.nanmax(y, axis=1, keepdims=True) - lo
+    lo = np.nan_to_num(lo)
+    span = np.where(np.isfinite(span) & (span > 0), span, 1.0)
+    y = (y - lo) / span
+    y_filled = np.nan_to_num(y)
+    y_valid = (~np.isnan(y)).astype(np.float64)
+
+    # Interior buckets split points 1..n-2; the first and last points are always kept.
+    edges = (np.floor(np.arange(threshold - 1) * ((n - 2) / (threshold - 2))) + 1).astype(np.int64)
+    edges[-1] = n - 1
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[: n - 1], edges[:-1]) / counts
+    with np.errstate(all="ignore"):
+        avg_y = np.add.reduceat(y_filled[:, : n - 1], edges[:-1], axis=1) / np.add.reduceat(
+            y_valid[:, : n - 1], edges[:-1], axis=1
         )
 
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo_i, hi_i = edges[i], edges[i + 1]
+        if i + 1 < threshold - 2:
+            nx, ny = avg_x[i + 1], avg_y[:, i + 1 : i + 2]
+        else:
+            nx, ny = x[n - 1], y[:, n - 1 : n]
+        bx = x[lo_i:hi_i]
+        by = y[:, lo_i:hi_i]
+        with np.errstate(all="ignore"):
+            area = np.abs((x[a] - nx) * (by - y[:, a : a + 1]) - (x[a] - bx) * (ny - y[:, a : a + 1]))
+        a = int(lo_i + np.argmax(np.nan_to_num(area).sum(axis=0)))
+        selected[i + 1] = a
+    return selected
+
+
+def fit_series_window(
+    cols: dict[str, Any],
+    start_s: float | None = None,
+    end_s: float | None = None,
+    points: int | None = None,
+    channels: list[str] | None = None,
+) -> dict[str, Any]:
+    """Slice a stored series to [start_s, end_s] and LTTB-downsample it to ``points``."""
+    offsets = cols["offsets"]
+    lo = 0 if start_s is None else int(np.searchsorted(offsets, start_s, side="left"))
+    hi = len(offsets) if end_s is None else int(np.searchsorted(offsets, end_s, side="right"))
+    window = np.arange(lo, max(lo, hi))
+    if points is not None and len(window) > points:
+        names = [
+            name for name, _, _ in _SERIES_CHANNELS
+            if name in cols["present"] and (channels is None or name in channels)
+            and name not in ("distance", "lat", "lng")
+        ]
+        ys = [_channel_values(cols, name)[lo:hi] for name in names]
+        window = window[lttb_indices(offsets[lo:hi], ys, points)]
+    series = columns_to_series(cols, index=window, channels=channels)
+    return {
+        "series": series,
+        "series_window": {
+            "start_s": float(offsets[lo]) if len(window) else None,
+            "end_s": float(offsets[hi - 1]) if len(window) else None,
+            "source_points": hi - lo,
+            "points": len(series),
+            "total_points": len(offsets),
+        },
+    }
+
+
+def load_fit_series(fit_id: str) -> dict[str, Any] | None:
+    cols = load_fit_columns(fit_id)
+    if cols is None:
+        return None
+    return {**cols["meta"], "series": columns_to_series(cols)}
+
+
+# ---------------------------------------------------------------------------
+# Best-effort curves
+# ---------------------------------------------------------------------------
+
+# Log-spaced mean-max grid from 1 s to 5 h.
+_POWER_CURVE_DURATIONS_S: tuple[int, ...] = tuple(
+    int(d) for d in np.unique(np.rint(np.geomspace(1, 5 * 3600, 48)))
+)
+_PACE_CURVE_DISTANCES_M: tuple[float, ...] = (
+    400.0, 800.0, 1000.0, 1609.344, 3000.0, 5000.0, 10000.0, 15000.0, 21097.5, 42195.0,
+)
+
+
+def _resample_1hz(t: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Hold each sample over the interval it covers on a 1 s grid; gaps read as 0."""
+    if len(t) == 0:
+        return np.zeros(0)
+    dt = _sample_durations(t)
+    grid = np.arange(1, int(np.ceil(t[-1])) + 2, dtype=np.float64)
+    idx = np.minimum(np.searchsorted(t, grid - 0.5, side="left"), len(t) - 1)
+    covered = (grid - 0.5 > t[idx] - dt[idx]) & (grid - 0.5 <= t[idx])
+    filled = np.nan_to_num(values, nan=0.0)
+    return np.where(covered, filled[idx], 0.0)
+
+
+def mean_max_power(t: np.ndarray, power: np.ndarray) -> list[tuple[float, float]]:
+    """Best average power for each duration on the mean-max grid."""
+    p = np.clip(_resample_1hz(t, power), 0.0, None)
+    if not len(p) or not p.any():
+        return []
+    cs = np.concatenate(([0.0], np.cumsum(p)))
+    out: list[tuple[float, float]] = []
+    for d in _POWER_CURVE_DURATIONS_S:
+        if d > len(p):
+            break
+        out.append((float(d), float((cs[d:] - cs[:-d]).max() / d)))
+    return out
+
+
+def best_pace_times(t: np.ndarray, distance: np.ndarray) -> list[tuple[float, float]]:
+    """Fastest elapsed seconds to cover each standard distance."""
+    valid = np.isfinite(distance)
+    if valid.sum() < 2:
+        return []
+    tv = t[valid]
+    dv = np.maximum.accumulate(distance[valid])
+    out: list[tuple[float, float]] = []
+    for target in _PACE_CURVE_DISTANCES_M:
+        starts = dv + target <= dv[-1]
+        if not starts.any():
+            break
+        reach = np.interp(dv[starts] + target, dv, tv)
+        best = float((reach - tv[starts]).min())
+        if best > 0:
+            out.append((target, best))
+    return out
+
+
+def _save_activity_curves(db: sqlite3.Connection, activity_id: str, item: dict[str, Any], cols: dict[str, Any]) -> None:
+    db.execute("DELETE FROM activity_curves WHERE activity_id = ?", (activity_id,))
+    start_date = str(item.get("start_date_local") or "")[:10]
+    sport_key = sport_to_ftp_key(str(item.get("type") or ""))
+    t = cols["offsets"]
+    rows: list[tuple[Any, ...]] = []
+    if "power" in cols["present"]:
+        for x, value in mean_max_power(t, _channel_values(cols, "power")):
+            rows.append((activity_id, "power", x, value, start_date, sport_key))
+    if sport_key == "run" and "distance" in cols["present"]:
+        for x, value in best_pace_times(t, _channel_values(cols, "distance")):
+            rows.append((activity_id, "pace", x, value, start_date, sport_key))
+    db.executemany(
+        "INSERT INTO activity_curves (activity_id, kind, x, value, start_date, sport_key) VALUES (?,?,?,?,?,?)",
+        rows,
+    )
+
+
+def _save_fit_curves(db: sqlite3.Connection, fit_id: str, cols: dict[str, Any]) -> None:
+    """Curves for every activity backed by ``fit_id``, once its series is in the columnar store."""
+    for row in db.execute("SELECT id, start_date_local, type FROM activities WHERE fit_id = ?", (fit_id,)).fetchall():
+        _save_activity_curves(db, row["id"], dict(row), cols)
+
+
+def load_curve_envelope(kind: str, sport_key: str, date_from: str | None, date_to: str | None) -> list[dict[str, Any]]:
+    """Best value per grid point in a date range; power maximises watts, pace minimises seconds.
+
+    Each grid point is one walk down idx_activity_curves_envelope in value
+    order, stopping at the first row inside the date range.
+    """
+    grid = _POWER_CURVE_DURATIONS_S if kind == "power" else _PACE_CURVE_DISTANCES_M
+    order = "DESC" if kind == "power" else "ASC"
+    sql = f"""
+        SELECT x, value, activity_id, start_date
+        FROM activity_curves
+        WHERE kind = ? AND sport_key = ? AND x = ? AND start_date >= ? AND start_date <= ?
+        ORDER BY value {order}
+        LIMIT 1
+    """
+    lo = date_from or ""
+    hi = date_to or "9999-12-31"
+    out: list[dict[str, Any]] = []
+    with get_db() as db:
+        for x in grid:
+            row = db.execute(sql, (kind, sport_key, float(x), lo, hi)).fetchone()
+            if row:
+                out.append(dict(row))
+    return out
+
 
 def _tp_channel_index(channel_set: Any) -> dict[str, int]:
     out: dict[str, int] = {}
@@ -1060,30 +2732,43 @@ def _tp_channel_index(channel_set: Any) -> dict[str, int]:
     return out
 
 
-def _tp_channel_value(values: list[Any], idx_map: dict[str, int], *names: str) -> float | None:
+# Series channel -> TP channel names, in the order a sample's value is looked up.
+_TP_CHANNEL_ALIASES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("heart_rate", ("heartRate", "heart_rate", "heartrate")),
+    ("speed", ("speed",)),
+    ("distance", ("distance",)),
+    ("cadence", ("cadence",)),
+    ("power", ("power",)),
+    ("lat", ("positionLat", "lat", "latitude")),
+    ("lng", ("positionLong", "positionLng", "lng", "longitude")),
+)
+
+
+def _tp_channel_columns(idx_map: dict[str, int], names: tuple[str, ...]) -> list[int]:
+    """Sample value indices for a channel's aliases, resolved once per stream."""
+    out: list[int] = []
     for name in names:
         idx = idx_map.get(name)
         if idx is None:
             idx = idx_map.get(name.lower())
-        if idx is None or idx < 0 or idx >= len(values):
-            continue
-        value = _as_float(values[idx])
-        if value is not None:
-            return value
-    return None
+        if idx is not None and idx >= 0 and idx not in out:
+            out.append(idx)
+    return out
 
 
-def _tp_export_laps_for_workout(workout_id: str, start_dt: datetime) -> list[dict[str, Any]]:
-    path = _tp_export_workout_file(str(workout_id), "detaildata.json")
-    if not path or not path.exists():
-        return []
+def _float_column(values: list[Any]) -> np.ndarray:
+    """float64 array with None and non-numeric entries as NaN."""
     try:
-        raw = json.loads(path.read_text())
-    except (OSError, json.JSONDecodeError):
-        return []
-    laps_stats = raw.get("lapsStats")
-    if not isinstance(laps_stats, list):
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.array([np.nan if (v := _as_float(x)) is None else v for x in values], dtype=np.float64)
+
+
+def _tp_export_laps_for_workout(workout_id: str, start_dt: datetime) -> list[dict[str, Any]]:
+    entry = _tp_export_entry(workout_id, "detaildata.json")
+    if not entry or not entry["laps_json"]:
         return []
+    laps_stats = json.loads(entry["laps_json"])
 
     laps: list[dict[str, Any]] = []
     for idx, lap in enumerate(laps_stats):
@@ -1126,20 +2811,7 @@ def _tp_export_laps_for_workout(workout_id: str, start_dt: datetime) -> list[dic
 
 
 def _tp_export_start_dt(workout_id: str, fallback: datetime) -> datetime:
-    path = _tp_export_workout_file(str(workout_id), "workout.json")
-    if not path or not path.exists():
-        return fallback
-    try:
-        raw = json.loads(path.read_text())
-    except (OSError, json.JSONDecodeError):
-        return fallback
-    start_raw = str(raw.get("startTime") or "").strip()
-    if not start_raw:
-        return fallback
-    try:
-        return datetime.fromisoformat(start_raw.replace("Z", "+00:00"))
-    except ValueError:
-        return fallback
+    return _tp_export_start(workout_id) or fallback
 
 
 def _apply_tp_lap_timing(parsed: dict[str, Any], fit_id: str) -> dict[str, Any]:
@@ -1180,19 +2852,101 @@ def _apply_tp_lap_timing(parsed: dict[str, Any], fit_id: str) -> dict[str, Any]:
     return out
 
 
-def _build_fit_from_tp_stream(fit_id: str) -> dict[str, Any]:
+# Activity row fields a TrainingPeaks summary is built from.
+_TP_ACTIVITY_SQL = """
+    SELECT start_date_local, type, distance, moving_time, if_value, tss_override,
+           np_value, hr_tss, work_kj, calories, avg_speed, avg_power, avg_hr,
+           max_hr, max_power
+    FROM activities
+    WHERE fit_id = ?
+"""
+
+
+def _tp_row_start(activity_row: sqlite3.Row, fit_id: str) -> str | None:
+    """Series start for a TP workout: the row's date with the export's clock time."""
+    return _merge_tp_start_time(_iso(activity_row["start_date_local"]), fit_id) if activity_row["start_date_local"] else None
+
+
+def _tp_meta(
+    fit_id: str,
+    activity_row: sqlite3.Row,
+    stats: dict[str, Any],
+    first_ts: datetime,
+    last_ts: datetime,
+    start_dt: datetime,
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Summary and laps from the activity row, falling back to the series ``stats``.
+
+    Runs on every read, so edits to the row (overrides, imported IF/TSS,
+    update_activity_meta) show up without decoding the stream again.
+    """
+    duration_s = _as_float(activity_row["moving_time"]) or stats["duration_s"]
+    distance_m = _as_float(activity_row["distance"]) or stats["distance_m"]
+    sport = str(activity_row["type"] or "Workout")
+    summary = {
+        "start": first_ts.isoformat(),
+        "end": last_ts.isoformat(),
+        "duration_s": duration_s,
+        "distance_m": distance_m,
+        "avg_hr": _as_float(activity_row["avg_hr"]) or stats["avg_hr"],
+        "max_hr": _as_float(activity_row["max_hr"]) or stats["max_hr"],
+        "avg_speed": _as_float(activity_row["avg_speed"]) or stats["avg_speed"],
+        "max_speed": stats["max_speed"],
+        "avg_power": _as_float(activity_row["avg_power"]) or stats["avg_power"],
+        "max_power": _as_float(activity_row["max_power"]) or stats["max_power"],
+        "avg_cadence": stats["avg_cadence"],
+        "max_cadence": stats["max_cadence"],
+        "elev_gain_m": None,
+        "work_kj": _as_float(activity_row["work_kj"]),
+        "calories": _as_float(activity_row["calories"]),
+        "sport": sport,
+        "sport_key": sport_to_ftp_key(sport),
+        "ftp": None,
+        "lthr": None,
+        "if": _as_float(activity_row["if_value"]),
+        "tss": _as_float(activity_row["tss_override"]),
+        "hr_tss": _as_float(activity_row["hr_tss"]),
+        "normalized_power": _as_float(activity_row["np_value"]),
+    }
+    laps = _tp_export_laps_for_workout(fit_id, start_dt)
+    if not laps:
+        laps = [
+            {
+                "name": "Lap 1",
+                "start": first_ts.isoformat(),
+                "end": last_ts.isoformat(),
+                "duration_s": duration_s,
+                "distance_m": distance_m,
+                "avg_hr": summary["avg_hr"],
+                "max_hr": summary["max_hr"],
+                "avg_speed": summary["avg_speed"],
+                "max_speed": summary["max_speed"],
+                "avg_power": summary["avg_power"],
+                "max_power": summary["max_power"],
+                "avg_cadence": summary["avg_cadence"],
+                "max_cadence": summary["max_cadence"],
+            }
+        ]
+    return summary, laps
+
+
+def _parse_tp_start(start_raw: str | None) -> datetime:
+    try:
+        return datetime.fromisoformat((start_raw or "").replace("Z", "+00:00"))
+    except ValueError:
+        return datetime.utcnow()
+
+
+def decode_tp_stream(fit_id: str) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Decode a TrainingPeaks tp_streams row into series columns plus summary/lap metadata.
+
+    The stored meta keeps only what the samples give (``series_stats``) and
+    the start they were placed at (``tp_start``); refresh_tp_meta() rebuilds
+    the summary from the activity row on each read.
+    """
     try:
         with get_db() as db:
-            activity_row = db.execute(
-                """
-                SELECT start_date_local, type, distance, moving_time, if_value, tss_override,
-                       np_value, hr_tss, work_kj, calories, avg_speed, avg_power, avg_hr,
-                       max_hr, max_power
-                FROM activities
-                WHERE fit_id = ?
-                """,
-                (fit_id,),
-            ).fetchone()
+            activity_row = db.execute(_TP_ACTIVITY_SQL, (fit_id,)).fetchone()
             stream_row = db.execute(
                 """
                 SELECT channel_set_json, samples_gzip, encoding
@@ -1228,127 +2982,774 @@ def _build_fit_from_tp_stream(fit_id: str) -> dict[str, Any]:
     if not isinstance(samples, list) or not samples:
         raise HTTPException(status_code=404, detail="No TP stream samples found.")
 
-    start_raw = _merge_tp_start_time(_iso(activity_row["start_date_local"]) or datetime.utcnow().isoformat(), fit_id) or datetime.utcnow().isoformat()
+    tp_start = _tp_row_start(activity_row, fit_id)
+    start_dt = _parse_tp_start(tp_start)
+
+    rows = [
+        (row.get("ms"), values)
+        for row in samples
+        if isinstance(row, dict) and isinstance(values := row.get("values"), list)
+    ]
+    ms = _float_column([r[0] for r in rows])
+    value_rows = [r[1] for r in rows]
     try:
-        start_dt = datetime.fromisoformat(start_raw.replace("Z", "+00:00"))
-    except ValueError:
-        start_dt = datetime.utcnow()
+        # Rectangular numeric samples convert in one C-level pass.
+        matrix: np.ndarray | None = np.array(value_rows, dtype=np.float64)
+        if matrix.ndim != 2:
+            matrix = None
+    except (TypeError, ValueError):
+        matrix = None
+
+    def column(idx: int) -> np.ndarray:
+        if matrix is not None:
+            return matrix[:, idx] if idx < matrix.shape[1] else np.full(len(rows), np.nan)
+        return _float_column([v[idx] if idx < len(v) else None for v in value_rows])
 
     idx_map = _tp_channel_index(channel_set)
-    points: list[dict[str, Any]] = []
-    for row in samples:
-        if not isinstance(row, dict):
-            continue
-        ms = _as_float(row.get("ms"))
-        values = row.get("values")
-        if ms is None or not isinstance(values, list):
-            continue
-        ts = (start_dt + timedelta(milliseconds=ms)).isoformat()
-        point: dict[str, Any] = {"timestamp": ts}
-
-        hr = _tp_channel_value(values, idx_map, "heartRate", "heart_rate", "heartrate")
-        speed = _tp_channel_value(values, idx_map, "speed")
-        distance = _tp_channel_value(values, idx_map, "distance")
-        cadence = _tp_channel_value(values, idx_map, "cadence")
-        power = _tp_channel_value(values, idx_map, "power")
-        lat = _tp_channel_value(values, idx_map, "positionLat", "lat", "latitude")
-        lng = _tp_channel_value(values, idx_map, "positionLong", "positionLng", "lng", "longitude")
-
-        if hr is not None:
-            point["heart_rate"] = hr
-        if speed is not None:
-            point["speed"] = speed
-        if distance is not None:
-            point["distance"] = distance
-        if cadence is not None:
-            point["cadence"] = cadence
-        if power is not None:
-            point["power"] = power
-        if lat is not None:
-            point["lat"] = lat
-        if lng is not None:
-            point["lng"] = lng
-
-        if len(point) > 1:
-            points.append(point)
-
-    if not points:
+    raw: dict[str, np.ndarray] = {}
+    for name, aliases in _TP_CHANNEL_ALIASES:
+        values = np.full(len(rows), np.nan)
+        for idx in _tp_channel_columns(idx_map, aliases):
+            values = np.where(np.isnan(values), column(idx), values)
+        raw[name] = values
+
+    # Keep samples with a timestamp and at least one supported channel value.
+    keep = ~np.isnan(ms) & np.any(~np.isnan(np.vstack(list(raw.values()))), axis=0) if rows else np.zeros(0, bool)
+    if not keep.any():
         raise HTTPException(status_code=404, detail="No supported TP stream channels available.")
+    ms = ms[keep]
+    raw = {name: values[keep] for name, values in raw.items()}
+    present = [name for name, values in raw.items() if not np.isnan(values).all()]
+
+    first_ts = start_dt + timedelta(milliseconds=float(ms[0]))
+    offsets = (ms - ms[0]) / 1000.0
+    last_ts = first_ts + timedelta(seconds=float(offsets[-1]))
+    distance_series = _present_values(raw["distance"])
+    hr_values = _present_values(raw["heart_rate"])
+    speed_values = _present_values(raw["speed"])
+    power_values = _present_values(raw["power"])
+    cadence_values = _present_values(raw["cadence"])
+    stats = {
+        "duration_s": max(1.0, float(offsets[-1])),
+        "distance_m": float(distance_series[-1]) if distance_series.size else 0.0,
+        "avg_hr": _array_mean(hr_values),
+        "max_hr": _array_max(hr_values),
+        "avg_speed": _array_mean(speed_values),
+        "max_speed": _array_max(speed_values),
+        "avg_power": _array_mean(power_values),
+        "max_power": _array_max(power_values),
+        "avg_cadence": _array_mean(cadence_values),
+        "max_cadence": _array_max(cadence_values),
+    }
+    summary, laps = _tp_meta(fit_id, activity_row, stats, first_ts, last_ts, start_dt)
+    has_gps = any(c in ("positionLat", "positionLong", "lat", "lng", "latitude", "longitude") for c in channel_set)
+    # source marks TP-derived series so threshold recalculation leaves TrainingPeaks' own IF/TSS alone.
+    meta = {
+        "summary": summary,
+        "laps": laps,
+        "has_gps": has_gps,
+        "source": "tp_stream",
+        "series_stats": stats,
+        "tp_start": tp_start,
+    }
+    return _build_series_columns(first_ts.isoformat(), offsets, raw, present), meta
 
-    first_ts = datetime.fromisoformat(points[0]["timestamp"].replace("Z", "+00:00"))
-    last_ts = datetime.fromisoformat(points[-1]["timestamp"].replace("Z", "+00:00"))
-    duration_s = _as_float(activity_row["moving_time"]) or max(1.0, (last_ts - first_ts).total_seconds())
-    distance_series = [p["distance"] for p in points if p.get("distance") is not None]
-    distance_m = _as_float(activity_row["distance"]) or (distance_series[-1] if distance_series else 0.0)
-
-    hr_values = [p["heart_rate"] for p in points if p.get("heart_rate") is not None]
-    speed_values = [p["speed"] for p in points if p.get("speed") is not None]
-    power_values = [p["power"] for p in points if p.get("power") is not None]
-    cadence_values = [p["cadence"] for p in points if p.get("cadence") is not None]
 
-    sport = str(activity_row["type"] or "Workout")
-    sport_key = sport_to_ftp_key(sport)
+def refresh_tp_meta(fit_id: str, cols: dict[str, Any]) -> dict[str, Any] | None:
+    """Stored TP columns with the summary rebuilt from the current activity row.
 
-    summary = {
-        "start": first_ts.isoformat(),
-        "end": last_ts.isoformat(),
-        "duration_s": duration_s,
-        "distance_m": distance_m,
-        "avg_hr": _as_float(activity_row["avg_hr"]) or _mean(hr_values),
-        "max_hr": _as_float(activity_row["max_hr"]) or _max(hr_values),
-        "avg_speed": _as_float(activity_row["avg_speed"]) or _mean(speed_values),
-        "max_speed": _max(speed_values),
-        "avg_power": _as_float(activity_row["avg_power"]) or _mean(power_values),
-        "max_power": _as_float(activity_row["max_power"]) or _max(power_values),
-        "avg_cadence": _mean(cadence_values),
-        "max_cadence": _max(cadence_values),
-        "elev_gain_m": None,
-        "work_kj": _as_float(activity_row["work_kj"]),
-        "calories": _as_float(activity_row["calories"]),
-        "sport": sport,
-        "sport_key": sport_key,
-        "ftp": None,
-        "lthr": None,
-        "if": _as_float(activity_row["if_value"]),
-        "tss": _as_float(activity_row["tss_override"]),
-        "hr_tss": _as_float(activity_row["hr_tss"]),
-        "normalized_power": _as_float(activity_row["np_value"]),
-    }
-    laps = _tp_export_laps_for_workout(fit_id, start_dt)
-    if not laps:
-        laps = [
-            {
-                "name": "Lap 1",
-                "start": first_ts.isoformat(),
-                "end": last_ts.isoformat(),
-                "duration_s": duration_s,
-                "distance_m": distance_m,
-                "avg_hr": summary["avg_hr"],
-                "max_hr": summary["max_hr"],
-                "avg_speed": summary["avg_speed"],
-                "max_speed": summary["max_speed"],
-                "avg_power": summary["avg_power"],
-                "max_power": summary["max_power"],
-                "avg_cadence": summary["avg_cadence"],
-                "max_cadence": summary["max_cadence"],
-            }
-        ]
-    has_gps = any(c in ("positionLat", "positionLong", "lat", "lng", "latitude", "longitude") for c in channel_set)
-    return {"summary": summary, "series": points, "laps": laps, "has_gps": has_gps}
+    Returns None when the row's start moved since the stream was decoded (or
+    the series predates series_stats), so the caller decodes it again.
+    """
+    meta = cols["meta"]
+    with get_db() as db:
+        activity_row = db.execute(_TP_ACTIVITY_SQL, (fit_id,)).fetchone()
+    if activity_row is None or "series_stats" not in meta:
+        return None
+    tp_start = _tp_row_start(activity_row, fit_id)
+    if tp_start != meta.get("tp_start") or not cols.get("start") or not len(cols["offsets"]):
+        return None
+    first_ts = _parse_series_start(cols["start"])
+    last_ts = first_ts + timedelta(seconds=float(cols["offsets"][-1]))
+    summary, laps = _tp_meta(fit_id, activity_row, meta["series_stats"], first_ts, last_ts, _parse_tp_start(tp_start))
+    return {**cols, "meta": {**meta, "summary": summary, "laps": laps}}
 
 
 def load_fit_parsed(fit_id: str) -> dict[str, Any]:
+    stored = load_fit_series(fit_id)
+    if stored is not None:
+        return _apply_tp_lap_timing(stored, fit_id)
     with get_db() as db:
         row = db.execute(
-            "SELECT fit_parsed_json FROM activities WHERE fit_id = ?", (fit_id,)
+            """
+            SELECT b.fit_parsed_json FROM activities a
+            JOIN activity_blobs b ON b.activity_id = a.id
+            WHERE a.fit_id = ?
+            """,
+            (fit_id,),
         ).fetchone()
     if row and row["fit_parsed_json"]:
         try:
             parsed = json.loads(row["fit_parsed_json"])
-            return _apply_tp_lap_timing(parsed, fit_id)
         except json.JSONDecodeError as err:
             raise HTTPException(status_code=500, detail="Corrupted FIT parsed data.") from err
-    return _apply_tp_lap_timing(_build_fit_from_tp_stream(fit_id), fit_id)
+        # Legacy row: move it into the columnar store so later reads skip the JSON blob.
+        save_fit_parsed(fit_id, parsed)
+        return _apply_tp_lap_timing(load_fit_series(fit_id) or parsed, fit_id)
+    # TrainingPeaks stream: decode once into the columnar store, like a FIT import.
+    cols, meta = decode_tp_stream(fit_id)
+    with get_db() as db:
+        _write_fit_series(db, fit_id, cols, meta)
+        _save_fit_curves(db, fit_id, cols)
+    return _apply_tp_lap_timing({**meta, "series": columns_to_series(cols)}, fit_id)
+
+
+def load_fit_window(
+    fit_id: str,
+    start_s: float | None = None,
+    end_s: float | None = None,
+    points: int | None = None,
+    channels: list[str] | None = None,
+) -> dict[str, Any]:
+    cols = load_fit_columns(fit_id)
+    if cols is None:
+        parsed = load_fit_parsed(fit_id)
+        cols = load_fit_columns(fit_id)
+        if cols is None:
+            series = parsed.get("series")
+            cols = series_to_columns(series if isinstance(series, list) else [])
+            cols["meta"] = {k: v for k, v in parsed.items() if k != "series"}
+    meta = _apply_tp_lap_timing(dict(cols["meta"]), fit_id)
+    return {**meta, **fit_series_window(cols, start_s=start_s, end_s=end_s, points=points, channels=channels)}
+
+
+# ---------------------------------------------------------------------------
+# Performance management (CTL/ATL/TSB)
+# ---------------------------------------------------------------------------
+
+_OVERRIDE_FIELDS = (
+    "description", "comments", "comments_feed", "feel", "rpe",
+    "tss_override", "if_value", "tss_source", "analysis_edits",
+    "duration_min", "distance_km", "distance_m", "elevation_m",
+    "distance_unit", "elevation_unit", "planned_tss", "planned_if",
+    "planned_avg_speed", "planned_calories", "planned_work_kj",
+    "completed_duration_min",
+)
+# Activity fields the TSS fallback chain reads; mirrors activityToTss in app.js.
+_LOAD_INPUT_FIELDS = (
+    "id", "type", "start_date_local", "moving_time", "tss_override", "completed_tss",
+    "if_value", "completed_if", "completed_duration_min", "avg_power", "hr_tss",
+    "avg_heartrate", "avg_hr", "tss_source",
+)
+_LOCAL_LOAD_COLUMNS = tuple(
+    c for c in _LOAD_INPUT_FIELDS if c not in ("completed_tss", "completed_if", "avg_heartrate")
+)
+_TYPE_INTENSITY = {
+    "Run": 0.85, "Bike": 0.82, "Swim": 0.8, "Brick": 0.9, "Crosstrain": 0.7, "Day Off": 0.2,
+    "Mtn Bike": 0.86, "Strength": 0.75, "Custom": 0.72, "XC-Ski": 0.88, "Rowing": 0.84,
+    "Walk": 0.55, "Other": 0.65, "Ride": 0.82, "Workout": 0.8,
+}
+_CTL_DAYS = 42.0
+_ATL_DAYS = 7.0
+_ALL_SPORTS = ""
+
+
+def apply_activity_override(row: dict[str, Any], override: dict[str, Any]) -> dict[str, Any] | None:
+    """Merge a user override onto an activity row; None when the override hides it."""
+    if override.get("hidden"):
+        return None
+    updated = {**row}
+    if override.get("date"):
+        old = str(updated.get("start_date_local", ""))
+        time_part = old[10:] if len(old) > 10 else "T08:00:00"
+        updated["start_date_local"] = f"{override['date']}{time_part}"
+    if override.get("title"):
+        updated["name"] = str(override["title"])
+    if override.get("type"):
+        updated["type"] = str(override["type"])
+    for k in _OVERRIDE_FIELDS:
+        if k in override and override[k] is not None:
+            updated[k] = override[k]
+    return updated
+
+
+def _positive(v: Any) -> float:
+    n = _as_float(v)
+    return n if n is not None and n > 0 else 0.0
+
+
+def activity_tss(activity: dict[str, Any], settings: dict[str, Any]) -> float:
+    """Server-side port of the client's activityToTss fallback chain."""
+    override = _positive(activity.get("tss_override"))
+    if override:
+        return override
+    sport_key = sport_to_ftp_key(str(activity.get("type") or ""))
+    ftp, lthr = sport_thresholds(settings, sport_key, str(activity.get("start_date_local") or "")[:10] or None)
+    moving_s = _positive(activity.get("moving_time"))
+
+    ifv = _positive(activity.get("if_value")) or _positive(activity.get("completed_if"))
+    if not ifv:
+        tss = _positive(activity.get("completed_tss"))
+        duration_min = _as_float(activity.get("completed_duration_min"))
+        hours = (duration_min if duration_min is not None and duration_min >= 0 else moving_s / 60.0) / 60.0
+        if tss > 0 and hours > 0:
+            ifv = (tss / (hours * 100.0)) ** 0.5
+        elif ftp and _positive(activity.get("avg_power")):
+            ifv = _positive(activity.get("avg_power")) / ftp
+    duration_h = moving_s / 3600.0
+    power_tss = duration_h * ifv * ifv * 100.0 if ifv and duration_h > 0 else 0.0
+
+    hr_tss = _positive(activity.get("hr_tss"))
+    if not hr_tss:
+        avg_hr = _positive(activity.get("avg_heartrate")) or _positive(activity.get("avg_hr"))
+        if lthr and avg_hr and duration_h > 0:
+            zone = int(np.searchsorted(_HR_ZONE_BOUNDS, avg_hr / lthr * 100.0, side="right"))
+            hr_tss = duration_h * float(_HR_ZONE_RATES[zone])
+
+    source = activity.get("tss_source")
+    if source == "hr" and hr_tss:
+        return hr_tss
+    if source == "power" and power_tss:
+        return power_tss
+    if power_tss:
+        return power_tss
+    if hr_tss:
+        return hr_tss
+    intensity = max(0.2, _TYPE_INTENSITY.get(str(activity.get("type") or "Other"), 0.7))
+    return float(round(moving_s / 3600.0 * intensity * intensity * 100.0))
+
+
+def _planned_load_inputs(item: dict[str, Any]) -> dict[str, Any] | None:
+    """Completed values typed onto a planned workout, shaped like an activity."""
+    if item.get("kind") != "workout":
+        return None
+    dur = _positive(item.get("completed_duration_min"))
+    dist = _positive(item.get("completed_distance_km"))
+    tss = _positive(item.get("completed_tss"))
+    ifv = _positive(item.get("completed_if"))
+    if dur <= 0 and dist <= 0 and tss <= 0 and ifv <= 0:
+        return None
+    return {
+        "id": f"planned:{item.get('id')}",
+        "type": item.get("workout_type") or "Workout",
+        "start_date_local": f"{item.get('date')}T00:00:00",
+        "moving_time": dur * 60.0,
+        "tss_override": tss,
+        "if_value": ifv,
+    }
+
+
+def _mark_pmc_dirty(db: sqlite3.Connection, day: str, sport_key: str) -> None:
+    for key in (_ALL_SPORTS, sport_key):
+        db.execute(
+            """
+            INSERT INTO pmc_state (sport_key, dirty_from) VALUES (?, ?)
+            ON CONFLICT(sport_key) DO UPDATE SET dirty_from =
+                CASE WHEN dirty_from IS NULL OR excluded.dirty_from < dirty_from
+                     THEN excluded.dirty_from ELSE dirty_from END
+            """,
+            (key, day),
+        )
+
+
+def _recount_daily_load(db: sqlite3.Connection, day: str, sport_key: str) -> None:
+    total = db.execute(
+        "SELECT COALESCE(SUM(tss), 0) FROM activity_load WHERE date = ? AND sport_key = ?",
+        (day, sport_key),
+    ).fetchone()[0]
+    if total > 0:
+        db.execute(
+            "INSERT OR REPLACE INTO daily_load (date, sport_key, tss) VALUES (?, ?, ?)",
+            (day, sport_key, total),
+        )
+    else:
+        db.execute("DELETE FROM daily_load WHERE date = ? AND sport_key = ?", (day, sport_key))
+    _mark_pmc_dirty(db, day, sport_key)
+
+
+def _write_activity_load(
+    db: sqlite3.Connection,
+    source_id: str,
+    base: dict[str, Any] | None,
+    merged: dict[str, Any] | None,
+    settings: dict[str, Any],
+) -> None:
+    """Store one source's load and re-total only the days/sports it touched."""
+    existing = db.execute(
+        "SELECT date, sport_key, tss, base_json FROM activity_load WHERE source_id = ?", (source_id,)
+    ).fetchone()
+    new_day = str((merged or {}).get("start_date_local") or "")[:10]
+    if merged is None or not new_day:
+        target = None
+    else:
+        target = (new_day, sport_to_ftp_key(str(merged.get("type") or "")), activity_tss(merged, settings))
+    base_json = json.dumps(base) if base is not None else None
+
+    if existing and target and (existing["date"], existing["sport_key"], existing["tss"]) == target:
+        if existing["base_json"] != base_json:
+            db.execute("UPDATE activity_load SET base_json = ? WHERE source_id = ?", (base_json, source_id))
+        return
+    if not existing and not target:
+        return
+    if target:
+        db.execute(
+            "INSERT OR REPLACE INTO activity_load (source_id, date, sport_key, tss, base_json) VALUES (?,?,?,?,?)",
+            (source_id, *target, base_json),
+        )
+        _recount_daily_load(db, target[0], target[1])
+    elif base is not None:
+        db.execute(
+            "UPDATE activity_load SET date = NULL, sport_key = NULL, tss = 0, base_json = ? WHERE source_id = ?",
+            (base_json, source_id),
+        )
+    else:
+        db.execute("DELETE FROM activity_load WHERE source_id = ?", (source_id,))
+    if existing and existing["date"] and (not target or (existing["date"], existing["sport_key"]) != target[:2]):
+        _recount_daily_load(db, existing["date"], existing["sport_key"])
+
+
+def _load_base(row: dict[str, Any]) -> dict[str, Any]:
+    return {k: row.get(k) for k in _LOAD_INPUT_FIELDS if row.get(k) is not None}
+
+
+def refresh_activity_load(
+    db: sqlite3.Connection,
+    activity_id: str,
+    settings: dict[str, Any] | None = None,
+    base: dict[str, Any] | None = None,
+) -> None:
+    """Recompute one activity's daily load from its base row plus any override.
+
+    Local activities read their base from the activities table; external
+    (Strava) activities reuse the base stored when they were last seen.
+    """
+    settings = settings or effective_settings()
+    if base is None:
+        row = db.execute(
+            f"SELECT {', '.join(_LOCAL_LOAD_COLUMNS)}, hidden FROM activities WHERE id = ?",
+            (activity_id,),
+        ).fetchone()
+        if row:
+            base = None if row["hidden"] else _load_base(dict(row))
+        else:
+            stored = db.execute(
+                "SELECT base_json FROM activity_load WHERE source_id = ?", (activity_id,)
+            ).fetchone()
+            if stored and stored["base_json"]:
+                base = json.loads(stored["base_json"])
+    if base is None:
+        _write_activity_load(db, activity_id, None, None, settings)
+        return
+    override_row = db.execute("SELECT * FROM activity_overrides WHERE id = ?", (activity_id,)).fetchone()
+    override = override_to_dict(override_row) if override_row else {}
+    _write_activity_load(db, activity_id, base, apply_activity_override(base, override), settings)
+
+
+def refresh_planned_load(
+    db: sqlite3.Connection,
+    item: dict[str, Any] | None,
+    item_id: str,
+    settings: dict[str, Any] | None = None,
+) -> None:
+    """Completed values on a planned workout count only while it is not paired."""
+    source_id = f"planned:{item_id}"
+    inputs = _planned_load_inputs(item) if item else None
+    if inputs and db.execute("SELECT 1 FROM workout_pairs WHERE planned_id = ?", (str(item_id),)).fetchone():
+        inputs = None
+    _write_activity_load(db, source_id, inputs, inputs, settings or effective_settings())
+
+
+def sync_external_loads(rows: list[dict[str, Any]]) -> None:
+    """Record load for externally sourced (Strava) rows whose inputs changed since last seen."""
+    with get_db() as db:
+        known = {
+            r["source_id"]: r["base_json"]
+            for r in db.execute("SELECT source_id, base_json FROM activity_load").fetchall()
+        }
+        settings: dict[str, Any] | None = None
+        for row in rows:
+            rid = str(row.get("id"))
+            base = _load_base({**row, "id": rid})
+            if known.get(rid) == json.dumps(base):
+                continue
+            settings = settings or effective_settings()
+            refresh_activity_load(db, rid, settings, base=base)
+
+
+def rebuild_activity_loads() -> None:
+    """Recompute every stored load, e.g. after FTP/LTHR changes. Unchanged rows are no-ops."""
+    settings = effective_settings()
+    with get_db() as db:
+        local_ids = [r["id"] for r in db.execute("SELECT id FROM activities").fetchall()]
+        known_ids = [
+            r["source_id"] for r in db.execute(
+                "SELECT source_id FROM activity_load WHERE source_id NOT LIKE 'planned:%'"
+            ).fetchall()
+        ]
+        for aid in dict.fromkeys([*local_ids, *known_ids]):
+            refresh_activity_load(db, aid, settings)
+        for item in load_calendar_items():
+            refresh_planned_load(db, item, str(item.get("id")), settings)
+
+
+def ensure_activity_loads() -> None:
+    with get_db() as db:
+        seeded = db.execute("SELECT 1 FROM activity_load LIMIT 1").fetchone()
+    if not seeded:
+        rebuild_activity_loads()
+
+
+# ---------------------------------------------------------------------------
+# Threshold recalculation
+# ---------------------------------------------------------------------------
+
+TSS_RECALC_BATCH_SIZE = 50
+
+_tss_recalc_lock = threading.Lock()
+_tss_recalc_stop = threading.Event()
+_tss_recalc_thread: threading.Thread | None = None
+_tss_recalc_state: dict[str, Any] = {"status": "idle"}
+
+
+def _date_range_clause(column: str, ranges: list[tuple[str | None, str | None]]) -> tuple[str, list[Any]]:
+    """SQL matching column inside any [start, end) date range; None bounds are open."""
+    parts: list[str] = []
+    params: list[Any] = []
+    for start, end in ranges:
+        conds = ["1"]
+        if start:
+            conds.append(f"{column} >= ?")
+            params.append(start)
+        if end:
+            conds.append(f"{column} < ?")
+            params.append(end)
+        parts.append(" AND ".join(conds))
+    return "(" + " OR ".join(f"({p})" for p in parts) + ")", params
+
+
+def _recalculate_fit_summaries(tasks: list[dict[str, Any]], settings: dict[str, Any]) -> list[dict[str, Any]]:
+    """Process-pool task: IF/TSS/hrTSS for stored series under new thresholds.
+
+    Normalized power and duration come from the stored summary; only hrTSS
+    needs the heart-rate column, so FIT files are never decoded again.
+    """
+    out: list[dict[str, Any]] = []
+    for task in tasks:
+        summary = dict(task["summary"])
+        ftp, lthr = sport_thresholds(settings, str(summary.get("sport_key") or "other"), task["day"])
+        duration_s = _as_float(summary.get("duration_s")) or 0.0
+        if_value, tss = _power_tss(duration_s, _as_float(summary.get("normalized_power")), ftp)
+        hr_tss = None
+        if lthr and task["heart_rate"] is not None:
+            cols = {
+                "mask": np.frombuffer(task["mask"], dtype=_SERIES_MASK_DTYPE),
+                "channels": {"heart_rate": np.frombuffer(task["heart_rate"], dtype="<i2")},
+            }
+            offsets = np.frombuffer(task["offsets"], dtype=_SERIES_OFFSET_DTYPE)
+            hr_tss = _hr_tss(offsets, _channel_values(cols, "heart_rate"), lthr)
+        summary.update({"ftp": ftp, "lthr": lthr, "if": if_value, "tss": tss, "hr_tss": hr_tss})
+        out.append({**task, "new_summary": summary})
+    return out
+
+
+def _same_value(a: Any, b: Any) -> bool:
+    a, b = _as_float(a), _as_float(b)
+    return a == b or (a is not None and b is not None and abs(a - b) <= 1e-6 * max(1.0, abs(b)))
+
+
+def _write_recalculated_summaries(results: list[dict[str, Any]], settings: dict[str, Any]) -> int:
+    """Store one batch of recalculated summaries in a single transaction."""
+    with get_db() as db:
+        for res in results:
+            old, new = res["summary"], res["new_summary"]
+            # IF/TSS typed in by hand (via /meta) no longer match the FIT summary; keep them.
+            if_value = new["if"] if _same_value(res["if_value"], old.get("if")) else res["if_value"]
+            tss = new["tss"] if _same_value(res["tss_override"], old.get("tss")) else res["tss_override"]
+            db.execute(
+                "UPDATE activities SET if_value = ?, tss_override = ?, hr_tss = ? WHERE id = ?",
+                (if_value, tss, new["hr_tss"], res["id"]),
+            )
+            meta = {**res["meta"], "summary": new}
+            db.execute(
+                "UPDATE fit_series SET meta_json = ?, version = ? WHERE fit_id = ?",
+                (json.dumps(meta), time.time_ns(), res["fit_id"]),
+            )
+            refresh_activity_view(db, res["id"])
+            refresh_activity_load(db, res["id"], settings)
+    return len(results)
+
+
+def _tss_recalc_tasks(ids: list[str]) -> list[dict[str, Any]]:
+    with get_db() as db:
+        rows = db.execute(
+            f"""
+            SELECT a.id, a.start_date_local, a.if_value, a.tss_override,
+                   f.fit_id, f.meta_json, f.offsets, f.mask, f.heart_rate
+            FROM activities a JOIN fit_series f ON f.fit_id = a.fit_id
+            WHERE a.id IN ({','.join('?' * len(ids))})
+            """,
+            ids,
+        ).fetchall()
+    tasks = []
+    for row in rows:
+        meta = json.loads(row["meta_json"] or "{}")
+        tasks.append({
+            "id": row["id"],
+            "fit_id": row["fit_id"],
+            "day": str(row["start_date_local"] or "")[:10] or None,
+            "if_value": row["if_value"],
+            "tss_override": row["tss_override"],
+            "meta": {k: v for k, v in meta.items() if k != "summary"},
+            "summary": meta.get("summary") or {},
+            "offsets": row["offsets"],
+            "mask": row["mask"],
+            "heart_rate": row["heart_rate"],
+        })
+    return tasks
+
+
+def _refresh_loads(source_ids: list[str], settings: dict[str, Any]) -> int:
+    with get_db() as db:
+        for source_id in source_ids:
+            if source_id.startswith("planned:"):
+                item_id = source_id.split(":", 1)[1]
+                refresh_planned_load(db, get_calendar_item(item_id), item_id, settings)
+            else:
+                refresh_activity_load(db, source_id, settings)
+    return len(source_ids)
+
+
+def _update_tss_recalc(stop: threading.Event, **changes: Any) -> None:
+    """Record progress for the job owning ``stop``; superseded jobs are ignored."""
+    with _tss_recalc_lock:
+        if stop is _tss_recalc_stop:
+            _tss_recalc_state.update(changes)
+
+
+def _run_tss_recalc(
+    ranges: dict[str, list[tuple[str | None, str | None]]],
+    settings: dict[str, Any],
+    stop: threading.Event,
+    previous: threading.Thread | None = None,
+) -> None:
+    try:
+        # A cancelled predecessor finishes its in-flight batch first, so its
+        # writes cannot land on top of ours.
+        if previous is not None:
+            previous.join()
+        fit_ids: list[str] = []
+        load_ids: list[str] = []
+        with get_db() as db:
+            for sport_key, sport_ranges in ranges.items():
+                clause, params = _date_range_clause("a.start_date_local", sport_ranges)
+                fit_ids += [
+                    r["id"] for r in db.execute(
+                        f"""
+                        SELECT a.id FROM activities a JOIN fit_series f ON f.fit_id = a.fit_id
+                        WHERE a.hidden = 0 AND json_extract(f.meta_json, '$.summary.sport_key') = ?
+                          AND json_extract(f.meta_json, '$.source') IS NOT 'tp_stream' AND {clause}
+                        """,
+                        (sport_key, *params),
+                    ).fetchall()
+                ]
+                clause, params = _date_range_clause("date", sport_ranges)
+                load_ids += [
+                    r["source_id"] for r in db.execute(
+                        f"SELECT source_id FROM activity_load WHERE sport_key = ? AND {clause}",
+                        (sport_key, *params),
+                    ).fetchall()
+                ]
+        fit_ids = list(dict.fromkeys(fit_ids))
+        fit_set = set(fit_ids)
+        load_ids = [sid for sid in dict.fromkeys(load_ids) if sid not in fit_set]
+        _update_tss_recalc(stop, total=len(fit_ids) + len(load_ids))
+        pool = _fit_import_executor()
+        in_flight: dict[Future, int] = {}
+        done = 0
+
+        def collect(wait_for: Any) -> None:
+            nonlocal done
+            finished, _ = futures_wait(list(in_flight), return_when=wait_for)
+            for future in finished:
+                in_flight.pop(future)
+                done += _write_recalculated_summaries(future.result(), settings)
+            _update_tss_recalc(stop, done=done)
+
+        for start in range(0, len(fit_ids), TSS_RECALC_BATCH_SIZE):
+            if stop.is_set():
+                break
+            while len(in_flight) >= FIT_IMPORT_WORKERS * 2:
+                collect(FIRST_COMPLETED)
+            tasks = _tss_recalc_tasks(fit_ids[start:start + TSS_RECALC_BATCH_SIZE])
+            in_flight[pool.submit(_recalculate_fit_summaries, tasks, settings)] = start
+        if stop.is_set():
+            for future in in_flight:
+                future.cancel()
+            in_flight = {f: i for f, i in in_flight.items() if not f.cancelled()}
+        while in_flight:
+            collect(FIRST_COMPLETED)
+        # Loads of everything else in range (Strava rows, planned workouts) that
+        # fall back to FTP/LTHR in activity_tss.
+        for start in range(0, len(load_ids), TSS_RECALC_BATCH_SIZE):
+            if stop.is_set():
+                break
+            done += _refresh_loads(load_ids[start:start + TSS_RECALC_BATCH_SIZE], settings)
+            _update_tss_recalc(stop, done=done)
+        status, error = ("cancelled" if stop.is_set() else "done"), None
+    except Exception as err:
+        status, error = "error", str(err)
+    _update_tss_recalc(stop, status=status, error=error, finished_at=datetime.utcnow().isoformat(timespec="seconds") + "Z")
+
+
+def tss_recalc_state() -> dict[str, Any]:
+    with _tss_recalc_lock:
+        return dict(_tss_recalc_state)
+
+
+def start_tss_recalc(ranges: dict[str, list[tuple[str | None, str | None]]]) -> dict[str, Any]:
+    """Recalculate IF/TSS/hrTSS and loads for the given sports' date ranges.
+
+    A job already running is cancelled and its ranges folded into the new one,
+    since its remaining rows would otherwise keep the thresholds it started with.
+    The new job waits for the old one in its own thread, not in the request.
+    """
+    global _tss_recalc_stop, _tss_recalc_thread
+    merged = {key: list(value) for key, value in ranges.items()}
+    settings = effective_settings()
+    with _tss_recalc_lock:
+        previous = _tss_recalc_thread if _tss_recalc_thread and _tss_recalc_thread.is_alive() else None
+        if previous is not None:
+            for key, value in (_tss_recalc_state.get("ranges") or {}).items():
+                merged.setdefault(key, []).extend(tuple(r) for r in value)
+        _tss_recalc_stop.set()
+        _tss_recalc_stop = stop = threading.Event()
+        _tss_recalc_state.clear()
+        _tss_recalc_state.update(
+            status="running",
+            sport_keys=sorted(merged),
+            ranges=merged,
+            total=None,
+            done=0,
+            error=None,
+            started_at=datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            finished_at=None,
+        )
+        _tss_recalc_thread = thread = threading.Thread(
+            target=_run_tss_recalc, args=(merged, settings, stop, previous), name="tss-recalc", daemon=True
+        )
+    thread.start()
+    return tss_recalc_state()
+
+
+def stop_tss_recalc() -> None:
+    global _tss_recalc_thread
+    _tss_recalc_stop.set()
+    if _tss_recalc_thread:
+        _tss_recalc_thread.join(timeout=30)
+        _tss_recalc_thread = None
+
+
+def compute_pmc(date_from: date, date_to: date, sport_key: str = _ALL_SPORTS) -> list[dict[str, Any]]:
+    """CTL/ATL/TSB per day, recomputing cached days only from the first dirty day.
+
+    pmc_daily is persisted up to today or the last recorded load, whichever is
+    later; days past that are projected decay returned without being stored.
+    """
+    with get_db() as db:
+        state = db.execute("SELECT dirty_from FROM pmc_state WHERE sport_key = ?", (sport_key,)).fetchone()
+        dirty_from = state["dirty_from"] if state else None
+        last = db.execute("SELECT MAX(date) FROM pmc_daily WHERE sport_key = ?", (sport_key,)).fetchone()[0]
+        load_where = "sport_key = ?" if sport_key else "1 = 1"
+        load_params: tuple[Any, ...] = (sport_key,) if sport_key else ()
+        first_load, last_load = db.execute(
+            f"SELECT MIN(date), MAX(date) FROM daily_load WHERE {load_where}", load_params
+        ).fetchone()
+        horizon = max(date.today().isoformat(), last_load or "")
+
+        start: str | None = None
+        if last is None:
+            start = first_load
+        else:
+            start = (date.fromisoformat(last) + timedelta(days=1)).isoformat()
+            if dirty_from and dirty_from < start:
+                start = dirty_from
+        end = min(max(date_to.isoformat(), last or ""), horizon)
+        if start and last is not None:
+            db.execute("DELETE FROM pmc_daily WHERE sport_key = ? AND date >= ?", (sport_key, start))
+        if last is not None and last > horizon:
+            db.execute("DELETE FROM pmc_daily WHERE sport_key = ? AND date > ?", (sport_key, horizon))
+        if first_load and start and start < first_load:
+            start = first_load
+        if start and start <= end:
+            seed = db.execute(
+                "SELECT ctl, atl FROM pmc_daily WHERE sport_key = ? AND date < ? ORDER BY date DESC LIMIT 1",
+                (sport_key, start),
+            ).fetchone()
+            ctl, atl = (seed["ctl"], seed["atl"]) if seed else (0.0, 0.0)
+            daily = {
+                r["date"]: r["tss"]
+                for r in db.execute(
+                    f"SELECT date, SUM(tss) AS tss FROM daily_load WHERE {load_where} AND date >= ? AND date <= ? GROUP BY date",
+                    (*load_params, start, end),
+                ).fetchall()
+            }
+            rows: list[tuple[Any, ...]] = []
+            day = date.fromisoformat(start)
+            stop = date.fromisoformat(end)
+            while day <= stop:
+                key = day.isoformat()
+                tss = float(daily.get(key, 0.0))
+                tsb = ctl - atl
+                ctl = ctl + (tss - ctl) / _CTL_DAYS
+                atl = atl + (tss - atl) / _ATL_DAYS
+                rows.append((sport_key, key, tss, ctl, atl, tsb))
+                day += timedelta(days=1)
+            db.executemany(
+                "INSERT INTO pmc_daily (sport_key, date, tss, ctl, atl, tsb) VALUES (?,?,?,?,?,?)",
+                rows,
+            )
+        elif first_load is None:
+            db.execute("DELETE FROM pmc_daily WHERE sport_key = ?", (sport_key,))
+        db.execute(
+            "INSERT OR REPLACE INTO pmc_state (sport_key, dirty_from) VALUES (?, NULL)", (sport_key,)
+        )
+        cached = {
+            r["date"]: r
+            for r in db.execute(
+                "SELECT date, tss, ctl, atl, tsb FROM pmc_daily WHERE sport_key = ? AND date >= ? AND date <= ?",
+                (sport_key, date_from.isoformat(), date_to.isoformat()),
+            ).fetchall()
+        }
+        before = db.execute(
+            "SELECT date, ctl, atl FROM pmc_daily WHERE sport_key = ? AND date < ? ORDER BY date DESC LIMIT 1",
+            (sport_key, date_from.isoformat()),
+        ).fetchone()
+
+    out: list[dict[str, Any]] = []
+    ctl, atl = (before["ctl"], before["atl"]) if before else (0.0, 0.0)
+    if before:
+        # Days between the last stored row and date_from lie past the horizon.
+        for _ in range((date_from - date.fromisoformat(before["date"])).days - 1):
+            ctl -= ctl / _CTL_DAYS
+            atl -= atl / _ATL_DAYS
+    day = date_from
+    while day <= date_to:
+        key = day.isoformat()
+        row = cached.get(key)
+        if row:
+            ctl, atl = row["ctl"], row["atl"]
+            out.append({"date": key, "tss": row["tss"], "ctl": ctl, "atl": atl, "tsb": row["tsb"]})
+        elif key > horizon:
+            # Future days: decay with no load, never written to pmc_daily.
+            tsb = ctl - atl
+            ctl -= ctl / _CTL_DAYS
+            atl -= atl / _ATL_DAYS
+            out.append({"date": key, "tss": 0.0, "ctl": ctl, "atl": atl, "tsb": tsb})
+        else:
+            # Before the first recorded load: nothing to decay from.
+            out.append({"date": key, "tss": 0.0, "ctl": ctl, "atl": atl, "tsb": ctl - atl})
+        day += timedelta(days=1)
+    return out
 
 
 def demo_activities() -> list[dict[str, Any]]:
@@ -1506,6 +3907,86 @@ def normalize_item(payload: dict[str, Any]) -> dict[str, Any]:
     return item
 
 
+# ---------------------------------------------------------------------------
+# Conditional GET and compression
+# ---------------------------------------------------------------------------
+
+_COMPRESS_MIN_BYTES = 1024
+_BODY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_body_cache: OrderedDict[tuple[str, str], tuple[str, bytes]] = OrderedDict()
+_body_cache_bytes = 0
+_body_cache_lock = threading.Lock()
+
+
+def make_etag(*parts: Any) -> str:
+    return '"' + hashlib.sha256("\x1f".join(str(p) for p in parts).encode()).hexdigest()[:32] + '"'
+
+
+def _accepted_encoding(request: Request) -> str:
+    accepted = {t.split(";")[0].strip().lower() for t in request.headers.get("accept-encoding", "").split(",")}
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return "identity"
+
+
+def _encode_body(raw: bytes, encoding: str) -> tuple[str, bytes]:
+    if encoding == "identity" or len(raw) < _COMPRESS_MIN_BYTES:
+        return "identity", raw
+    if encoding == "br":
+        return encoding, brotli.compress(raw, quality=5)
+    return encoding, gzip.compress(raw, compresslevel=6)
+
+
+def _cached_body(key: tuple[str, str]) -> tuple[str, bytes] | None:
+    with _body_cache_lock:
+        hit = _body_cache.get(key)
+        if hit is not None:
+            _body_cache.move_to_end(key)
+        return hit
+
+
+def _store_body(key: tuple[str, str], value: tuple[str, bytes]) -> None:
+    global _body_cache_bytes
+    with _body_cache_lock:
+        if key in _body_cache:
+            return
+        _body_cache[key] = value
+        _body_cache_bytes += len(value[1])
+        while _body_cache_bytes > _BODY_CACHE_MAX_BYTES and _body_cache:
+            _, (_, evicted) = _body_cache.popitem(last=False)
+            _body_cache_bytes -= len(evicted)
+
+
+def json_response(
+    request: Request,
+    etag: str,
+    render: Any,
+    headers: dict[str, str] | None = None,
+    cache_body: bool = False,
+) -> Response:
+    """Serve a JSON body under a strong ETag, compressed per Accept-Encoding.
+
+    render() returns the encoded JSON bytes and runs only when the client's
+    If-None-Match does not already match. cache_body keeps the compressed
+    body in-process by (etag, encoding); use it for immutable payloads only.
+    """
+    out_headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding", **(headers or {})}
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match.strip() == "*" or etag in (t.strip() for t in if_none_match.split(",")):
+        return Response(status_code=304, headers=out_headers)
+    key = (etag, _accepted_encoding(request))
+    encoded = _cached_body(key) if cache_body else None
+    if encoded is None:
+        encoded = _encode_body(render(), key[1])
+        if cache_body:
+            _store_body(key, encoded)
+    if encoded[0] != "identity":
+        out_headers["Content-Encoding"] = encoded[0]
+    return Response(content=encoded[1], media_type="application/json", headers=out_headers)
+
+
 @app.get("/", response_class=HTMLResponse)
 def page() -> FileResponse:
     return FileResponse(path=str(TEMPLATES_DIR / "index.html"), media_type="text/html")
@@ -1526,7 +4007,72 @@ def get_settings() -> dict[str, Any]:
 
 @app.put("/settings")
 def put_settings(payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
-    return save_settings(payload)
+    before = effective_settings()
+    saved = save_settings(payload)
+    record_settings_thresholds(before, saved)
+    changes = threshold_changes(before, effective_settings())
+    if changes:
+        start_tss_recalc(changes)
+    return saved
+
+
+def _apply_threshold_edit(kind: str, sport_key: str, effective_from: str, value: float | None, delete: bool = False) -> None:
+    before = effective_settings()
+    save_threshold(kind, sport_key, effective_from, value, delete=delete)
+    after = effective_settings()
+    # Keep the settings page showing the value in force today.
+    current = load_settings()
+    current[kind][sport_key] = threshold_value(after, kind, sport_key)
+    save_settings(current)
+    changes = threshold_changes(before, after)
+    if changes:
+        start_tss_recalc(changes)
+
+
+@app.get("/settings/thresholds")
+def get_threshold_history() -> list[dict[str, Any]]:
+    return load_threshold_history()
+
+
+@app.put("/settings/thresholds")
+def put_threshold(payload: dict[str, Any] = Body(...)) -> list[dict[str, Any]]:
+    """Add or edit one dated threshold, then recompute only the dates it affects."""
+    kind = str(payload.get("kind") or "")
+    sport_key = str(payload.get("sport_key") or "")
+    if kind not in _THRESHOLD_KINDS or sport_key not in default_settings()[kind]:
+        raise HTTPException(status_code=400, detail="Unknown threshold kind or sport.")
+    try:
+        effective_from = date.fromisoformat(str(payload.get("effective_from") or "")).isoformat()
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail="effective_from must be YYYY-MM-DD.") from err
+    sanitize = sanitize_ftp_value if kind == "ftp" else sanitize_lthr_value
+    _apply_threshold_edit(kind, sport_key, effective_from, sanitize(payload.get("value")))
+    return load_threshold_history()
+
+
+@app.delete("/settings/thresholds/{kind}/{sport_key}/{effective_from}")
+def delete_threshold(kind: str, sport_key: str, effective_from: str) -> list[dict[str, Any]]:
+    with get_db() as db:
+        exists = db.execute(
+            "SELECT 1 FROM threshold_history WHERE kind = ? AND sport_key = ? AND effective_from = ?",
+            (kind, sport_key, effective_from),
+        ).fetchone()
+    if not exists:
+        raise HTTPException(status_code=404, detail="Threshold not found.")
+    _apply_threshold_edit(kind, sport_key, effective_from, None, delete=True)
+    return load_threshold_history()
+
+
+@app.get("/settings/recalculation")
+def get_settings_recalculation() -> dict[str, Any]:
+    return tss_recalc_state()
+
+
+@app.delete("/settings/recalculation")
+def cancel_settings_recalculation() -> dict[str, Any]:
+    if tss_recalc_state().get("status") == "running":
+        stop_tss_recalc()
+    return tss_recalc_state()
 
 
 @app.get("/strava-status")
@@ -1537,9 +4083,50 @@ def strava_status() -> dict:
     return {
         "connected": connected,
         "athlete_name": f"{athlete.get('firstname', '')} {athlete.get('lastname', '')}".strip() if connected else None,
+        "sync": strava_sync_state(),
     }
 
 
+@app.post("/strava/sync")
+def strava_sync() -> dict[str, Any]:
+    return sync_strava_activities()
+
+
+@app.post("/strava/backfill")
+def strava_backfill(restart: bool = Query(default=False)) -> dict[str, Any]:
+    return start_strava_backfill(restart=restart)
+
+
+@app.get("/strava/backfill")
+def strava_backfill_status() -> dict[str, Any]:
+    return strava_backfill_state()
+
+
+@app.get("/strava/webhook")
+def strava_webhook_verify(
+    mode: str = Query(alias="hub.mode"),
+    verify_token: str = Query(alias="hub.verify_token"),
+    challenge: str = Query(alias="hub.challenge"),
+) -> dict[str, str]:
+    if mode != "subscribe" or not STRAVA_WEBHOOK_VERIFY_TOKEN or not secrets.compare_digest(
+        verify_token, STRAVA_WEBHOOK_VERIFY_TOKEN
+    ):
+        raise HTTPException(status_code=403, detail="Invalid webhook verification request.")
+    return {"hub.challenge": challenge}
+
+
+@app.post("/strava/webhook")
+def strava_webhook(background_tasks: BackgroundTasks, event: dict[str, Any] = Body(...)) -> dict[str, bool]:
+    # Strava expects a 200 within two seconds, so any API fetch runs after the response.
+    athlete_id = (read_json_file(TOKEN_FILE, {}).get("athlete") or {}).get("id")
+    if athlete_id is not None and str(event.get("owner_id")) != str(athlete_id):
+        return {"ok": True}
+    with get_db() as db:
+        _set_strava_sync_state(db, "last_webhook_at", datetime.utcnow().isoformat(timespec="seconds") + "Z")
+    background_tasks.add_task(_background_strava_event, event)
+    return {"ok": True}
+
+
 @app.get("/connect")
 def connect() -> RedirectResponse:
     global _pending_oauth_state
@@ -1573,7 +4160,7 @@ def callback(code: str = Query(...), state: str = Query(...)) -> RedirectRespons
         raise HTTPException(status_code=400, detail="Invalid OAuth state.")
     _pending_oauth_state = ""
 
-    resp = requests.post(
+    resp = _strava_http.post(
         STRAVA_TOKEN_URL,
         data={
             "client_id": client_id,
@@ -1588,6 +4175,7 @@ def callback(code: str = Query(...), state: str = Query(...)) -> RedirectRespons
 
     token_data = resp.json()
     save_tokens(token_data)
+    threading.Thread(target=_background_strava_sync, name="strava-sync-initial", daemon=True).start()
     return RedirectResponse(url="/")
 
 
@@ -1599,54 +4187,137 @@ def activities(
     return fetch_activities(after=after, before=before)
 
 
+def _encode_activity_cursor(key: tuple[str, str]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode().rstrip("=")
+
+
+def _decode_activity_cursor(cursor: str) -> tuple[str, str]:
+    try:
+        start, activity_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return str(start), str(activity_id)
+    except (ValueError, TypeError) as err:
+        raise HTTPException(status_code=400, detail="Invalid cursor.") from err
+
+
+def _ui_activity(db: sqlite3.Connection, row: dict[str, Any]) -> dict[str, Any] | None:
+    rid = str(row.get("id"))
+    updated = apply_activity_override(row, load_activity_override(db, rid))
+    if updated is None:
+        return None
+    merged_start = _merge_tp_start_time(updated.get("start_date_local"), rid)
+    if merged_start:
+        updated["start_date_local"] = merged_start
+    return updated
+
+
+def find_ui_base_activity(db: sqlite3.Connection, activity_id: str) -> dict[str, Any] | None:
+    """The stored row behind a /ui/activities entry, before overrides."""
+    row = db.execute("SELECT payload_json FROM strava_activities WHERE id = ?", (activity_id,)).fetchone()
+    if row:
+        return json.loads(row["payload_json"])
+    row = db.execute(
+        "SELECT * FROM activities WHERE id = ? AND source = 'fit' AND hidden = 0", (activity_id,)
+    ).fetchone()
+    if row:
+        return row_to_activity(row)
+    return next((x for x in demo_activities() if str(x.get("id")) == activity_id), None)
+
+
+def refresh_activity_view(db: sqlite3.Connection, activity_id: str) -> None:
+    """Re-materialize one activity_view row from its base row and override.
+
+    Call in the same transaction as any write to the activity, its mirror
+    row or its override; hidden or missing activities drop out of the view.
+    """
+    activity_id = str(activity_id)
+    base = find_ui_base_activity(db, activity_id)
+    merged = _ui_activity(db, base) if base is not None else None
+    if merged is None:
+        db.execute("DELETE FROM activity_view WHERE id = ?", (activity_id,))
+        return
+    db.execute(
+        """
+        INSERT INTO activity_view (id, start_date_local, row_json, version) VALUES (?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            start_date_local = excluded.start_date_local,
+            row_json = excluded.row_json,
+            version = excluded.version
+        WHERE activity_view.row_json IS NOT excluded.row_json
+        """,
+        (activity_id, str(merged.get("start_date_local") or ""), json.dumps(merged), time.time_ns()),
+    )
+
+
+def rebuild_activity_view() -> None:
+    with get_db() as db:
+        db.execute("DELETE FROM activity_view")
+        ids = [
+            *(r["id"] for r in db.execute("SELECT id FROM activities WHERE source = 'fit' AND hidden = 0")),
+            *(r["id"] for r in db.execute("SELECT id FROM strava_activities")),
+            *(str(x.get("id")) for x in demo_activities()),
+        ]
+        for activity_id in dict.fromkeys(ids):
+            refresh_activity_view(db, activity_id)
+
+
+def ensure_activity_view() -> None:
+    with get_db() as db:
+        seeded = db.execute("SELECT 1 FROM activity_view LIMIT 1").fetchone()
+    if not seeded:
+        rebuild_activity_view()
+
+
 @app.get("/ui/activities")
-def ui_activities() -> list[dict[str, Any]]:
+def ui_activities(
+    request: Request,
+    date_from: str | None = Query(default=None, alias="from"),
+    date_to: str | None = Query(default=None, alias="to"),
+    cursor: str | None = Query(default=None),
+    limit: int | None = Query(default=None, ge=1, le=1000),
+) -> Response:
+    """Activities ordered by (start_date_local, id), optionally windowed and paged.
+
+    Reads the activity_view read model. from/to bound the start date; with
+    limit set, the X-Next-Cursor header carries the key to pass as cursor
+    for the next page and is absent on the last page.
+    """
     ensure_seed_calendar_items()
-    demo = demo_activities()
-    imported = load_imported_activities()
-    overrides = load_activity_overrides()
-
+    clauses: list[str] = []
+    params: list[Any] = []
     try:
-        live = fetch_activities()
-        by_id = {str(x.get("id")): x for x in [*demo, *imported]}
-        for row in live:
-            by_id[str(row.get("id"))] = row
-        merged = list(by_id.values())
-    except HTTPException:
-        merged = [*demo, *imported]
-
-    override_fields = [
-        "description", "comments", "comments_feed", "feel", "rpe",
-        "tss_override", "if_value", "tss_source", "analysis_edits",
-        "duration_min", "distance_km", "distance_m", "elevation_m",
-        "distance_unit", "elevation_unit", "planned_tss", "planned_if",
-        "planned_avg_speed", "planned_calories", "planned_work_kj",
-        "completed_duration_min",
-    ]
+        if date_from:
+            clauses.append("start_date_local >= ?")
+            params.append(date.fromisoformat(date_from).isoformat())
+        if date_to:
+            clauses.append("start_date_local < ?")
+            params.append((date.fromisoformat(date_to) + timedelta(days=1)).isoformat())
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail="Invalid date format, use YYYY-MM-DD.") from err
+    if cursor:
+        clauses.append("(start_date_local, id) > (?, ?)")
+        params.extend(_decode_activity_cursor(cursor))
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    page = f"LIMIT {limit + 1}" if limit is not None else ""
+    with get_db() as db:
+        rows = db.execute(
+            f"SELECT id, start_date_local, version, row_json FROM activity_view {where} "
+            f"ORDER BY start_date_local, id {page}",
+            params,
+        ).fetchall()
+    headers: dict[str, str] = {}
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-Cursor"] = _encode_activity_cursor((rows[-1]["start_date_local"], rows[-1]["id"]))
+    etag = make_etag("activities", request.url.query, *(f"{r['id']}:{r['version']}" for r in rows))
+    # row_json is already serialized; splice it instead of decoding and re-encoding.
+    return json_response(request, etag, lambda: ("[" + ",".join(r["row_json"] for r in rows) + "]").encode(), headers)
 
-    out: list[dict[str, Any]] = []
-    for row in merged:
-        rid = str(row.get("id"))
-        override = overrides.get(rid, {})
-        if override.get("hidden"):
-            continue
-        updated = {**row}
-        if override.get("date"):
-            old = str(updated.get("start_date_local", ""))
-            time_part = old[10:] if len(old) > 10 else "T08:00:00"
-            updated["start_date_local"] = f"{override['date']}{time_part}"
-        if override.get("title"):
-            updated["name"] = str(override["title"])
-        if override.get("type"):
-            updated["type"] = str(override["type"])
-        for k in override_fields:
-            if k in override and override[k] is not None:
-                updated[k] = override[k]
-        merged_start = _merge_tp_start_time(updated.get("start_date_local"), rid)
-        if merged_start:
-            updated["start_date_local"] = merged_start
-        out.append(updated)
-    return out
+
+def find_ui_activity(activity_id: str) -> dict[str, Any] | None:
+    """Single-row counterpart of ui_activities()."""
+    with get_db() as db:
+        row = db.execute("SELECT row_json FROM activity_view WHERE id = ?", (activity_id,)).fetchone()
+    return json.loads(row["row_json"]) if row else None
 
 
 @app.delete("/activities/{activity_id}")
@@ -1656,6 +4327,7 @@ def delete_activity_local(activity_id: str) -> dict[str, bool]:
         db.execute(
             "UPDATE activities SET hidden = 1 WHERE id = ?", (activity_id,)
         )
+        db.execute("DELETE FROM activity_curves WHERE activity_id = ?", (activity_id,))
         # Upsert override to mark Strava activities hidden too
         existing = db.execute(
             "SELECT id FROM activity_overrides WHERE id = ?", (activity_id,)
@@ -1668,32 +4340,16 @@ def delete_activity_local(activity_id: str) -> dict[str, bool]:
             db.execute(
                 "INSERT INTO activity_overrides (id, hidden) VALUES (?, 1)", (activity_id,)
             )
-
-    pairs = load_pairs()
-    pairs = [p for p in pairs if str(p.get("strava_id")) != activity_id]
-    save_pairs(pairs)
+        refresh_activity_view(db, activity_id)
+        refresh_activity_load(db, activity_id)
+        for pair in _delete_pairs(db, "strava_id", activity_id):
+            refresh_planned_load(db, get_calendar_item(pair["planned_id"]), pair["planned_id"])
     return {"ok": True}
 
 
-@app.post("/import-fit")
-async def import_fit(request: Request, filename: str = Query(default="workout.fit")) -> dict[str, Any]:
-    ext = Path(filename).suffix.lower()
-    if ext != ".fit":
-        raise HTTPException(status_code=400, detail="Only .fit files are supported.")
-
-    content = await request.body()
-    if not content:
-        raise HTTPException(status_code=400, detail="Empty file.")
-
+def new_imported_activity(filename: str) -> dict[str, Any]:
+    """Skeleton for a standalone activity created from an uploaded FIT file."""
     file_id = str(uuid4())
-    settings = load_settings()
-    try:
-        parsed = parse_fit_bytes_to_json(content, settings=settings)
-    except HTTPException:
-        raise
-    except Exception as err:
-        raise HTTPException(status_code=400, detail=f"Failed to parse FIT: {err}") from err
-
     safe_name = Path(filename).name
     name = Path(safe_name).stem.replace("_", " ").replace("-", " ").strip() or "Imported Workout"
     item: dict[str, Any] = {
@@ -1708,66 +4364,612 @@ async def import_fit(request: Request, filename: str = Query(default="workout.fi
         "fit_id": file_id,
         "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
     }
-    item = apply_parsed_fit_to_activity(item, parsed, file_id, safe_name)
+    return item
+
+
+def _insert_imported_activity(
+    db: sqlite3.Connection,
+    item: dict[str, Any],
+    content: bytes,
+    cols: dict[str, Any],
+    meta: dict[str, Any],
+    settings: dict[str, Any],
+) -> None:
+    db.execute(
+        _activity_insert_sql().replace("INSERT OR IGNORE", "INSERT OR REPLACE"),
+        _activity_insert_params(
+            item,
+            item.get("comments_feed", []),
+            item.get("analysis_edits", {}),
+        ),
+    )
+    _save_activity_blobs(db, item["id"], content)
+    _write_fit_series(db, item["fit_id"], cols, meta)
+    _save_activity_curves(db, item["id"], item, cols)
+    refresh_activity_view(db, item["id"])
+    refresh_activity_load(db, item["id"], settings)
+
+
+def _fit_duplicate_id(db: sqlite3.Connection, digest: str) -> str | None:
+    """Id of the visible activity already holding a FIT file with this SHA-256, if any."""
+    row = db.execute(
+        "SELECT id FROM activities WHERE fit_sha256 = ? AND hidden = 0 ORDER BY created_at, id LIMIT 1",
+        (digest,),
+    ).fetchone()
+    return row["id"] if row else None
 
+
+def find_fit_duplicate(digest: str) -> dict[str, Any] | None:
     with get_db() as db:
-        db.execute(
-            _activity_insert_sql().replace("INSERT OR IGNORE", "INSERT OR REPLACE"),
-            _activity_insert_params(
-                item,
-                content,
-                json.dumps(parsed),
-                item.get("comments_feed", []),
-                item.get("analysis_edits", {}),
-            ),
+        activity_id = _fit_duplicate_id(db, digest)
+        return get_imported_activity(activity_id) if activity_id else None
+
+
+def dedup_fit_activities(db: sqlite3.Connection, dry_run: bool = False) -> list[dict[str, Any]]:
+    """Hide visible activities whose FIT bytes match an earlier one and drop their copies.
+
+    A copy paired with a planned workout is kept in preference to an unpaired
+    one, then the oldest import wins. Returns the hidden ids with their keeper;
+    with dry_run nothing is changed and the list says what would be hidden.
+    """
+    rows = db.execute(
+        """
+        SELECT a.id, a.fit_id, a.fit_sha256 FROM activities a
+        WHERE a.hidden = 0 AND a.fit_sha256 IN (
+            SELECT fit_sha256 FROM activities
+            WHERE hidden = 0 AND fit_sha256 IS NOT NULL
+            GROUP BY fit_sha256 HAVING COUNT(*) > 1
         )
-    return item
+        ORDER BY a.fit_sha256,
+            EXISTS (SELECT 1 FROM workout_pairs p WHERE p.strava_id = a.id) DESC,
+            a.created_at, a.id
+        """
+    ).fetchall()
+    keepers: dict[str, str] = {}
+    hidden: list[dict[str, Any]] = []
+    for row in rows:
+        keeper = keepers.setdefault(row["fit_sha256"], row["id"])
+        if keeper == row["id"]:
+            continue
+        activity_id = row["id"]
+        hidden.append({"id": activity_id, "duplicate_of": keeper})
+        if dry_run:
+            continue
+        db.execute("UPDATE activities SET hidden = 1 WHERE id = ?", (activity_id,))
+        db.execute("DELETE FROM activity_curves WHERE activity_id = ?", (activity_id,))
+        if row["fit_id"]:
+            db.execute("DELETE FROM fit_series WHERE fit_id = ?", (row["fit_id"],))
+        _save_activity_blobs(db, activity_id, None)
+        refresh_activity_view(db, activity_id)
+        refresh_activity_load(db, activity_id)
+        for pair in _delete_pairs(db, "strava_id", activity_id):
+            refresh_planned_load(db, get_calendar_item(pair["planned_id"]), pair["planned_id"])
+    return hidden
+
+
+# ---------------------------------------------------------------------------
+# Off-loop work
+# ---------------------------------------------------------------------------
+
+# Async handlers send FIT parsing to the process pool and SQLite/BLOB work to
+# this thread pool, so one large upload never stalls the event loop. At most
+# BLOCKING_QUEUE_LIMIT calls may be running or queued; past that new work gets
+# a 503 with Retry-After instead of piling up behind the executors.
+BLOCKING_WORKERS = max(1, int(os.getenv("BLOCKING_WORKERS", "4")))
+BLOCKING_QUEUE_LIMIT = max(1, int(os.getenv("BLOCKING_QUEUE_LIMIT", "16")))
+FIT_UPLOAD_MAX_BYTES = int(os.getenv("FIT_UPLOAD_MAX_BYTES", str(64 * 1024 * 1024)))
+
+_blocking_executor = ThreadPoolExecutor(max_workers=BLOCKING_WORKERS, thread_name_prefix="blocking")
+_blocking_slots = threading.BoundedSemaphore(BLOCKING_QUEUE_LIMIT)
+
+
+async def offload(fn: Any, *args: Any, cpu: bool = False) -> Any:
+    """Await fn(*args) on an executor; cpu=True runs it in the FIT process pool."""
+    if not _blocking_slots.acquire(blocking=False):
+        raise HTTPException(status_code=503, detail="Server busy; retry shortly.", headers={"Retry-After": "1"})
+    try:
+        executor = _fit_import_executor() if cpu else _blocking_executor
+        return await asyncio.get_running_loop().run_in_executor(executor, partial(fn, *args))
+    finally:
+        _blocking_slots.release()
+
+
+def _parse_fit_upload(
+    source: bytes | str, filename: str, settings: dict[str, Any], item: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    """Process-pool task: decode one upload (bytes or a spooled file path) to the rows it writes.
+
+    With item the file is attached to that activity, otherwise it becomes a new
+    imported one. Columns go back as NumPy arrays, which pickle cheaply across
+    the process boundary.
+    """
+    try:
+        with io.BytesIO(source) if isinstance(source, bytes) else open(source, "rb") as stream:
+            cols, meta = decode_fit_stream(stream, settings=settings)
+    except HTTPException as err:
+        return {"error": str(err.detail), "status_code": err.status_code}
+    except Exception as err:
+        return {"error": f"Failed to parse FIT: {err}", "status_code": 400}
+    if item is None:
+        item = new_imported_activity(filename)
+        file_id = item["fit_id"]
+    else:
+        file_id = str(uuid4())
+    item = apply_parsed_fit_to_activity(item, meta, file_id, Path(filename).name)
+    return {"item": item, "cols": cols, "meta": meta}
+
+
+async def spool_chunks(chunks: AsyncIterator[bytes], path: Path) -> tuple[int, str]:
+    """Write chunks to path off the event loop, capped at FIT_UPLOAD_MAX_BYTES.
+
+    Returns the byte count and the SHA-256 of the bytes, hashed as they are written.
+    """
+    loop = asyncio.get_running_loop()
+    digest = hashlib.sha256()
+    size = 0
+    with path.open("wb") as handle:
+
+        def write(chunk: bytes) -> None:
+            handle.write(chunk)
+            digest.update(chunk)
+
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > FIT_UPLOAD_MAX_BYTES:
+                raise HTTPException(status_code=413, detail="File too large.")
+            await loop.run_in_executor(_blocking_executor, write, chunk)
+    return size, digest.hexdigest()
+
+
+@contextlib.asynccontextmanager
+async def spooled_upload(request: Request):
+    """Stream the request body to a temp file, capped at FIT_UPLOAD_MAX_BYTES.
+
+    Yields the file's path and the SHA-256 of its bytes.
+    """
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > FIT_UPLOAD_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="File too large.")
+    fd, name = tempfile.mkstemp(prefix="fit-upload-", suffix=".fit")
+    os.close(fd)
+    path = Path(name)
+    try:
+        size, digest = await spool_chunks(request.stream(), path)
+        if not size:
+            raise HTTPException(status_code=400, detail="Empty file.")
+        yield path, digest
+    finally:
+        path.unlink(missing_ok=True)
+
+
+@app.post("/import-fit")
+async def import_fit(request: Request, filename: str = Query(default="workout.fit")) -> dict[str, Any]:
+    ext = Path(filename).suffix.lower()
+    if ext != ".fit":
+        raise HTTPException(status_code=400, detail="Only .fit files are supported.")
+
+    async with spooled_upload(request) as (path, digest):
+        # The same bytes were imported before: hand back that activity without parsing.
+        existing = await offload(find_fit_duplicate, digest)
+        if existing:
+            return {**existing, "duplicate": True}
+        settings = await offload(effective_settings)
+        result = await offload(_parse_fit_upload, str(path), filename, settings, cpu=True)
+        if "error" in result:
+            raise HTTPException(status_code=result["status_code"], detail=result["error"])
+        item = {**result["item"], "fit_sha256": digest}
+
+        def store() -> dict[str, Any]:
+            content = path.read_bytes()
+            with get_db() as db:
+                # A concurrent upload of the same file may have landed while this one parsed.
+                duplicate_id = _fit_duplicate_id(db, digest)
+                if duplicate_id:
+                    return {**get_imported_activity(duplicate_id), "duplicate": True}
+                _insert_imported_activity(db, item, content, result["cols"], result["meta"], settings)
+            return item
+
+        return await offload(store)
+
+
+# ---------------------------------------------------------------------------
+# Bulk FIT import
+# ---------------------------------------------------------------------------
+
+FIT_IMPORT_WORKERS = max(1, int(os.getenv("FIT_IMPORT_WORKERS", str(os.cpu_count() or 1))))
+FIT_IMPORT_BATCH_SIZE = 25
+_FIT_IMPORT_JOBS_KEPT = 20
+
+_fit_import_lock = threading.Lock()
+_fit_import_pool: ProcessPoolExecutor | None = None
+_fit_import_jobs: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+
+def _fit_import_executor() -> ProcessPoolExecutor:
+    global _fit_import_pool
+    with _fit_import_lock:
+        if _fit_import_pool is None:
+            # spawn, not fork: the server process holds DB connections and worker threads.
+            _fit_import_pool = ProcessPoolExecutor(
+                max_workers=FIT_IMPORT_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _fit_import_pool
+
+
+def stop_fit_import_pool() -> None:
+    global _fit_import_pool
+    with _fit_import_lock:
+        pool, _fit_import_pool = _fit_import_pool, None
+    if pool:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_fit_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo, path: Path) -> str:
+    """Copy one archive member to path and return its SHA-256."""
+    digest = hashlib.sha256()
+    with archive.open(info) as src, path.open("wb") as dst:
+        while chunk := src.read(1 << 20):
+            dst.write(chunk)
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def expand_fit_uploads(
+    uploads: list[tuple[str, Path, str]], job_dir: Path
+) -> tuple[list[tuple[str, Path, str]], list[dict[str, Any]]]:
+    """Flatten spooled (name, path, sha256) uploads into FIT files; zip members are extracted into job_dir.
+
+    Returns the files to parse and per-file error entries for anything rejected.
+    """
+    files: list[tuple[str, Path, str]] = []
+    rejected: list[dict[str, Any]] = []
+    for filename, path, digest in uploads:
+        ext = Path(filename).suffix.lower()
+        if ext == ".zip":
+            try:
+                with zipfile.ZipFile(path) as archive:
+                    for info in archive.infolist():
+                        member = Path(info.filename)
+                        if info.is_dir() or member.suffix.lower() != ".fit":
+                            continue
+                        if member.name.startswith("._") or "__MACOSX" in member.parts:
+                            continue
+                        name = f"{Path(filename).name}/{info.filename}"
+                        if info.file_size > FIT_UPLOAD_MAX_BYTES:
+                            rejected.append({"name": name, "status": "error", "error": "File too large."})
+                            continue
+                        target = job_dir / f"{uuid4().hex}.fit"
+                        files.append((name, target, _extract_fit_member(archive, info, target)))
+            except (zipfile.BadZipFile, OSError) as err:
+                rejected.append({"name": Path(filename).name, "status": "error", "error": f"Bad zip archive: {err}"})
+        elif ext != ".fit":
+            rejected.append({"name": Path(filename).name, "status": "error", "error": "Only .fit files are supported."})
+        elif not path.stat().st_size:
+            rejected.append({"name": Path(filename).name, "status": "error", "error": "Empty file."})
+        else:
+            files.append((Path(filename).name, path, digest))
+    return files, rejected
+
+
+def fit_import_job(job_id: str) -> dict[str, Any] | None:
+    with _fit_import_lock:
+        job = _fit_import_jobs.get(job_id)
+        if job is None:
+            return None
+        return {**job, "files": [dict(entry) for entry in job["files"]]}
+
+
+def _update_fit_import(job: dict[str, Any], index: int, **changes: Any) -> None:
+    with _fit_import_lock:
+        entry = job["files"][index]
+        entry.update(changes)
+        job["done"] += 1
+        job[{"imported": "imported", "duplicate": "duplicates"}.get(entry["status"], "errors")] += 1
+
+
+def _flush_fit_import(
+    job: dict[str, Any],
+    batch: list[tuple[int, Path, str, dict[str, Any]]],
+    settings: dict[str, Any],
+) -> None:
+    """Write one batch of parsed files in a single transaction."""
+    outcomes: list[tuple[int, dict[str, Any]]] = []
+    with get_db() as db:
+        for index, path, digest, result in batch:
+            item = {**result["item"], "fit_sha256": digest}
+            # Duplicate means the same bytes, as for /import-fit; two recordings
+            # of one session (head unit and watch) are both kept.
+            existing_id = _fit_duplicate_id(db, digest)
+            if existing_id:
+                outcomes.append((index, {"status": "duplicate", "activity_id": existing_id}))
+                continue
+            _insert_imported_activity(db, item, path.read_bytes(), result["cols"], result["meta"], settings)
+            outcomes.append((index, {"status": "imported", "activity_id": item["id"]}))
+    for index, changes in outcomes:
+        _update_fit_import(job, index, **changes)
+
+
+def _run_fit_import(job: dict[str, Any], files: list[tuple[str, Path, str]], job_dir: Path) -> None:
+    """Parse spooled files in the process pool; workers get paths, never file bytes."""
+    settings = effective_settings()
+    batch: list[tuple[int, Path, str, dict[str, Any]]] = []
+    try:
+        # Files whose bytes are already stored, or repeat earlier ones in this job, skip parsing.
+        pending: list[tuple[int, str, Path, str]] = []
+        seen_hashes: set[str] = set()
+        with get_db() as db:
+            for index, (name, path, digest) in enumerate(files, start=len(job["files"]) - len(files)):
+                existing_id = _fit_duplicate_id(db, digest)
+                if existing_id or digest in seen_hashes:
+                    _update_fit_import(job, index, status="duplicate", activity_id=existing_id)
+                    continue
+                seen_hashes.add(digest)
+                pending.append((index, name, path, digest))
+        pool = _fit_import_executor()
+        futures = {
+            pool.submit(_parse_fit_upload, str(path), name, settings): (index, path, digest)
+            for index, name, path, digest in pending
+        }
+        for future in as_completed(futures):
+            index, path, digest = futures[future]
+            try:
+                result = future.result()
+            except Exception as err:  # worker died or the pool was shut down
+                result = {"error": f"Failed to parse FIT: {err}"}
+            if "error" in result:
+                _update_fit_import(job, index, status="error", error=result["error"])
+                continue
+            batch.append((index, path, digest, result))
+            if len(batch) >= FIT_IMPORT_BATCH_SIZE:
+                _flush_fit_import(job, batch, settings)
+                batch = []
+        if batch:
+            _flush_fit_import(job, batch, settings)
+        status, error = "done", None
+    except Exception as err:
+        status, error = "error", str(err)
+    finally:
+        shutil.rmtree(job_dir, ignore_errors=True)
+    with _fit_import_lock:
+        job.update(status=status, error=error, finished_at=datetime.utcnow().isoformat(timespec="seconds") + "Z")
+
+
+def start_fit_import(uploads: list[tuple[str, Path, str]], job_dir: Path) -> dict[str, Any]:
+    """Start a job over spooled uploads; job_dir is removed once the job no longer needs it."""
+    files, rejected = expand_fit_uploads(uploads, job_dir)
+    job: dict[str, Any] = {
+        "id": str(uuid4()),
+        "status": "running" if files else "done",
+        "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "finished_at": None,
+        "error": None,
+        "total": len(rejected) + len(files),
+        "done": len(rejected),
+        "imported": 0,
+        "duplicates": 0,
+        "errors": len(rejected),
+        "files": rejected + [{"name": name, "status": "queued"} for name, _, _ in files],
+    }
+    with _fit_import_lock:
+        _fit_import_jobs[job["id"]] = job
+        finished = [jid for jid, j in _fit_import_jobs.items() if j["status"] != "running"]
+        for jid in finished[: max(0, len(_fit_import_jobs) - _FIT_IMPORT_JOBS_KEPT)]:
+            del _fit_import_jobs[jid]
+    if files:
+        threading.Thread(target=_run_fit_import, args=(job, files, job_dir), name="fit-import", daemon=True).start()
+    else:
+        shutil.rmtree(job_dir, ignore_errors=True)
+    return fit_import_job(job["id"])
+
+
+async def _upload_chunks(upload: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await upload.read(1 << 20):
+        yield chunk
+
+
+@app.post("/import-fit/bulk")
+async def import_fit_bulk(files: list[UploadFile] = File(...)) -> dict[str, Any]:
+    """Queue many FIT files (or zip archives of them); poll the returned job for progress.
+
+    Each upload is spooled into a per-job temp directory; the job thread
+    removes it when finished.
+    """
+    job_dir = Path(tempfile.mkdtemp(prefix="fit-import-"))
+    try:
+        uploads: list[tuple[str, Path, str]] = []
+        for upload in files:
+            name = upload.filename or "workout.fit"
+            path = job_dir / f"{uuid4().hex}{Path(name).suffix.lower()}"
+            _, digest = await spool_chunks(_upload_chunks(upload), path)
+            uploads.append((name, path, digest))
+        return await offload(start_fit_import, uploads, job_dir)
+    except BaseException:
+        shutil.rmtree(job_dir, ignore_errors=True)
+        raise
+
+
+@app.post("/import-fit/dedup")
+def dedup_fit_imports(dry_run: bool = Query(default=False)) -> dict[str, Any]:
+    """Hide activities whose FIT file is byte-identical to one imported earlier.
+
+    dry_run=true only reports what would be hidden.
+    """
+    with get_db() as db:
+        hidden = dedup_fit_activities(db, dry_run=dry_run)
+    return {"dry_run": dry_run, "hidden": hidden}
+
+
+@app.get("/import-fit/jobs/{job_id}")
+def import_fit_job_status(job_id: str) -> dict[str, Any]:
+    job = fit_import_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found.")
+    return job
 
 
 @app.get("/fit/{fit_id}")
-def get_fit_parsed(fit_id: str) -> dict[str, Any]:
-    return load_fit_parsed(fit_id)
+def get_fit_parsed(
+    request: Request,
+    fit_id: str,
+    points: int | None = Query(default=None, ge=3),
+    start_s: float | None = Query(default=None, ge=0),
+    end_s: float | None = Query(default=None, ge=0),
+    channels: str | None = Query(default=None),
+) -> Response:
+    with get_db() as db:
+        # One read transaction: the nested get_db() calls that render the body
+        # see the same snapshot the version came from, so a concurrent write
+        # cannot put new content in the cache under the old ETag.
+        if not db.in_transaction:
+            db.execute("BEGIN")
+        row = db.execute("SELECT version FROM fit_series WHERE fit_id = ?", (fit_id,)).fetchone()
+        if row is None:
+            # Legacy or not yet decoded TrainingPeaks data: build it (storing the columns) and tag by content.
+            body = json.dumps(_fit_payload(fit_id, points, start_s, end_s, channels)).encode()
+            return json_response(request, make_etag("fit", hashlib.sha256(body).hexdigest()), lambda: body)
+        # TrainingPeaks summaries are read from the activity row at serve time.
+        activity = db.execute(_TP_ACTIVITY_SQL, (fit_id,)).fetchone()
+        etag = make_etag(
+            "fit", fit_id, row["version"], tuple(activity) if activity else None, points, start_s, end_s, channels
+        )
+        return json_response(
+            request,
+            etag,
+            lambda: json.dumps(_fit_payload(fit_id, points, start_s, end_s, channels)).encode(),
+            cache_body=True,
+        )
+
+
+def _fit_payload(
+    fit_id: str,
+    points: int | None,
+    start_s: float | None,
+    end_s: float | None,
+    channels: str | None,
+) -> dict[str, Any]:
+    if points is None and start_s is None and end_s is None and channels is None:
+        return load_fit_parsed(fit_id)
+    channel_list = None
+    if channels is not None:
+        channel_list = [c.strip() for c in channels.split(",") if c.strip()]
+        known = {name for name, _, _ in _SERIES_CHANNELS}
+        unknown = [c for c in channel_list if c not in known]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown channels: {', '.join(unknown)}")
+    if start_s is not None and end_s is not None and end_s < start_s:
+        raise HTTPException(status_code=400, detail="end_s must be >= start_s.")
+    return load_fit_window(fit_id, start_s=start_s, end_s=end_s, points=points, channels=channel_list)
+
+
+@app.get("/metrics/curves")
+def get_metric_curves(
+    kind: str = Query(default="power"),
+    sport: str | None = Query(default=None),
+    date_from: str | None = Query(default=None, alias="from"),
+    date_to: str | None = Query(default=None, alias="to"),
+) -> dict[str, Any]:
+    if kind not in {"power", "pace"}:
+        raise HTTPException(status_code=400, detail="kind must be 'power' or 'pace'.")
+    for value in (date_from, date_to):
+        if value:
+            try:
+                date.fromisoformat(value)
+            except ValueError as err:
+                raise HTTPException(status_code=400, detail="Invalid date format, use YYYY-MM-DD.") from err
+    sport_key = sport_to_ftp_key(sport) if sport else ("ride" if kind == "power" else "run")
+    return {
+        "kind": kind,
+        "sport": sport_key,
+        "from": date_from,
+        "to": date_to,
+        "points": load_curve_envelope(kind, sport_key, date_from, date_to),
+    }
+
+
+@app.get("/metrics/pmc")
+def get_metrics_pmc(
+    date_from: str | None = Query(default=None, alias="from"),
+    date_to: str | None = Query(default=None, alias="to"),
+    sport: str | None = Query(default=None),
+) -> dict[str, Any]:
+    try:
+        end = date.fromisoformat(date_to) if date_to else date.today()
+        start = date.fromisoformat(date_from) if date_from else end - timedelta(days=89)
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail="Invalid date format, use YYYY-MM-DD.") from err
+    if end < start:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'.")
+    sport_key = sport_to_ftp_key(sport) if sport else _ALL_SPORTS
+    return {
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "sport": sport_key or None,
+        "days": compute_pmc(start, end, sport_key),
+    }
 
 
 @app.post("/activities/{activity_id}/fit/upload")
 async def upload_fit_for_activity(
     activity_id: str, request: Request, filename: str = Query(default="workout.fit")
 ) -> dict[str, Any]:
-    content = await request.body()
-    if not content:
-        raise HTTPException(status_code=400, detail="Empty file.")
     if Path(filename).suffix.lower() != ".fit":
         raise HTTPException(status_code=400, detail="Only .fit files are supported.")
 
-    item = get_imported_activity(activity_id)
+    item = await offload(get_imported_activity, activity_id)
     if item is None:
         raise HTTPException(status_code=404, detail="Activity not found.")
 
-    file_id = str(uuid4())
-    settings = load_settings()
-    parsed = parse_fit_bytes_to_json(content, settings=settings)
-    item = apply_parsed_fit_to_activity(item, parsed, file_id, filename)
+    async with spooled_upload(request) as (path, digest):
+        existing = await offload(find_fit_duplicate, digest)
+        if existing and existing["id"] == activity_id:
+            return existing
+        if existing:
+            raise HTTPException(
+                status_code=409,
+                detail=f"This FIT file is already imported as '{existing.get('name') or existing['id']}'.",
+            )
+        settings = await offload(effective_settings)
+        result = await offload(_parse_fit_upload, str(path), filename, settings, item, cpu=True)
+        if "error" in result:
+            raise HTTPException(status_code=result["status_code"], detail=result["error"])
+        item = {**result["item"], "fit_sha256": digest}
+        file_id = item["fit_id"]
+
+        def store() -> None:
+            content = path.read_bytes()
+            with get_db() as db:
+                duplicate_id = _fit_duplicate_id(db, digest)
+                if duplicate_id and duplicate_id != activity_id:
+                    raise HTTPException(status_code=409, detail="This FIT file is already imported.")
+                previous = db.execute("SELECT fit_id FROM activities WHERE id = ?", (activity_id,)).fetchone()
+                if previous and previous["fit_id"]:
+                    db.execute("DELETE FROM fit_series WHERE fit_id = ?", (previous["fit_id"],))
+                db.execute(
+                    """UPDATE activities SET
+                        fit_id=?, fit_filename=?, fit_sha256=?,
+                        distance=?, moving_time=?, start_date_local=?, type=?,
+                        if_value=?, np_value=?, tss_override=?, work_kj=?, calories=?,
+                        avg_speed=?, avg_power=?, avg_hr=?, min_hr=?, max_hr=?,
+                        min_power=?, max_power=?, elev_gain_m=?, hr_tss=?
+                    WHERE id=?""",
+                    (
+                        file_id, Path(filename).name, digest,
+                        item.get("distance"), item.get("moving_time"), item.get("start_date_local"),
+                        item.get("type"), item.get("if_value"), item.get("np_value"),
+                        item.get("tss_override"), item.get("work_kj"), item.get("calories"),
+                        item.get("avg_speed"), item.get("avg_power"), item.get("avg_hr"),
+                        item.get("min_hr"), item.get("max_hr"), item.get("min_power"),
+                        item.get("max_power"), item.get("elev_gain_m"), item.get("hr_tss"),
+                        activity_id,
+                    ),
+                )
+                _save_activity_blobs(db, activity_id, content)
+                _write_fit_series(db, file_id, result["cols"], result["meta"])
+                _save_activity_curves(db, activity_id, item, result["cols"])
+                refresh_activity_view(db, activity_id)
+                refresh_activity_load(db, activity_id, settings)
 
-    with get_db() as db:
-        db.execute(
-            """UPDATE activities SET
-                fit_id=?, fit_filename=?, fit_data=?, fit_parsed_json=?,
-                distance=?, moving_time=?, start_date_local=?, type=?,
-                if_value=?, np_value=?, tss_override=?, work_kj=?, calories=?,
-                avg_speed=?, avg_power=?, avg_hr=?, min_hr=?, max_hr=?,
-                min_power=?, max_power=?, elev_gain_m=?, hr_tss=?
-            WHERE id=?""",
-            (
-                file_id, Path(filename).name, content, json.dumps(parsed),
-                item.get("distance"), item.get("moving_time"), item.get("start_date_local"),
-                item.get("type"), item.get("if_value"), item.get("np_value"),
-                item.get("tss_override"), item.get("work_kj"), item.get("calories"),
-                item.get("avg_speed"), item.get("avg_power"), item.get("avg_hr"),
-                item.get("min_hr"), item.get("max_hr"), item.get("min_power"),
-                item.get("max_power"), item.get("elev_gain_m"), item.get("hr_tss"),
-                activity_id,
-            ),
-        )
+        await offload(store)
     return item
 
 
@@ -1782,26 +4984,25 @@ def recalculate_fit_for_activity(activity_id: str) -> dict[str, Any]:
     fit_id = str(row["fit_id"] or "").strip()
     if not fit_id:
         raise HTTPException(status_code=400, detail="No FIT attached.")
-    fit_data = row["fit_data"]
+    fit_data = load_activity_fit_data(activity_id)
     if not fit_data:
         raise HTTPException(status_code=404, detail="FIT file data missing.")
 
-    parsed = parse_fit_bytes_to_json(bytes(fit_data), settings=load_settings())
+    settings = effective_settings()
+    cols, meta = decode_fit_stream(io.BytesIO(fit_data), settings=settings)
     item = row_to_activity(row)
     filename = str(row["fit_filename"] or f"{fit_id}.fit")
-    item = apply_parsed_fit_to_activity(item, parsed, fit_id, filename)
+    item = apply_parsed_fit_to_activity(item, meta, fit_id, filename)
 
     with get_db() as db:
         db.execute(
             """UPDATE activities SET
-                fit_parsed_json=?,
                 distance=?, moving_time=?, start_date_local=?, type=?,
                 if_value=?, np_value=?, tss_override=?, work_kj=?, calories=?,
                 avg_speed=?, avg_power=?, avg_hr=?, min_hr=?, max_hr=?,
                 min_power=?, max_power=?, elev_gain_m=?, hr_tss=?
             WHERE id=?""",
             (
-                json.dumps(parsed),
                 item.get("distance"), item.get("moving_time"), item.get("start_date_local"),
                 item.get("type"), item.get("if_value"), item.get("np_value"),
                 item.get("tss_override"), item.get("work_kj"), item.get("calories"),
@@ -1811,6 +5012,10 @@ def recalculate_fit_for_activity(activity_id: str) -> dict[str, Any]:
                 activity_id,
             ),
         )
+        _write_fit_series(db, fit_id, cols, meta)
+        _save_activity_curves(db, activity_id, item, cols)
+        refresh_activity_view(db, activity_id)
+        refresh_activity_load(db, activity_id, settings)
     return item
 
 
@@ -1820,16 +5025,22 @@ def delete_fit_for_activity(activity_id: str) -> dict[str, Any]:
     if item is None:
         raise HTTPException(status_code=404, detail="Activity not found.")
     with get_db() as db:
+        if item.get("fit_id"):
+            db.execute("DELETE FROM fit_series WHERE fit_id = ?", (item["fit_id"],))
+        db.execute("DELETE FROM activity_curves WHERE activity_id = ?", (activity_id,))
+        _save_activity_blobs(db, activity_id, None)
         db.execute(
             """UPDATE activities SET
-                fit_id=NULL, fit_filename=NULL, fit_data=NULL, fit_parsed_json=NULL,
+                fit_id=NULL, fit_filename=NULL, fit_sha256=NULL,
                 if_value=NULL, tss_override=NULL, avg_power=NULL,
                 avg_hr=NULL, min_hr=NULL, max_hr=NULL,
                 min_power=NULL, max_power=NULL, elev_gain_m=NULL
             WHERE id=?""",
             (activity_id,),
         )
-    for key in ("fit_id", "fit_filename", "if_value", "tss_override",
+        refresh_activity_view(db, activity_id)
+        refresh_activity_load(db, activity_id)
+    for key in ("fit_id", "fit_filename", "fit_sha256", "if_value", "tss_override",
                 "avg_power", "avg_hr", "min_hr", "max_hr", "min_power", "max_power", "elev_gain_m"):
         item.pop(key, None)
     return item
@@ -1852,24 +5063,29 @@ def restore_fit_for_activity(activity_id: str, payload: dict[str, Any] = Body(..
                 f"UPDATE activities SET {set_clause} WHERE id=?",
                 (*updates.values(), activity_id),
             )
+            refresh_activity_view(db, activity_id)
+            refresh_activity_load(db, activity_id)
         item.update(updates)
     return item
 
 
 @app.get("/activities/{activity_id}/fit/download")
 async def download_fit_for_activity(activity_id: str):
-    from fastapi.responses import Response
-    with get_db() as db:
-        row = db.execute(
-            "SELECT fit_data, fit_filename, fit_id FROM activities WHERE id = ?", (activity_id,)
-        ).fetchone()
+    def read() -> sqlite3.Row | None:
+        with get_db() as db:
+            return db.execute(
+                "SELECT fit_filename, fit_id FROM activities WHERE id = ?", (activity_id,)
+            ).fetchone()
+
+    row = await offload(read)
     if not row:
         raise HTTPException(status_code=404, detail="Activity not found.")
-    if not row["fit_data"]:
+    fit_data = await offload(load_activity_fit_data, activity_id)
+    if not fit_data:
         raise HTTPException(status_code=404, detail="No FIT attached.")
     filename = str(row["fit_filename"] or f"{row['fit_id']}.fit")
     return Response(
-        content=bytes(row["fit_data"]),
+        content=fit_data,
         media_type="application/octet-stream",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
@@ -1963,6 +5179,16 @@ def update_activity_meta(activity_id: str, payload: dict[str, Any] = Body(...))
                 f"UPDATE activities SET {set_clause} WHERE id=?",
                 (*activity_updates.values(), activity_id),
             )
+            if "start_date_local" in updates:
+                db.execute(
+                    "UPDATE activity_curves SET start_date = ? WHERE activity_id = ?",
+                    (str(updates["start_date_local"])[:10], activity_id),
+                )
+            if "type" in updates:
+                db.execute(
+                    "UPDATE activity_curves SET sport_key = ? WHERE activity_id = ?",
+                    (sport_to_ftp_key(str(updates["type"])), activity_id),
+                )
             # Keep override table aligned so stale pair overrides do not mask user edits.
             if any(k in updates for k in ("type", "title", "start_date_local")):
                 existing_override = db.execute(
@@ -2011,49 +5237,60 @@ def update_activity_meta(activity_id: str, payload: dict[str, Any] = Body(...))
                     f"INSERT INTO activity_overrides ({', '.join(cols)}) VALUES ({placeholders})",
                     (activity_id, *override_updates.values()),
                 )
+        refresh_activity_view(db, activity_id)
+        refresh_activity_load(db, activity_id)
     return {"ok": True}
 
 
 @app.get("/calendar-items")
-def get_calendar_items() -> list[dict[str, Any]]:
+def get_calendar_items(
+    request: Request,
+    date_from: str | None = Query(default=None, alias="from"),
+    date_to: str | None = Query(default=None, alias="to"),
+    kind: str | None = Query(default=None),
+) -> Response:
     ensure_seed_calendar_items()
-    items = load_calendar_items()
-    return sorted(items, key=lambda x: (str(x.get("date", "")), str(x.get("created_at", ""))))
+    try:
+        start = date.fromisoformat(date_from).isoformat() if date_from else None
+        end = date.fromisoformat(date_to).isoformat() if date_to else None
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail="Invalid date format, use YYYY-MM-DD.") from err
+    with get_db() as db:
+        rows = _calendar_rows(db, "id, version, item_json", start, end, kind=kind)
+    etag = make_etag("calendar", request.url.query, *(f"{r['id']}:{r['version']}" for r in rows))
+    return json_response(request, etag, lambda: ("[" + ",".join(r["item_json"] for r in rows) + "]").encode())
 
 
 @app.post("/calendar-items")
 def create_calendar_item(payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
     item = normalize_item(payload)
-    items = load_calendar_items()
-    items.append(item)
-    save_calendar_items(items)
+    save_calendar_item(item)
+    with get_db() as db:
+        refresh_planned_load(db, item, item["id"])
     return item
 
 
 @app.put("/calendar-items/{item_id}")
 def update_calendar_item(item_id: str, payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
-    items = load_calendar_items()
-    idx = next((i for i, row in enumerate(items) if row.get("id") == item_id), -1)
-    if idx < 0:
+    existing = get_calendar_item(item_id)
+    if existing is None:
         raise HTTPException(status_code=404, detail="Item not found.")
 
-    existing = items[idx]
     merged = {**existing, **payload, "id": existing.get("id"), "created_at": existing.get("created_at")}
     normalized = normalize_item(merged)
     normalized["id"] = existing.get("id")
     normalized["created_at"] = existing.get("created_at")
-    items[idx] = normalized
-    save_calendar_items(items)
+    save_calendar_item(normalized)
+    with get_db() as db:
+        refresh_planned_load(db, normalized, item_id)
     return normalized
 
 
 @app.put("/calendar-items/{item_id}/completed")
 def update_calendar_item_completed(item_id: str, payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
-    items = load_calendar_items()
-    idx = next((i for i, row in enumerate(items) if row.get("id") == item_id), -1)
-    if idx < 0:
+    item = get_calendar_item(item_id)
+    if item is None:
         raise HTTPException(status_code=404, detail="Item not found.")
-    item = items[idx]
     if item.get("kind") != "workout":
         raise HTTPException(status_code=400, detail="Only workout items support completed values.")
 
@@ -2069,35 +5306,31 @@ def update_calendar_item_completed(item_id: str, payload: dict[str, Any] = Body(
     item["completed_elevation_m"] = n(payload.get("completed_elevation_m"))
     item["completed_tss"] = n(payload.get("completed_tss"))
     item["completed_if"] = n(payload.get("completed_if"))
-    items[idx] = item
-    save_calendar_items(items)
+    save_calendar_item(item)
+    with get_db() as db:
+        refresh_planned_load(db, item, item_id)
     return item
 
 
 @app.delete("/calendar-items/{item_id}")
 def delete_calendar_item(item_id: str) -> dict[str, bool]:
-    items = load_calendar_items()
-    target = next((row for row in items if row.get("id") == item_id), None)
-    kept = [row for row in items if row.get("id") != item_id]
-    if len(kept) == len(items):
-        raise HTTPException(status_code=404, detail="Item not found.")
-    save_calendar_items(kept)
-
-    # Remove pair relationships involving this planned workout; if workout was paired,
-    # also hide the linked completed activity.
-    pairs = load_pairs()
-    linked = [p for p in pairs if p.get("planned_id") == item_id]
-    if target and target.get("kind") == "workout" and linked:
-        overrides = load_activity_overrides()
-        for link in linked:
-            sid = str(link.get("strava_id", ""))
-            if sid:
-                current = overrides.get(sid, {})
+    with get_db() as db:
+        target = get_calendar_item(item_id)
+        if target is None or not delete_calendar_item_row(item_id):
+            raise HTTPException(status_code=404, detail="Item not found.")
+
+        # Remove pair relationships involving this planned workout; if workout was paired,
+        # also hide the linked completed activity.
+        linked = _delete_pairs(db, "planned_id", item_id)
+        if target.get("kind") == "workout":
+            for link in linked:
+                current = load_activity_override(db, link["strava_id"])
                 current["hidden"] = True
-                overrides[sid] = current
-        save_activity_overrides(overrides)
-    pairs = [p for p in pairs if p.get("planned_id") != item_id]
-    save_pairs(pairs)
+                _upsert_override(db, link["strava_id"], current)
+        refresh_planned_load(db, None, item_id)
+        for link in linked:
+            refresh_activity_view(db, link["strava_id"])
+            refresh_activity_load(db, link["strava_id"])
     return {"ok": True}
 
 
@@ -2113,9 +5346,8 @@ def create_pair(payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
     if not planned_id or not strava_id:
         raise HTTPException(status_code=400, detail="planned_id and strava_id are required.")
 
-    planned_items = load_calendar_items()
-    planned_item = next((row for row in planned_items if str(row.get("id")) == planned_id and row.get("kind") == "workout"), None)
-    if not planned_item:
+    planned_item = get_calendar_item(planned_id)
+    if not planned_item or planned_item.get("kind") != "workout":
         raise HTTPException(status_code=404, detail="Planned workout not found.")
 
     def n(v: Any) -> float:
@@ -2152,98 +5384,101 @@ def create_pair(payload: dict[str, Any] = Body(...)) -> dict[str, Any]:
     if not has_planned_content or has_completed_on_planned:
         raise HTTPException(status_code=400, detail="Pairing requires a planned-only workout.")
 
-    completed_item = next((row for row in ui_activities() if str(row.get("id")) == strava_id), None)
+    completed_item = find_ui_activity(strava_id)
     if not completed_item:
         raise HTTPException(status_code=404, detail="Completed workout not found.")
     planned_key = sport_key(planned_item.get("workout_type"))
     completed_key = sport_key(completed_item.get("type"))
     if planned_key != completed_key:
         raise HTTPException(status_code=400, detail="Pairing requires matching workout types.")
-    pairs = load_pairs()
-    pairs = [p for p in pairs if p.get("planned_id") != planned_id and p.get("strava_id") != strava_id]
     new_pair = {
         "id": str(uuid4()),
         "planned_id": planned_id,
         "strava_id": strava_id,
         "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
     }
-    pairs.append(new_pair)
-    save_pairs(pairs)
-
     override_date = str(payload.get("override_date", "")).strip()
     override_title = str(payload.get("override_title", "")).strip()
     override_type = str(payload.get("override_type", "")).strip()
-    if override_date or override_title or override_type:
-        overrides = load_activity_overrides()
-        current = overrides.get(strava_id, {})
-        if override_title:
-            current["title"] = override_title
-        if override_type:
-            current["type"] = override_type
-        if override_date:
-            try:
-                _ = date.fromisoformat(override_date)
-                current["date"] = override_date
-            except ValueError:
-                pass
-        overrides[strava_id] = current
-        save_activity_overrides(overrides)
 
+    with get_db() as db:
+        displaced = {
+            p["planned_id"] for p in _delete_pairs(db, "strava_id", strava_id) if p["planned_id"] != planned_id
+        }
+        _delete_pairs(db, "planned_id", planned_id)
+        db.execute(
+            "INSERT INTO workout_pairs (id, planned_id, strava_id, created_at) VALUES (?, ?, ?, ?)",
+            (new_pair["id"], planned_id, strava_id, new_pair["created_at"]),
+        )
+
+        if override_date or override_title or override_type:
+            current = load_activity_override(db, strava_id)
+            if override_title:
+                current["title"] = override_title
+            if override_type:
+                current["type"] = override_type
+            if override_date:
+                try:
+                    _ = date.fromisoformat(override_date)
+                    current["date"] = override_date
+                except ValueError:
+                    pass
+            _upsert_override(db, strava_id, current)
+
+        settings = effective_settings()
+        refresh_planned_load(db, planned_item, planned_id, settings)
+        for other_id in displaced:
+            refresh_planned_load(db, get_calendar_item(other_id), other_id, settings)
+        refresh_activity_view(db, strava_id)
+        refresh_activity_load(db, strava_id, settings)
     return new_pair
 
 
 @app.delete("/pairs/{pair_id}")
 def delete_pair(pair_id: str) -> dict[str, bool]:
-    pairs = load_pairs()
-    found = next((p for p in pairs if p.get("id") == pair_id), None)
-    if not found:
-        raise HTTPException(status_code=404, detail="Pair not found.")
-    kept = [p for p in pairs if p.get("id") != pair_id]
-    save_pairs(kept)
-
-    strava_id = str(found.get("strava_id", "")).strip()
-    planned_id = str(found.get("planned_id", "")).strip()
-    planned_items = load_calendar_items()
-    planned_item = next((row for row in planned_items if str(row.get("id")) == planned_id and row.get("kind") == "workout"), None)
-    planned_date = str((planned_item or {}).get("date") or "").strip()
-    if planned_item:
-        reset_fields = (
-            "completed_duration_min", "completed_distance_km", "completed_distance_m",
-            "completed_elevation_m", "completed_tss", "completed_if", "completed_np",
-            "completed_work_kj", "completed_calories", "completed_avg_speed",
-            "completed_hr_min", "completed_hr_avg", "completed_hr_max",
-            "completed_power_min", "completed_power_avg", "completed_power_max",
-        )
-        for field in reset_fields:
-            planned_item[field] = 0
-        for i, row in enumerate(planned_items):
-            if str(row.get("id")) == planned_id:
-                planned_items[i] = planned_item
-                break
-        save_calendar_items(planned_items)
-
-    if strava_id:
-        overrides = load_activity_overrides()
-        current = overrides.get(strava_id, {})
-        if planned_date:
-            current["date"] = planned_date
-        for key in ("date", "type", "title"):
-            if key in current and key != "date":
-                current.pop(key, None)
-        if planned_date:
-            current["date"] = planned_date
-        if current:
-            overrides[strava_id] = current
-        elif strava_id in overrides:
-            overrides.pop(strava_id, None)
-        save_activity_overrides(overrides)
-
+    with get_db() as db:
+        removed = _delete_pairs(db, "id", pair_id)
+        if not removed:
+            raise HTTPException(status_code=404, detail="Pair not found.")
+        found = removed[0]
+
+        strava_id = str(found.get("strava_id", "")).strip()
+        planned_id = str(found.get("planned_id", "")).strip()
+        planned_item = get_calendar_item(planned_id)
+        if planned_item and planned_item.get("kind") != "workout":
+            planned_item = None
+        planned_date = str((planned_item or {}).get("date") or "").strip()
+        if planned_item:
+            reset_fields = (
+                "completed_duration_min", "completed_distance_km", "completed_distance_m",
+                "completed_elevation_m", "completed_tss", "completed_if", "completed_np",
+                "completed_work_kj", "completed_calories", "completed_avg_speed",
+                "completed_hr_min", "completed_hr_avg", "completed_hr_max",
+                "completed_power_min", "completed_power_avg", "completed_power_max",
+            )
+            for field in reset_fields:
+                planned_item[field] = 0
+            save_calendar_item(planned_item)
+
+        if strava_id:
+            current = load_activity_override(db, strava_id)
+            current.pop("type", None)
+            current.pop("title", None)
+            if planned_date:
+                current["date"] = planned_date
+            if current:
+                _upsert_override(db, strava_id, current)
+
+        refresh_planned_load(db, planned_item, planned_id)
+        if strava_id:
+            refresh_activity_view(db, strava_id)
+            refresh_activity_load(db, strava_id)
     return {"ok": True}
 
 
 @app.get("/planned-workouts")
 def get_planned_workouts() -> list[dict[str, Any]]:
-    items = [i for i in load_calendar_items() if i.get("kind") == "workout"]
+    items = load_calendar_items(kind="workout")
     return [
         {
             "id": i.get("id"),
@@ -2300,7 +5535,7 @@ def create_planned_workout(payload: dict[str, Any] = Body(...)) -> dict[str, Any
         "description": payload.get("description", ""),
     }
     item = normalize_item(wrapped)
-    items = load_calendar_items()
-    items.append(item)
-    save_calendar_items(items)
+    save_calendar_item(item)
+    with get_db() as db:
+        refresh_planned_load(db, item, item["id"])
     return item
@@ -86,10 +86,13 @@
     };
 
     const DOW = ['MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN'];
+    // Points per /fit request for the analyze chart; the server LTTB-thins anything larger.
+    const FIT_CHART_POINTS = 1500;
 
     let activities = [];
     let calendarItems = [];
     let pairs = [];
+    let pmcByDate = null; // server CTL/ATL/TSB keyed by date, from /metrics/pmc
     let currentDragData = null; // tracks active drag payload reliably
     let selectedDate = todayKey();
     let selectedKind = 'workout';
@@ -106,6 +109,9 @@
     let detailInitialState = null;
     let detailSaving = false;
     let workoutModalSession = 0;
+    // Inclusive { from, to } date keys whose activities and calendar items are in memory.
+    let loadedRange = null;
+    const ACTIVITY_PAGE_SIZE = 500;
     const calendarState = {
       anchorDate: todayKey(),
       scrollTop: 0,
@@ -987,58 +993,37 @@
       top.classList.add(modalStatusClass(payload));
     }
 
-    function buildObservedDailyTssMap() {
-      const map = {};
-      const today = todayKey();
-
-      activities.forEach(a => {
-        const key = dateKeyFromDate(new Date(a.start_date_local));
-        map[key] = (map[key] || 0) + activityToTss(a);
-      });
-
-      return map;
+    function pmcWindow(endKey, days) {
+      // Server-computed rows for the `days` ending at endKey, or null if any day is outside the loaded range.
+      if (!pmcByDate) return null;
+      const end = parseDateKey(endKey);
+      const rows = [];
+      for (let i = days - 1; i >= 0; i -= 1) {
+        const d = new Date(end);
+        d.setDate(end.getDate() - i);
+        const row = pmcByDate[dateKeyFromDate(d)];
+        if (!row) return null;
+        rows.push(row);
+      }
+      return rows;
     }
 
     function buildMetricsToDate(endKey) {
-      const observed = buildObservedDailyTssMap();
-      const endDate = parseDateKey(endKey);
-      const today = parseDateKey(todayKey());
-      const start = new Date(endDate);
-      start.setDate(endDate.getDate() - 119);
-      const values = [];
-
-      for (let i = 0; i < 120; i += 1) {
-        const d = new Date(start);
-        d.setDate(start.getDate() + i);
-        const key = dateKeyFromDate(d);
-        values.push(d <= today ? Number(observed[key] || 0) : 0);
-      }
-
-      const ctlSeries = [];
-      const atlSeries = [];
-      const tsbSeries = [];
-      let ctlPrev = 0;
-      let atlPrev = 0;
-      for (let i = 0; i < values.length; i += 1) {
-        const tss = values[i];
-        const tsb = ctlPrev - atlPrev;
-        const ctl = ctlPrev + (tss - ctlPrev) / 42;
-        const atl = atlPrev + (tss - atlPrev) / 7;
-        tsbSeries.push(tsb);
-        ctlSeries.push(ctl);
-        atlSeries.push(atl);
-        ctlPrev = ctl;
-        atlPrev = atl;
+      const server = pmcWindow(endKey, 120);
+      if (server) {
+        const last = server[server.length - 1];
+        return {
+          ctl: Math.round(last.ctl || 0),
+          atl: Math.round(last.atl || 0),
+          tsb: Math.round(last.tsb || 0),
+          ctlSeries: server.map(r => r.ctl),
+          atlSeries: server.map(r => r.atl),
+          tsbSeries: server.map(r => r.tsb),
+        };
       }
-
-      return {
-        ctl: Math.round(ctlSeries[ctlSeries.length - 1] || 0),
-        atl: Math.round(atlSeries[atlSeries.length - 1] || 0),
-        tsb: Math.round(tsbSeries[tsbSeries.length - 1] || 0),
-        ctlSeries,
-        atlSeries,
-        tsbSeries,
-      };
+      // CTL/ATL/TSB come only from /metrics/pmc so every view shares the
+      // server's daily load (completed planned workouts, days up to its horizon).
+      return { ctl: 0, atl: 0, tsb: 0, ctlSeries: [], atlSeries: [], tsbSeries: [] };
     }
 
     function renderSparkline(elId, series) {
@@ -1056,37 +1041,11 @@
     }
 
     function buildCtlSeriesForDays(days) {
-      const observed = buildObservedDailyTssMap();
-      const today = parseDateKey(todayKey());
-      const warmup = 120;
-      const totalDays = days + warmup;
-      const start = new Date(today);
-      start.setDate(today.getDate() - totalDays + 1);
-      const values = [];
-      const dateKeys = [];
-      for (let i = 0; i < totalDays; i++) {
-        const d = new Date(start);
-        d.setDate(start.getDate() + i);
-        const key = dateKeyFromDate(d);
-        values.push(Number(observed[key] || 0));
-        dateKeys.push(key);
-      }
-      let ctlPrev = 0;
-      let atlPrev = 0;
-      const ctlSeries = [];
-      const keySeries = [];
-      for (let i = 0; i < values.length; i++) {
-        const tss = values[i];
-        const ctl = ctlPrev + (tss - ctlPrev) / 42;
-        const atl = atlPrev + (tss - atlPrev) / 7;
-        ctlPrev = ctl;
-        atlPrev = atl;
-        if (i >= warmup) {
-          ctlSeries.push(ctl);
-          keySeries.push(dateKeys[i]);
-        }
+      const server = pmcWindow(todayKey(), days);
+      if (server) {
+        return { ctlSeries: server.map(r => r.ctl), keySeries: server.map(r => r.date) };
       }
-      return { ctlSeries, keySeries };
+      return { ctlSeries: [], keySeries: [] };
     }
 
     function formatDateShort(key) {
@@ -3114,7 +3073,7 @@
       const hrRow = document.getElementById('wvHrMin').closest('.tp-minmax-row');
       if (hrRow) hrRow.style.gridTemplateColumns = '110px 1.5fr 1.5fr 1.5fr 80px';
       if (data.fit_id) {
-        fetch(`/fit/${data.fit_id}`).then(r => r.ok ? r.json() : null).then((fit) => {
+        fetch(`/fit/${data.fit_id}?points=3`).then(r => r.ok ? r.json() : null).then((fit) => {
           if (!fit) return;
           const s = fit.summary || {};
           if (s.min_hr) document.getElementById('wvHrMin').value = String(Math.round(s.min_hr));
@@ -3516,7 +3475,7 @@
         return;
       }
 
-      const resp = await fetch(`/fit/${data.fit_id}`);
+      const resp = await fetch(`/fit/${data.fit_id}?points=${FIT_CHART_POINTS}`);
       if (!resp.ok) {
         statsNode.innerHTML = '<div>Could not load FIT data.</div>';
         lapBody.innerHTML = '';
@@ -3539,7 +3498,7 @@
       }
 
       const baseMs = new Date(series[0].timestamp).getTime();
-      const pts = series.map((p) => ({
+      const toAnalyzePoint = (p) => ({
         t: timeToSec(p.timestamp, baseMs),
         timestamp: p.timestamp,
         heart_rate: num(p.heart_rate),
@@ -3549,7 +3508,8 @@
         power: num(p.power),
         lat: p.lat != null ? Number(p.lat) : null,
         lng: p.lng != null ? Number(p.lng) : null,
-      }));
+      });
+      const pts = series.map(toAnalyzePoint);
       const totalSec = Math.max(1, pts[pts.length - 1].t - pts[0].t);
 
       const lineMeta = [
@@ -4288,6 +4248,37 @@
         renderMain();
       };
 
+      // pts starts as a thinned overview; zooms and lap selections splice in a
+      // finer window fetched with start_s/end_s (seconds from the first sample).
+      const fullResWindows = [];
+      async function refineWindow(startSec, endSec) {
+        const s = Math.max(0, Math.floor(startSec));
+        const e = Math.ceil(endSec);
+        if (e <= s || fullResWindows.some((r) => r.s <= s && r.e >= e)) return;
+        const r = await fetch(`/fit/${data.fit_id}?start_s=${s}&end_s=${e}&points=${FIT_CHART_POINTS}`);
+        if (!r.ok || modalSession !== workoutModalSession) return;
+        const win = await r.json();
+        const detail = (Array.isArray(win.series) ? win.series : []).map(toAnalyzePoint);
+        if (!detail.length) return;
+        const meta = win.series_window || {};
+        if (Number(meta.source_points) <= FIT_CHART_POINTS) fullResWindows.push({ s, e });
+        let lo = pts.findIndex((p) => p.t >= s);
+        if (lo < 0) lo = pts.length;
+        let hi = lo;
+        while (hi < pts.length && pts[hi].t <= e) hi += 1;
+        pts.splice(lo, hi - lo, ...detail);
+        analyzeState.smoothedCache.clear();
+        renderMain();
+      }
+      function refineDisplayWindow(dStart, dEnd) {
+        const eff = effectivePoints();
+        if (!eff.length) return;
+        const i0 = Math.max(0, eff.findIndex((p) => p.dT >= dStart) - 1);
+        let i1 = eff.findIndex((p) => p.dT > dEnd);
+        if (i1 < 0) i1 = eff.length - 1;
+        refineWindow(eff[i0].t, eff[i1].t);
+      }
+
       zoomBtn.onclick = () => {
         const eff = effectivePoints();
         const effectiveTotal = Math.max(1, (eff.length ? eff[eff.length - 1].dT : totalSec));
@@ -4312,6 +4303,7 @@
         analyzeState.selection = null;
         analyzeState.selectionMode = 'none';
         renderMain();
+        refineDisplayWindow(start, end);
       };
       cutBtn.onclick = () => {
         const cutRanges = [];
@@ -4446,6 +4438,7 @@
           }
         }
         renderMain();
+        analyzeState.lapHighlightRanges.forEach((r) => refineWindow(r.startSec, r.endSec));
       }
       function renderLapRows() {
         lapBody.innerHTML = '';
@@ -4677,6 +4670,8 @@
       featuredItem.addEventListener('click', () => openDetailModal(featured));
       list.appendChild(featuredItem);
 
+      // The CTL projection reads planned workouts up to the event day.
+      if (loadedRange) ensureLoadedRange(loadedRange.from, featured.date);
       const chartDiv = document.createElement('div');
       chartDiv.className = 'event-ctl-chart-wrap';
       renderEventCtlChart(chartDiv, featured);
@@ -5192,6 +5187,7 @@
       const endDate = new Date(endMonth);
       const endOffset = (7 - ((endDate.getDay() + 6) % 7) - 1);
       endDate.setDate(endDate.getDate() + endOffset);
+      ensureLoadedRange(dateKeyFromDate(startDate), dateKeyFromDate(endDate));
 
       const weekRows = [];
       for (let d = new Date(startDate); d <= endDate; d.setDate(d.getDate() + 7)) {
@@ -5762,11 +5758,115 @@
       });
     }
 
-    async function loadData() {
+    function shiftDateKey(key, days) {
+      const d = parseDateKey(key);
+      d.setDate(d.getDate() + days);
+      return dateKeyFromDate(d);
+    }
+
+    // First paint covers six weeks either side of today.
+    function defaultLoadedRange() {
+      const today = todayKey();
+      return { from: shiftDateKey(today, -42), to: shiftDateKey(today, 42) };
+    }
+
+    // Pages through /ui/activities for [from, to] with the X-Next-Cursor keyset.
+    async function fetchActivityRange(from, to) {
+      const rows = [];
+      let cursor = '';
+      do {
+        const page = cursor ? `&cursor=${encodeURIComponent(cursor)}` : '';
+        const resp = await fetch(`/ui/activities?from=${from}&to=${to}&limit=${ACTIVITY_PAGE_SIZE}${page}`);
+        if (!resp.ok) throw new Error(`Loading activities failed (${resp.status})`);
+        rows.push(...await resp.json());
+        cursor = resp.headers.get('X-Next-Cursor') || '';
+      } while (cursor);
+      return rows;
+    }
+
+    // PMC rows start 119 days early so buildMetricsToDate() has a full
+    // 120-day window for every date in the range.
+    async function fetchRange(from, to) {
+      const [rows, cResp, pmcResp] = await Promise.all([
+        fetchActivityRange(from, to),
+        fetch(`/calendar-items?from=${from}&to=${to}`),
+        fetch(`/metrics/pmc?from=${shiftDateKey(from, -119)}&to=${to}`),
+      ]);
+      if (!cResp.ok) throw new Error(`Loading calendar items failed (${cResp.status})`);
+      const pmcDays = pmcResp.ok ? ((await pmcResp.json()).days || []) : [];
+      return { activities: rows, calendarItems: await cResp.json(), pmcDays };
+    }
+
+    function mergePmcDays(days) {
+      if (!pmcByDate) pmcByDate = {};
+      days.forEach((row) => { pmcByDate[row.date] = row; });
+    }
+
+    function mergeById(current, incoming) {
+      const byId = new Map(current.map((row) => [String(row.id), row]));
+      incoming.forEach((row) => byId.set(String(row.id), row));
+      return Array.from(byId.values());
+    }
+
+    // Extends loadedRange to cover [from, to], fetching only the missing edges.
+    // The calendar calls this for the months it draws and re-renders once the
+    // rows arrive.
+    async function ensureLoadedRange(from, to) {
+      if (!loadedRange) return;
+      const gaps = [];
+      if (from < loadedRange.from) gaps.push({ from, to: shiftDateKey(loadedRange.from, -1) });
+      if (to > loadedRange.to) gaps.push({ from: shiftDateKey(loadedRange.to, 1), to });
+      if (!gaps.length) return;
+      const previous = loadedRange;
+      // Claim the range up front so overlapping renders do not fetch it twice.
+      loadedRange = { from: from < previous.from ? from : previous.from, to: to > previous.to ? to : previous.to };
+      let parts;
       try {
-        const [aResp, cResp, pResp, sResp] = await Promise.all([fetch('/ui/activities'), fetch('/calendar-items'), fetch('/pairs'), fetch('/settings')]);
-        activities = aResp.ok ? await aResp.json() : [];
-        calendarItems = cResp.ok ? await cResp.json() : [];
+        parts = await Promise.all(gaps.map((gap) => fetchRange(gap.from, gap.to)));
+      } catch (_err) {
+        loadedRange = previous;
+        return;
+      }
+      parts.forEach((part) => {
+        activities = mergeById(activities, part.activities);
+        calendarItems = mergeById(calendarItems, part.calendarItems);
+        mergePmcDays(part.pmcDays);
+      });
+      activities.sort((a, b) => String(a.start_date_local).localeCompare(String(b.start_date_local)));
+      renderHome();
+      if (isCalendarActive()) renderCalendar({ preserveScroll: true });
+      renderDashboard();
+    }
+
+    // Loads activities and calendar items for options.window ({ from, to } date
+    // keys), or reloads the range already in memory; months outside it are
+    // fetched by ensureLoadedRange() as the calendar reaches them.
+    async function loadData(options = {}) {
+      const range = options.window || loadedRange || defaultLoadedRange();
+      try {
+        const pmcFrom = parseDateKey(todayKey());
+        pmcFrom.setDate(pmcFrom.getDate() - 365 - 120);
+        const pmcTo = parseDateKey(todayKey());
+        pmcTo.setDate(pmcTo.getDate() + 365);
+        // Events and goals feed the home view whatever their date, so they are
+        // always loaded in full; they are few.
+        const [loaded, eResp, gResp, pResp, sResp, pmcResp] = await Promise.all([
+          fetchRange(range.from, range.to),
+          fetch('/calendar-items?kind=event'),
+          fetch('/calendar-items?kind=goal'),
+          fetch('/pairs'),
+          fetch('/settings'),
+          fetch(`/metrics/pmc?from=${dateKeyFromDate(pmcFrom)}&to=${dateKeyFromDate(pmcTo)}`),
+        ]);
+        activities = loaded.activities;
+        calendarItems = mergeById(
+          loaded.calendarItems,
+          [...(eResp.ok ? await eResp.json() : []), ...(gResp.ok ? await gResp.json() : [])],
+        );
+        loadedRange = { from: range.from, to: range.to };
+        pmcByDate = null;
+        if (pmcResp.ok) mergePmcDays((await pmcResp.json()).days || []);
+        mergePmcDays(loaded.pmcDays);
         pairs = pResp.ok ? await pResp.json() : [];
         appSettings = sResp.ok ? await sResp.json() : { units: { distance: 'km', elevation: 'm' }, ftp: {} };
         if (appSettings.units && appSettings.units.distance) {
@@ -5779,6 +5879,7 @@
         activities = [];
         calendarItems = [];
         pairs = [];
+        pmcByDate = null;
       }
 
       updateUnitButtons();
@@ -5796,6 +5897,28 @@
       renderSettings();
     }
 
+    async function importFitBulk(files) {
+      const form = new FormData();
+      files.forEach((file) => form.append('files', file, file.name));
+      const resp = await fetch('/import-fit/bulk', { method: 'POST', body: form });
+      if (!resp.ok) {
+        alert(`Import failed: ${await resp.text()}`);
+        return;
+      }
+      let job = await resp.json();
+      while (job.status === 'running') {
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+        const poll = await fetch(`/import-fit/jobs/${encodeURIComponent(job.id)}`);
+        if (!poll.ok) return;
+        job = await poll.json();
+      }
+      const failed = job.files.filter((f) => f.status === 'error');
+      if (job.status === 'error' || failed.length) {
+        const lines = failed.slice(0, 10).map((f) => `${f.name}: ${f.error}`);
+        alert(`Imported ${job.imported} of ${job.total} files (${job.duplicates} duplicates).\n${lines.join('\n')}`);
+      }
+    }
+
     document.querySelectorAll('.tab').forEach(btn => {
       btn.addEventListener('click', async () => {
         const view = btn.dataset.view;
@@ -5852,13 +5975,23 @@
     document.getElementById('uploadFitBtn').addEventListener('click', () => {
       fitUploadContext = 'global';
       fitUploadTargetActivityId = null;
-      document.getElementById('uploadFitInput').click();
+      const input = document.getElementById('uploadFitInput');
+      input.multiple = true;
+      input.accept = '.fit,.zip';
+      input.click();
     });
     document.getElementById('uploadFitInput').addEventListener('change', async (event) => {
       const input = event.target;
-      const file = input.files && input.files[0];
+      const files = input.files ? Array.from(input.files) : [];
+      const file = files[0];
       if (!file) return;
       input.value = '';
+      if (fitUploadContext === 'global' && !fitUploadTargetActivityId
+        && (files.length > 1 || file.name.toLowerCase().endsWith('.zip'))) {
+        await importFitBulk(files);
+        await loadData();
+        return;
+      }
       if (fitUploadContext === 'modal') {
         const payload = window.currentWorkoutPayload;
         if (!payload || !modalDraft) return;
@@ -6123,7 +6256,10 @@
       if (!payload) return;
       fitUploadContext = 'modal';
       fitUploadTargetActivityId = payload.source === 'strava' ? payload.data.id : null;
-      document.getElementById('uploadFitInput').click();
+      const input = document.getElementById('uploadFitInput');
+      input.multiple = false;
+      input.accept = '.fit';
+      input.click();
     });
     document.getElementById('wvFilesTabBtn').addEventListener('click', () => {
       const pop = document.getElementById('wvFilesPopover');
@@ -6430,4 +6566,4 @@
       return saved && ['home', 'calendar', 'dashboard'].includes(saved) ? saved : 'home';
     })();
     setView(initialView, { suppressCalendarRender: initialView === 'calendar' });
-    loadData();
+    loadData({ window: defaultLoadedRange() });
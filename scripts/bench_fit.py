@@ -0,0 +1,56 @@
+"""Time FIT decoding and the NP/hrTSS metrics on local files.
+
+Usage: python scripts/bench_fit.py ride.fit [more.fit ...] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def _best_of(repeat, fn, *args):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="+", type=Path)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--ftp", type=float, default=250.0)
+    parser.add_argument("--lthr", type=float, default=160.0)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    from app import main as app_main
+
+    settings = {"ftp": {"other": args.ftp}, "lthr": {"other": args.lthr}}
+    for path in args.files:
+        path = path.resolve()
+        parse_s, parsed = _best_of(args.repeat, app_main.parse_fit_file_to_json, path, settings)
+        with path.open("rb") as handle:
+            cols, _ = app_main.decode_fit_stream(handle, settings=settings)
+        t = cols["offsets"]
+        power = app_main._channel_values(cols, "power")
+        heart_rate = app_main._channel_values(cols, "heart_rate")
+        np_s, np_value = _best_of(args.repeat, app_main._normalized_power, t, power)
+        hr_s, hr_value = _best_of(args.repeat, app_main._hr_tss, t, heart_rate, args.lthr)
+        print(
+            f"{path.name}: {len(t)} samples  parse {parse_s:.3f}s  "
+            f"NP {np_value:.3f} ({np_s * 1e3:.1f} ms)  hrTSS {hr_value:.3f} ({hr_s * 1e3:.1f} ms)  "
+            f"TSS {parsed['summary']['tss']:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# No background Strava polling while tests run.
+os.environ.setdefault("STRAVA_SYNC_INTERVAL_S", "0")
+sys.path.insert(0, str(ROOT))
+
+# app.main mounts its static directories relative to the working directory.
+_cwd = os.getcwd()
+os.chdir(ROOT)
+try:
+    from app import main  # noqa: E402
+finally:
+    os.chdir(_cwd)
+
+
+def _reset_state() -> None:
+    main.close_db_pool()
+    main._invalidate_threshold_index()
+    main._tss_recalc_state.clear()
+    main._tss_recalc_state["status"] = "idle"
+    main._fit_import_jobs.clear()
+    with main._body_cache_lock:
+        main._body_cache.clear()
+        main._body_cache_bytes = 0
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Run against an empty data/ directory under tmp_path.
+
+    app/ and icons/ are linked in as well: spawned FIT workers import app.main
+    from this working directory, and it mounts both at import.
+    """
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    for name in ("app", "icons"):
+        (tmp_path / name).symlink_to(ROOT / name, target_is_directory=True)
+    _reset_state()
+    yield tmp_path / "data"
+    _reset_state()
+
+
+@pytest.fixture
+def client(data_dir):
+    from fastapi.testclient import TestClient
+
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def strava(data_dir, monkeypatch):
+    """A running StravaStub with the app's Strava URLs and tokens pointed at it."""
+    from strava_stub import StravaStub
+
+    stub = StravaStub().start()
+    monkeypatch.setattr(main, "STRAVA_TOKEN_URL", f"{stub.base_url}/oauth/token")
+    monkeypatch.setattr(main, "STRAVA_ACTIVITIES_URL", f"{stub.base_url}/api/v3/athlete/activities")
+    monkeypatch.setattr(main, "STRAVA_ACTIVITY_URL", f"{stub.base_url}/api/v3/activities")
+    monkeypatch.setenv("STRAVA_CLIENT_ID", "1234")
+    monkeypatch.setenv("STRAVA_CLIENT_SECRET", "secret")
+    main.save_tokens(
+        {
+            "access_token": stub.access_token,
+            "refresh_token": "refresh-1",
+            "expires_at": 4102444800,
+            "athlete": {"id": 42, "firstname": "Test", "lastname": "Rider"},
+        }
+    )
+    yield stub
+    stub.stop()
@@ -0,0 +1,152 @@
+"""Local stand-in for the Strava API endpoints the sync uses.
+
+Serves /oauth/token, /api/v3/athlete/activities and /api/v3/activities/{id}
+from an in-memory activity list. Point the app at it with STRAVA_API_BASE:
+
+    python tests/strava_stub.py --port 8765 --activities 500
+    STRAVA_API_BASE=http://127.0.0.1:8765 uvicorn app.main:app
+"""
+
+import argparse
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+
+def _epoch(value: str) -> int:
+    return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+
+
+def make_activity(activity_id: int, start: datetime, **fields: Any) -> dict[str, Any]:
+    stamp = start.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return {
+        "id": activity_id,
+        "name": f"Activity {activity_id}",
+        "type": "Ride",
+        "start_date": stamp,
+        "start_date_local": stamp,
+        "moving_time": 3600,
+        "elapsed_time": 3700,
+        "distance": 30000.0,
+        "average_heartrate": 140.0,
+        "weighted_average_watts": 200.0,
+        **fields,
+    }
+
+
+class StravaStub:
+    """Threaded HTTP server holding activities, tokens and a request log.
+
+    ``fail_with`` is a queue of status codes returned (with Retry-After: 0)
+    before normal handling resumes; ``requests`` records (path, query, auth).
+    """
+
+    def __init__(self, activities: int = 0, start: datetime | None = None, port: int = 0) -> None:
+        start = start or datetime(2024, 1, 1, 7, 0, tzinfo=timezone.utc)
+        self.activities = [
+            make_activity(1000 + i, start + timedelta(days=i), type="Ride" if i % 2 else "Run")
+            for i in range(activities)
+        ]
+        self.access_token = "token-1"
+        self.refresh_count = 0
+        self.fail_with: list[int] = []
+        self.requests: list[tuple[str, dict[str, str], str | None]] = []
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "StravaStub":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="strava-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def list_activities(self, query: dict[str, str]) -> list[dict[str, Any]]:
+        rows = sorted(self.activities, key=lambda r: (_epoch(r["start_date"]), r["id"]))
+        if "after" in query:
+            rows = [r for r in rows if _epoch(r["start_date"]) > int(query["after"])]
+        if "before" in query:
+            rows = [r for r in rows if _epoch(r["start_date"]) < int(query["before"])]
+        if "after" not in query:
+            # Without `after` Strava lists newest first.
+            rows.reverse()
+        per_page = int(query.get("per_page", 30))
+        page = int(query.get("page", 1))
+        return rows[(page - 1) * per_page : page * per_page]
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _send(self, status: int, body: Any, headers: dict[str, str] | None = None) -> None:
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                auth = self.headers.get("Authorization")
+                with stub._lock:
+                    stub.requests.append((url.path, query, auth))
+                    failure = stub.fail_with.pop(0) if stub.fail_with else None
+                if failure is not None:
+                    return self._send(failure, {"message": "stub failure"}, {"Retry-After": "0"})
+                if auth != f"Bearer {stub.access_token}":
+                    return self._send(401, {"message": "Authorization Error"})
+                if url.path == "/api/v3/athlete/activities":
+                    return self._send(200, stub.list_activities(query))
+                if url.path.startswith("/api/v3/activities/"):
+                    activity_id = url.path.rsplit("/", 1)[1]
+                    row = next((r for r in stub.activities if str(r["id"]) == activity_id), None)
+                    return self._send(200, row) if row else self._send(404, {"message": "Record Not Found"})
+                self._send(404, {"message": "Not Found"})
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode()).items()}
+                url = urlparse(self.path)
+                with stub._lock:
+                    stub.requests.append((url.path, form, None))
+                if url.path != "/oauth/token":
+                    return self._send(404, {"message": "Not Found"})
+                with stub._lock:
+                    stub.refresh_count += 1
+                    stub.access_token = f"token-{stub.refresh_count + 1}"
+                    token = stub.access_token
+                self._send(
+                    200,
+                    {
+                        "token_type": "Bearer",
+                        "access_token": token,
+                        "refresh_token": f"refresh-{stub.refresh_count + 1}",
+                        "expires_at": int(datetime.now(timezone.utc).timestamp()) + 6 * 3600,
+                    },
+                )
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a fake Strava API for local sync runs.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--activities", type=int, default=250)
+    args = parser.parse_args()
+    stub = StravaStub(activities=args.activities, port=args.port)
+    print(f"Strava stub on {stub.base_url}; access token {stub.access_token}")
+    stub.server.serve_forever()
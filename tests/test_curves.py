@@ -0,0 +1,50 @@
+import json
+
+from app import main
+from fitgen import build_fit
+
+
+def _import(client) -> dict:
+    resp = client.post("/import-fit", params={"filename": "ride.fit"}, content=build_fit(1800))
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def _curve_rows(activity_id: str) -> int:
+    with main.get_db() as db:
+        return db.execute("SELECT COUNT(*) FROM activity_curves WHERE activity_id = ?", (activity_id,)).fetchone()[0]
+
+
+def _envelope(client) -> list:
+    return client.get("/metrics/curves", params={"kind": "power", "sport": "other"}).json()["points"]
+
+
+def test_backfill_step_covers_existing_series(client):
+    item = _import(client)
+    expected = _envelope(client)
+    assert expected
+    with main.get_db() as db:
+        db.execute("DELETE FROM activity_curves")
+        db.execute(f"PRAGMA user_version = {len(main._SCHEMA_STEPS) - 1}")
+    assert _envelope(client) == []
+
+    main.init_db()
+
+    assert _curve_rows(item["id"]) > 0
+    assert _envelope(client) == expected
+
+
+def test_legacy_json_conversion_writes_curves(client):
+    item = _import(client)
+    expected = _envelope(client)
+    parsed = main.load_fit_parsed(item["fit_id"])
+    with main.get_db() as db:
+        db.execute("DELETE FROM activity_curves")
+        db.execute("DELETE FROM fit_series")
+        db.execute(
+            "UPDATE activity_blobs SET fit_parsed_json = ? WHERE activity_id = ?", (json.dumps(parsed), item["id"])
+        )
+
+    main.load_fit_parsed(item["fit_id"])
+
+    assert _envelope(client) == expected
@@ -0,0 +1,72 @@
+import io
+from pathlib import Path
+
+import fitparse
+import numpy as np
+import pytest
+
+from app import main
+from fitgen import build_fit
+
+FIXTURE = Path(__file__).parent / "fixtures" / "ride_gap.fit"
+SETTINGS = {"ftp": {"other": 250}, "lthr": {"other": 160}}
+
+
+def _stock_parse(content: bytes, monkeypatch) -> dict:
+    """parse_fit_bytes_to_json with fitparse's own FitFile, which keeps every message."""
+    with monkeypatch.context() as patch:
+        patch.setattr(main, "_StreamingFitFile", fitparse.FitFile)
+        return main.parse_fit_bytes_to_json(content, settings=SETTINGS)
+
+
+def test_fitparse_version_matches_pin():
+    # _StreamingFitFile overrides a private method; see requirements.txt.
+    assert fitparse.__version__ == "1.2.0"
+    assert callable(getattr(fitparse.FitFile, "_parse_message", None))
+
+
+@pytest.mark.parametrize("content", [FIXTURE.read_bytes(), build_fit(1800, gap=(600, 700))], ids=["fit_tool", "fitgen"])
+def test_streaming_decode_matches_stock_fitparse(content, monkeypatch):
+    expected = _stock_parse(content, monkeypatch)
+
+    assert main.parse_fit_bytes_to_json(content, settings=SETTINGS) == expected
+
+    cols, meta = main.decode_fit_stream(io.BytesIO(content), settings=SETTINGS)
+    assert meta["summary"] == expected["summary"]
+    assert meta["laps"] == expected["laps"]
+    assert main.columns_to_series(cols) == expected["series"]
+
+
+def test_decode_matches_raw_records():
+    content = FIXTURE.read_bytes()
+    records = [
+        {f.name: f.value for f in message.fields}
+        for message in fitparse.FitFile(io.BytesIO(content)).get_messages("record")
+    ]
+
+    cols, meta = main.decode_fit_stream(io.BytesIO(content), settings=SETTINGS)
+
+    start = records[0]["timestamp"]
+    offsets = [(r["timestamp"] - start).total_seconds() for r in records]
+    np.testing.assert_array_equal(cols["offsets"], offsets)
+    for channel in ("heart_rate", "power", "cadence", "speed", "distance"):
+        np.testing.assert_allclose(main._channel_values(cols, channel), [r[channel] for r in records])
+    assert meta["summary"]["start"] == start.isoformat()
+    for channel, field in (("lat", "position_lat"), ("lng", "position_long")):
+        np.testing.assert_allclose(main._channel_values(cols, channel), [r[field] * 180 / 2**31 for r in records])
+    assert {"lat", "lng"} <= set(cols["present"])
+
+
+def test_decode_without_gps_omits_position_channels():
+    cols, _ = main.decode_fit_stream(io.BytesIO(build_fit(600)), settings=SETTINGS)
+
+    assert "lat" not in cols["present"] and "lng" not in cols["present"]
+    assert "lat" not in main.columns_to_series(cols)[0]
+
+
+def test_streaming_file_does_not_retain_messages():
+    fit = main._StreamingFitFile(io.BytesIO(FIXTURE.read_bytes()))
+    count = sum(1 for _ in fit.get_messages("record"))
+
+    assert count == 1080
+    assert fit._messages == []
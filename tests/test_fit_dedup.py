@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+
+from app import main
+from fitgen import build_fit
+
+START = datetime(2024, 5, 1, 7, tzinfo=timezone.utc)
+
+
+def _visible() -> set[str]:
+    with main.get_db() as db:
+        return {r["id"] for r in db.execute("SELECT id FROM activities WHERE hidden = 0").fetchall()}
+
+
+def test_migration_hashes_but_leaves_duplicates_to_the_endpoint(client):
+    content = build_fit(900, start=START)
+    ids = [
+        client.post("/import-fit", params={"filename": f"{name}.fit"}, content=build_fit(900, start=START, seed=seed)).json()["id"]
+        for name, seed in (("first", 1), ("second", 2))
+    ]
+    # Rows from before v7: identical bytes stored twice, no hashes yet.
+    with main.get_db() as db:
+        db.execute("UPDATE activity_blobs SET fit_data = ?", (content,))
+        db.execute("UPDATE activities SET fit_sha256 = NULL")
+        db.execute("PRAGMA user_version = 6")
+
+    main.init_db()
+
+    with main.get_db() as db:
+        hashes = {r["fit_sha256"] for r in db.execute("SELECT fit_sha256 FROM activities").fetchall()}
+        series = db.execute("SELECT COUNT(*) FROM fit_series").fetchone()[0]
+    assert len(hashes) == 1 and None not in hashes
+    assert _visible() == set(ids)
+    assert series == 2
+
+    report = client.post("/import-fit/dedup", params={"dry_run": "true"}).json()
+    assert report["dry_run"] is True
+    [entry] = report["hidden"]
+    assert {entry["id"], entry["duplicate_of"]} == set(ids)
+    assert _visible() == set(ids)
+
+    applied = client.post("/import-fit/dedup").json()
+    assert applied["hidden"] == report["hidden"]
+    assert _visible() == {entry["duplicate_of"]}
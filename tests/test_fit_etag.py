@@ -0,0 +1,36 @@
+import threading
+
+from app import main
+from fitgen import build_fit
+
+
+def _bump_tss(fit_id: str) -> None:
+    with main.get_db() as db:
+        db.execute(
+            "UPDATE fit_series SET meta_json = json_set(meta_json, '$.summary.tss', 999), version = version + 1 "
+            "WHERE fit_id = ?",
+            (fit_id,),
+        )
+
+
+def test_write_during_render_is_not_cached_under_old_etag(client, monkeypatch):
+    item = client.post("/import-fit", params={"filename": "ride.fit"}, content=build_fit(1200)).json()
+    fit_id = item["fit_id"]
+    render = main._fit_payload
+
+    def racing_render(*args):
+        # A write lands after the handler read the version but before it renders.
+        writer = threading.Thread(target=_bump_tss, args=(fit_id,))
+        writer.start()
+        writer.join()
+        return render(*args)
+
+    monkeypatch.setattr(main, "_fit_payload", racing_render)
+    first = client.get(f"/fit/{fit_id}", params={"points": 100})
+    monkeypatch.setattr(main, "_fit_payload", render)
+
+    assert first.json()["summary"]["tss"] != 999
+    cached = client.get(f"/fit/{fit_id}", params={"points": 100}, headers={"If-None-Match": first.headers["ETag"]})
+    assert cached.status_code == 200
+    assert cached.headers["ETag"] != first.headers["ETag"]
+    assert cached.json()["summary"]["tss"] == 999
@@ -0,0 +1,102 @@
+import io
+import tempfile
+import time
+import zipfile
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app import main
+from fitgen import build_fit
+
+
+def _ride(day: int) -> bytes:
+    return build_fit(900, start=datetime(2024, 5, 1, 7, tzinfo=timezone.utc) + timedelta(days=day), seed=day)
+
+
+def _wait(client, job):
+    deadline = time.monotonic() + 60
+    while job["status"] == "running":
+        assert time.monotonic() < deadline, job
+        time.sleep(0.1)
+        job = client.get(f"/import-fit/jobs/{job['id']}").json()
+    return job
+
+
+@pytest.fixture
+def scratch_tmp(tmp_path, monkeypatch):
+    path = tmp_path / "tmp"
+    path.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(path))
+    return path
+
+
+@pytest.fixture
+def submitted(monkeypatch):
+    """Arguments handed to the FIT process pool."""
+    calls = []
+    real_executor = main._fit_import_executor
+
+    class Recording:
+        def submit(self, fn, *args):
+            calls.append(args)
+            return real_executor().submit(fn, *args)
+
+    monkeypatch.setattr(main, "_fit_import_executor", lambda: Recording())
+    return calls
+
+
+def test_bulk_import_spools_uploads_and_passes_paths(client, scratch_tmp, submitted):
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("rides/day3.fit", _ride(3))
+        zf.writestr("__MACOSX/rides/._day3.fit", b"junk")
+        zf.writestr("rides/day4.fit", _ride(4))
+    files = [
+        ("files", ("day1.fit", _ride(1), "application/octet-stream")),
+        ("files", ("day2.fit", _ride(2), "application/octet-stream")),
+        ("files", ("again.fit", _ride(1), "application/octet-stream")),
+        ("files", ("notes.txt", b"hello", "text/plain")),
+        ("files", ("set.zip", archive.getvalue(), "application/zip")),
+    ]
+
+    job = _wait(client, client.post("/import-fit/bulk", files=files).json())
+
+    assert job["status"] == "done"
+    assert (job["total"], job["imported"], job["duplicates"], job["errors"]) == (6, 4, 1, 1)
+    assert len(submitted) == 4
+    assert all(isinstance(args[0], str) for args in submitted)
+    assert list(scratch_tmp.iterdir()) == []
+    assert len(client.get("/ui/activities").json()) == 4
+
+    # Re-importing the same bytes is recognised without parsing.
+    submitted.clear()
+    again = _wait(client, client.post("/import-fit/bulk", files=files[:1]).json())
+    assert (again["imported"], again["duplicates"]) == (0, 1)
+    assert submitted == []
+
+
+def test_bulk_import_rejects_oversized_uploads(client, scratch_tmp, monkeypatch):
+    monkeypatch.setattr(main, "FIT_UPLOAD_MAX_BYTES", 1024)
+
+    resp = client.post("/import-fit/bulk", files=[("files", ("big.fit", _ride(1), "application/octet-stream"))])
+
+    assert resp.status_code == 413
+    assert list(scratch_tmp.iterdir()) == []
+
+
+def test_bulk_import_keeps_separate_recordings_of_one_session(client, scratch_tmp):
+    start = datetime(2024, 5, 1, 7, tzinfo=timezone.utc)
+    head_unit = build_fit(900, start=start, seed=1)
+    watch = build_fit(900, start=start, seed=2)
+    files = [
+        ("files", ("head_unit.fit", head_unit, "application/octet-stream")),
+        ("files", ("watch.fit", watch, "application/octet-stream")),
+    ]
+
+    job = _wait(client, client.post("/import-fit/bulk", files=files).json())
+
+    # Same rule as /import-fit: only identical bytes count as a duplicate.
+    assert (job["imported"], job["duplicates"]) == (2, 0)
+    single = client.post("/import-fit", params={"filename": "watch.fit"}, content=watch).json()
+    assert single["duplicate"] is True
@@ -0,0 +1,103 @@
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app import main
+
+# The vectorised metrics weight samples by the time they cover; on a clean
+# 1 Hz ride they must stay within this of the original per-sample loops.
+NP_REL_TOLERANCE = 1e-3
+HR_TSS_REL_TOLERANCE = 1e-9
+
+
+def _reference_normalized_power(points):
+    """Per-sample 30 s rolling NP as computed before vectorisation."""
+    samples = []
+    for row in points:
+        p = row.get("power")
+        if p is None or p <= 0:
+            continue
+        samples.append((datetime.fromisoformat(row["timestamp"]).timestamp(), float(p)))
+    window = []
+    rolling = []
+    total = 0.0
+    for t, p in samples:
+        window.append((t, p))
+        total += p
+        while window and (t - window[0][0]) > 30.0:
+            total -= window[0][1]
+            window.pop(0)
+        rolling.append(total / len(window))
+    return (sum(v ** 4 for v in rolling) / len(rolling)) ** 0.25
+
+
+def _reference_hr_tss(points, lthr):
+    """Time-in-zone hrTSS counting one second per record."""
+    bounds = [68.0, 84.0, 95.0, 106.0]
+    rates = [30.0, 55.0, 70.0, 90.0, 110.0]
+    time_in_zone = [0.0] * 5
+    for p in points:
+        hr = p.get("heart_rate")
+        if hr is None or hr <= 0:
+            continue
+        pct = hr / lthr * 100.0
+        zone = next((i for i, bound in enumerate(bounds) if pct < bound), 4)
+        time_in_zone[zone] += 1.0
+    return sum(t / 3600.0 * rates[z] for z, t in enumerate(time_in_zone))
+
+
+def _ride(seconds=3600, seed=1):
+    rng = np.random.default_rng(seed)
+    i = np.arange(seconds)
+    power = np.maximum(0, 200 + 80 * np.sin(i / 60.0) + rng.uniform(-30, 30, seconds)).round()
+    heart_rate = (120 + 30 * np.sin(i / 300.0) + rng.uniform(-3, 3, seconds)).round()
+    start = datetime(2024, 5, 1, 7, 0, 0)
+    points = [
+        {"timestamp": (start + timedelta(seconds=int(s))).isoformat(), "power": float(p), "heart_rate": float(h)}
+        for s, p, h in zip(i, power, heart_rate)
+    ]
+    return i.astype(float), power, heart_rate, points
+
+
+def test_normalized_power_matches_reference_loop():
+    t, power, _, points = _ride()
+    expected = _reference_normalized_power(points)
+    assert main._normalized_power(t, power) == pytest.approx(expected, rel=NP_REL_TOLERANCE)
+
+
+def test_hr_tss_matches_reference_loop():
+    t, _, heart_rate, points = _ride()
+    expected = _reference_hr_tss(points, 160.0)
+    assert main._hr_tss(t, heart_rate, 160.0) == pytest.approx(expected, rel=HR_TSS_REL_TOLERANCE)
+
+
+def test_metrics_ignore_missing_samples():
+    t, power, heart_rate, points = _ride(seconds=1200)
+    power[::7] = np.nan
+    heart_rate[::5] = np.nan
+    for k, row in enumerate(points):
+        if k % 7 == 0:
+            row["power"] = None
+        if k % 5 == 0:
+            row["heart_rate"] = None
+    assert main._normalized_power(t, power) == pytest.approx(_reference_normalized_power(points), rel=1e-2)
+    assert main._hr_tss(t, heart_rate, 160.0) == pytest.approx(_reference_hr_tss(points, 160.0), rel=1e-2)
+
+
+def test_metrics_do_not_depend_on_sample_rate():
+    t = np.arange(0, 3600.0)
+    power = 200 + 50 * np.sin(t / 40)
+    heart_rate = np.full_like(t, 150.0)
+    np_1hz = main._normalized_power(t, power)
+    np_third_hz = main._normalized_power(t[::3], power[::3])
+    assert np_third_hz == pytest.approx(np_1hz, rel=1e-2)
+    assert main._hr_tss(t[::3], heart_rate[::3], 160.0) == pytest.approx(main._hr_tss(t, heart_rate, 160.0), rel=1e-3)
+
+
+def test_metrics_empty_input():
+    empty = np.zeros(0)
+    assert main._normalized_power(empty, empty) is None
+    assert main._hr_tss(empty, empty, 160.0) is None
+    assert main._hr_tss(np.arange(3.0), np.full(3, math.nan), 160.0) is None
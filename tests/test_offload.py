@@ -0,0 +1,40 @@
+import statistics
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from fitgen import build_fit
+
+# /health must keep answering while FIT parses run in the process pool.
+HEALTH_MAX_S = 0.5
+HEALTH_MEDIAN_S = 0.05
+
+
+def test_health_stays_fast_during_large_imports(client):
+    uploads = [
+        build_fit(6 * 3600, start=datetime(2024, 5, 1, 7, tzinfo=timezone.utc) + timedelta(days=i), seed=i)
+        for i in range(3)
+    ]
+    results = []
+
+    def upload(content, index):
+        resp = client.post(f"/import-fit?filename=ride{index}.fit", content=content)
+        results.append(resp.status_code)
+
+    workers = [threading.Thread(target=upload, args=(content, i)) for i, content in enumerate(uploads)]
+    for worker in workers:
+        worker.start()
+    latencies = []
+    while any(worker.is_alive() for worker in workers):
+        started = time.perf_counter()
+        assert client.get("/health").status_code == 200
+        latencies.append(time.perf_counter() - started)
+        time.sleep(0.02)
+    for worker in workers:
+        worker.join()
+
+    assert results == [200, 200, 200]
+    assert len(latencies) >= 10, "imports finished before /health could be sampled"
+    assert max(latencies) < HEALTH_MAX_S, max(latencies)
+    assert statistics.median(latencies) < HEALTH_MEDIAN_S, statistics.median(latencies)
+    assert len(client.get("/ui/activities").json()) == 3
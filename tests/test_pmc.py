@@ -0,0 +1,62 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app import main
+
+
+def _add_load(day: date, tss: float, sport_key: str = "ride") -> None:
+    with main.get_db() as db:
+        db.execute(
+            "INSERT OR REPLACE INTO daily_load (date, sport_key, tss) VALUES (?, ?, ?)",
+            (day.isoformat(), sport_key, tss),
+        )
+        main._mark_pmc_dirty(db, day.isoformat(), sport_key)
+
+
+def _stored_range(sport_key: str = main._ALL_SPORTS):
+    with main.get_db() as db:
+        return tuple(
+            db.execute("SELECT MIN(date), MAX(date) FROM pmc_daily WHERE sport_key = ?", (sport_key,)).fetchone()
+        )
+
+
+def test_future_days_are_projected_not_stored(client):
+    today = date.today()
+    for offset in range(30, 0, -1):
+        _add_load(today - timedelta(days=offset), 80.0)
+    start = today - timedelta(days=60)
+    end = today + timedelta(days=365)
+
+    days = client.get("/metrics/pmc", params={"from": start.isoformat(), "to": end.isoformat()}).json()["days"]
+
+    assert len(days) == (end - start).days + 1
+    assert _stored_range()[1] == today.isoformat()
+    future = [d for d in days if d["date"] > today.isoformat()]
+    assert all(d["tss"] == 0.0 for d in future)
+    ctl = [d["ctl"] for d in future]
+    assert all(a > b for a, b in zip(ctl, ctl[1:]))
+    assert future[0]["ctl"] == pytest.approx(days[len(days) - len(future) - 1]["ctl"] * (1 - 1 / main._CTL_DAYS))
+
+    # A window entirely in the future decays from the last stored day.
+    later = client.get(
+        "/metrics/pmc",
+        params={"from": (today + timedelta(days=100)).isoformat(), "to": end.isoformat()},
+    ).json()["days"]
+    assert later[0]["ctl"] == pytest.approx(next(d for d in days if d["date"] == later[0]["date"])["ctl"])
+    assert _stored_range()[1] == today.isoformat()
+
+
+def test_horizon_extends_to_last_future_load(client):
+    today = date.today()
+    _add_load(today - timedelta(days=3), 100.0)
+    planned = today + timedelta(days=5)
+    _add_load(planned, 120.0)
+
+    days = client.get(
+        "/metrics/pmc",
+        params={"from": today.isoformat(), "to": (today + timedelta(days=40)).isoformat()},
+    ).json()["days"]
+
+    assert _stored_range()[1] == planned.isoformat()
+    assert next(d for d in days if d["date"] == planned.isoformat())["tss"] == 120.0
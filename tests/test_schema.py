@@ -0,0 +1,85 @@
+import sqlite3
+
+import pytest
+
+from app import main
+
+
+@pytest.fixture
+def migrated_db(data_dir):
+    main.init_db()
+    conn = sqlite3.connect(str(main.DB_PATH))
+    conn.row_factory = sqlite3.Row
+    yield conn
+    conn.close()
+
+
+def test_fresh_database_reaches_latest_version(migrated_db):
+    assert migrated_db.execute("PRAGMA user_version").fetchone()[0] == len(main._SCHEMA_STEPS)
+
+
+def test_failed_step_rolls_back_with_its_version(migrated_db, monkeypatch):
+    latest = len(main._SCHEMA_STEPS)
+
+    def broken_step(db):
+        db.execute("CREATE TABLE half_applied (id INTEGER)")
+        db.execute("INSERT INTO half_applied VALUES (1)")
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(main, "_SCHEMA_STEPS", (*main._SCHEMA_STEPS, broken_step))
+    with pytest.raises(RuntimeError):
+        main.migrate_schema(migrated_db)
+
+    assert migrated_db.execute("PRAGMA user_version").fetchone()[0] == latest
+    assert not migrated_db.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'half_applied'"
+    ).fetchone()
+    assert not migrated_db.in_transaction
+
+
+def test_steps_commit_one_at_a_time(migrated_db, monkeypatch):
+    latest = len(main._SCHEMA_STEPS)
+
+    def good_step(db):
+        db.execute("CREATE TABLE step_ok (id INTEGER)")
+
+    def broken_step(db):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(main, "_SCHEMA_STEPS", (*main._SCHEMA_STEPS, good_step, broken_step))
+    with pytest.raises(RuntimeError):
+        main.migrate_schema(migrated_db)
+
+    assert migrated_db.execute("PRAGMA user_version").fetchone()[0] == latest + 1
+    assert migrated_db.execute("SELECT 1 FROM sqlite_master WHERE name = 'step_ok'").fetchone()
+
+
+# Hot-path lookups that must resolve through an index on a migrated database.
+_INDEXED_QUERIES = (
+    ("SELECT * FROM activities WHERE fit_id = ?", ("fit-1",)),
+    ("SELECT id FROM activities WHERE source = 'fit' AND hidden = 0", ()),
+    (
+        "SELECT id FROM activities WHERE source = 'fit' AND hidden = 0 AND start_date_local = ? LIMIT 1",
+        ("2024-05-01T07:00:00",),
+    ),
+    (
+        "SELECT id FROM activities WHERE source = ? AND hidden = 0 "
+        "AND start_date_local >= ? AND start_date_local < ? ORDER BY start_date_local, id",
+        ("fit", "2024-05-01", "2024-06-01"),
+    ),
+    ("SELECT channel_set_json, samples_gzip, encoding FROM tp_streams WHERE workout_id = ?", ("w1",)),
+)
+
+
+@pytest.mark.parametrize("sql,params", _INDEXED_QUERIES)
+def test_hot_path_queries_use_indexes(data_dir, sql, params):
+    # tp_streams comes from the TrainingPeaks importer, not init_db.
+    with main.get_db() as db:
+        db.execute(
+            "CREATE TABLE tp_streams (workout_id TEXT, channel_set_json TEXT, samples_gzip BLOB, encoding TEXT)"
+        )
+    main.init_db()
+    with main.get_db() as db:
+        plan = [row["detail"] for row in db.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+    scans = [detail for detail in plan if detail.startswith(("SCAN activities", "SCAN tp_streams"))]
+    assert not scans, plan
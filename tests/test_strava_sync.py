@@ -0,0 +1,98 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from app import main
+from strava_stub import make_activity
+
+
+def _mirrored_ids() -> set[str]:
+    with main.get_db() as db:
+        return {r["id"] for r in db.execute("SELECT id FROM strava_activities").fetchall()}
+
+
+def _activity_requests(stub):
+    return [q for path, q, _ in stub.requests if path == "/api/v3/athlete/activities"]
+
+
+def test_sync_mirrors_every_page(client, strava):
+    strava.activities = [
+        make_activity(1000 + i, datetime(2024, 1, 1, 7, tzinfo=timezone.utc) + timedelta(days=i)) for i in range(250)
+    ]
+
+    body = client.post("/strava/sync").json()
+
+    assert body["fetched"] == 250
+    assert body["mirrored"] == 250
+    assert _mirrored_ids() == {str(1000 + i) for i in range(250)}
+    pages = _activity_requests(strava)
+    assert [q["page"] for q in pages] == ["1", "2", "3"]
+    assert all(q["after"] == "0" for q in pages)
+
+
+def test_second_sync_asks_only_for_newer_activities(client, strava):
+    start = datetime(2024, 3, 1, 7, tzinfo=timezone.utc)
+    strava.activities = [make_activity(1, start), make_activity(2, start + timedelta(days=1))]
+    client.post("/strava/sync")
+    strava.activities.append(make_activity(3, start + timedelta(days=2)))
+    strava.requests.clear()
+
+    body = client.post("/strava/sync").json()
+
+    assert body["mirrored"] == 3
+    assert int(_activity_requests(strava)[0]["after"]) < int((start + timedelta(days=2)).timestamp())
+    with main.get_db() as db:
+        payload = json.loads(db.execute("SELECT payload_json FROM strava_activities WHERE id = '3'").fetchone()[0])
+    assert payload["name"] == "Activity 3"
+
+
+def test_sync_refreshes_a_rejected_token(client, strava):
+    strava.activities = [make_activity(1, datetime(2024, 3, 1, 7, tzinfo=timezone.utc))]
+    strava.access_token = "rotated-elsewhere"
+
+    assert client.post("/strava/sync").json()["mirrored"] == 1
+    assert strava.refresh_count == 1
+    assert main.load_tokens()["access_token"] == strava.access_token
+    assert main.load_tokens()["athlete"]["id"] == 42
+
+
+def test_sync_retries_rate_limits_and_server_errors(client, strava):
+    strava.activities = [make_activity(1, datetime(2024, 3, 1, 7, tzinfo=timezone.utc))]
+    strava.fail_with = [429, 503]
+
+    assert client.post("/strava/sync").json()["mirrored"] == 1
+    assert len(_activity_requests(strava)) == 3
+
+
+def test_cursor_rereads_the_newest_second(client, strava):
+    start = datetime(2024, 3, 1, 7, tzinfo=timezone.utc)
+    strava.activities = [make_activity(1, start), make_activity(2, start + timedelta(hours=1))]
+    client.post("/strava/sync")
+    with main.get_db() as db:
+        cursor = int(db.execute("SELECT value FROM strava_sync_state WHERE key = 'sync_cursor'").fetchone()[0])
+    assert cursor == int((start + timedelta(hours=1)).timestamp()) - 1
+
+    # Another activity sharing the newest start second, e.g. past a page cut.
+    strava.activities.append(make_activity(3, start + timedelta(hours=1)))
+    body = client.post("/strava/sync").json()
+
+    assert body["mirrored"] == 3
+    assert _mirrored_ids() == {"1", "2", "3"}
+
+
+def test_backfill_keeps_activities_split_across_pages(client, strava, monkeypatch):
+    monkeypatch.setattr(main, "STRAVA_BACKFILL_PER_PAGE", 2)
+    start = datetime(2024, 3, 1, 7, tzinfo=timezone.utc)
+    same_second = start + timedelta(days=1)
+    strava.activities = [
+        make_activity(1, start),
+        make_activity(2, same_second),
+        make_activity(3, same_second),
+        make_activity(4, same_second + timedelta(days=1)),
+        make_activity(5, same_second + timedelta(days=2)),
+    ]
+
+    main.start_strava_backfill(restart=True)
+    main._strava_backfill_thread.join(timeout=10)
+
+    assert main.strava_backfill_state()["status"] == "done"
+    assert _mirrored_ids() == {"1", "2", "3", "4", "5"}
@@ -0,0 +1,90 @@
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from app import main
+from strava_stub import make_activity
+
+EVENTS = Path(__file__).parent / "fixtures" / "strava_webhook"
+
+
+def _event(name: str) -> dict:
+    return json.loads((EVENTS / f"{name}.json").read_text())
+
+
+def _row(sql: str, *params):
+    with main.get_db() as db:
+        return db.execute(sql, params).fetchone()
+
+
+@pytest.fixture
+def mirrored(client, strava):
+    strava.activities = [
+        make_activity(1001, datetime(2024, 3, 1, 7, tzinfo=timezone.utc), name="Morning Ride", type="Ride"),
+        make_activity(1002, datetime(2024, 3, 2, 7, tzinfo=timezone.utc), name="Easy Spin", type="Ride"),
+    ]
+    return strava
+
+
+def _replay(client, name: str) -> None:
+    assert client.post("/strava/webhook", json=_event(name)).json() == {"ok": True}
+
+
+def test_create_fetches_only_that_activity(client, mirrored):
+    _replay(client, "create")
+
+    payload = json.loads(_row("SELECT payload_json FROM strava_activities WHERE id = '1001'")["payload_json"])
+    assert payload["name"] == "Morning Ride"
+    assert _row("SELECT id FROM activity_view WHERE id = '1001'")
+    assert _row("SELECT sport_key, date FROM activity_load WHERE source_id = '1001'")[:] == ("ride", "2024-03-01")
+    assert [path for path, _, _ in mirrored.requests] == ["/api/v3/activities/1001"]
+    assert _row("SELECT value FROM strava_sync_state WHERE key = 'last_webhook_at'")
+
+
+def test_update_applies_title_and_type_without_api_calls(client, mirrored):
+    _replay(client, "create")
+    mirrored.requests.clear()
+
+    _replay(client, "update")
+
+    payload = json.loads(_row("SELECT payload_json FROM strava_activities WHERE id = '1001'")["payload_json"])
+    assert (payload["name"], payload["type"]) == ("Tempo intervals", "Run")
+    view = json.loads(_row("SELECT row_json FROM activity_view WHERE id = '1001'")["row_json"])
+    assert view["name"] == "Tempo intervals"
+    assert _row("SELECT sport_key FROM activity_load WHERE source_id = '1001'")["sport_key"] == "run"
+    assert mirrored.requests == []
+
+
+def test_delete_removes_mirror_view_and_load(client, mirrored):
+    _replay(client, "create")
+
+    _replay(client, "delete")
+
+    assert _row("SELECT id FROM strava_activities WHERE id = '1001'") is None
+    assert _row("SELECT id FROM activity_view WHERE id = '1001'") is None
+    assert _row("SELECT source_id FROM activity_load WHERE source_id = '1001'") is None
+    assert _row("SELECT tss FROM daily_load WHERE date = '2024-03-01'") is None
+
+
+def test_deauthorize_drops_mirror_and_tokens(client, mirrored):
+    client.post("/strava/sync")
+    assert _row("SELECT COUNT(*) FROM strava_activities")[0] == 2
+
+    _replay(client, "deauthorize")
+
+    assert _row("SELECT COUNT(*) FROM strava_activities")[0] == 0
+    assert _row("SELECT COUNT(*) FROM activity_view")[0] == 0
+    assert _row("SELECT COUNT(*) FROM activity_load WHERE source_id IN ('1001', '1002')")[0] == 0
+    assert _row("SELECT value FROM strava_sync_state WHERE key = 'sync_cursor'") is None
+    assert not main.TOKEN_FILE.exists()
+    assert client.get("/strava-status").json()["connected"] is False
+
+
+def test_events_for_another_athlete_are_ignored(client, mirrored):
+    event = {**_event("create"), "owner_id": 7}
+
+    assert client.post("/strava/webhook", json=event).json() == {"ok": True}
+    assert _row("SELECT id FROM strava_activities WHERE id = '1001'") is None
+    assert mirrored.requests == []
@@ -0,0 +1,64 @@
+import json
+import os
+
+import pytest
+
+from app import main
+
+
+@pytest.fixture
+def workout_dir(data_dir):
+    main.init_db()
+    with main.get_db() as db:
+        db.execute("INSERT INTO fit_series (fit_id, format_version, version) VALUES ('w1', 1, 1)")
+    path = data_dir.parent / main.TP_EXPORT_WORKOUT_ROOTS[0] / "w1"
+    path.mkdir(parents=True)
+    return path
+
+
+def _write(path, payload, bump_ns=0):
+    path.write_text(json.dumps(payload))
+    if bump_ns:
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump_ns))
+
+
+def _version():
+    with main.get_db() as db:
+        return db.execute("SELECT version FROM fit_series WHERE fit_id = 'w1'").fetchone()["version"]
+
+
+def test_lap_changes_bump_the_fit_series_version(workout_dir):
+    laps = workout_dir / "detaildata.json"
+    _write(laps, {"lapsStats": [{"begin": 0, "end": 600000, "elapsedTime": 600000}]})
+    main.refresh_tp_export_index()
+    first = _version()
+    assert first != 1
+
+    main.refresh_tp_export_index()
+    assert _version() == first
+
+    _write(laps, {"lapsStats": [{"begin": 0, "end": 300000}, {"begin": 300000, "end": 600000}]}, bump_ns=10**9)
+    main.refresh_tp_export_index()
+    second = _version()
+    assert second != first
+
+    # Touched but identical content leaves cached /fit responses valid.
+    _write(laps, {"lapsStats": [{"begin": 0, "end": 300000}, {"begin": 300000, "end": 600000}]}, bump_ns=2 * 10**9)
+    main.refresh_tp_export_index()
+    assert _version() == second
+
+    laps.unlink()
+    main.refresh_tp_export_index()
+    assert _version() != second
+
+
+def test_start_time_changes_bump_the_fit_series_version(workout_dir):
+    workout = workout_dir / "workout.json"
+    _write(workout, {"startTime": "2024-05-01T07:00:00"})
+    assert main.refresh_tp_export_index() == ["w1"]
+    first = _version()
+
+    _write(workout, {"startTime": "2024-05-01T08:30:00"}, bump_ns=10**9)
+    assert main.refresh_tp_export_index() == ["w1"]
+    assert _version() != first
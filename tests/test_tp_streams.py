@@ -0,0 +1,58 @@
+import gzip
+import json
+
+import pytest
+
+from app import main
+
+
+@pytest.fixture
+def tp_workout(client):
+    samples = [{"ms": i * 1000, "values": [120 + i % 10, 200 + i % 50, 8.0, i * 8.0]} for i in range(600)]
+    with main.get_db() as db:
+        db.execute(
+            "CREATE TABLE tp_streams (workout_id TEXT, channel_set_json TEXT, samples_gzip BLOB, encoding TEXT)"
+        )
+        db.execute(
+            "INSERT INTO tp_streams VALUES (?, ?, ?, 'gzip')",
+            ("w1", json.dumps(["heartRate", "power", "speed", "distance"]), gzip.compress(json.dumps(samples).encode())),
+        )
+        db.execute(
+            "INSERT INTO activities (id, source, type, start_date_local, fit_id, tss_override, if_value, hidden) "
+            "VALUES ('tp-1', 'fit', 'Ride', '2024-05-01T07:00:00', 'w1', 50, 0.7, 0)"
+        )
+    return "w1"
+
+
+def _summary(response):
+    return response.json()["summary"]
+
+
+def test_summary_follows_activity_row_edits(client, tp_workout):
+    first = client.get(f"/fit/{tp_workout}")
+    assert _summary(first)["tss"] == 50
+    with main.get_db() as db:
+        version = db.execute("SELECT version FROM fit_series WHERE fit_id = ?", (tp_workout,)).fetchone()[0]
+
+    client.put("/activities/tp-1/meta", json={"tss_override": 80})
+    edited = client.get(f"/fit/{tp_workout}", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert edited.status_code == 200
+    assert _summary(edited)["tss"] == 80
+    assert _summary(edited)["if"] == 0.7
+    assert _summary(edited)["avg_hr"] == pytest.approx(124.5)
+    windowed = client.get(f"/fit/{tp_workout}", params={"points": 50})
+    assert _summary(windowed)["tss"] == 80
+    # Summary edits are served from the row without decoding the stream again.
+    with main.get_db() as db:
+        assert db.execute("SELECT version FROM fit_series WHERE fit_id = ?", (tp_workout,)).fetchone()[0] == version
+
+
+def test_start_change_places_the_stream_again(client, tp_workout):
+    client.get(f"/fit/{tp_workout}")
+
+    client.put("/activities/tp-1/meta", json={"start_date_local": "2024-05-02T09:30:00"})
+    moved = client.get(f"/fit/{tp_workout}").json()
+
+    assert moved["summary"]["start"] == "2024-05-02T09:30:00"
+    assert moved["series"][0]["timestamp"] == "2024-05-02T09:30:00"
@@ -0,0 +1,48 @@
+import threading
+import time
+
+from app import main
+
+
+def _wait_for(predicate, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_restart_does_not_block_on_running_job(data_dir):
+    main.init_db()
+    old_ranges = {"ride": [("2024-01-01", "2024-02-01")]}
+    main.start_tss_recalc(old_ranges)
+    old_stop = main._tss_recalc_stop
+    main._tss_recalc_thread.join()
+
+    # Stand in for a job stuck mid-batch: it only exits a while after being
+    # cancelled, then tries to report its own final status.
+    release = threading.Event()
+
+    def slow_job():
+        old_stop.wait()
+        release.wait(10)
+        main._update_tss_recalc(old_stop, status="cancelled", done=99)
+
+    main._tss_recalc_thread = threading.Thread(target=slow_job, daemon=True)
+    main._tss_recalc_thread.start()
+    main._tss_recalc_state["ranges"] = old_ranges
+    main._tss_recalc_state["status"] = "running"
+
+    started = time.monotonic()
+    state = main.start_tss_recalc({"run": [("2024-03-01", None)]})
+    assert time.monotonic() - started < 1.0
+
+    assert old_stop.is_set()
+    assert state["status"] == "running"
+    assert state["ranges"] == {"run": [("2024-03-01", None)], "ride": [("2024-01-01", "2024-02-01")]}
+
+    release.set()
+    _wait_for(lambda: main.tss_recalc_state()["status"] != "running")
+    final = main.tss_recalc_state()
+    assert final["status"] == "done"
+    assert final["done"] == 0
+    main.stop_tss_recalc()
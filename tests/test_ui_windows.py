@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta, timezone
+
+from app import main
+from strava_stub import make_activity
+
+
+def _mirror(rows) -> None:
+    with main.get_db() as db:
+        main._upsert_strava_activities(db, rows)
+
+
+def test_activity_window_pages_with_cursor(client):
+    start = datetime(2024, 1, 1, 7, tzinfo=timezone.utc)
+    # Two activities a day, so pages split inside a day.
+    _mirror([make_activity(100 + i, start + timedelta(hours=12 * i)) for i in range(60)])
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"from": "2024-01-05", "to": "2024-01-20", "limit": 7}
+        if cursor:
+            params["cursor"] = cursor
+        resp = client.get("/ui/activities", params=params)
+        seen.extend(row["start_date_local"] for row in resp.json())
+        pages += 1
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert len(seen) == 32
+    assert seen == sorted(seen)
+    assert seen[0].startswith("2024-01-05") and seen[-1].startswith("2024-01-20")
+    assert pages == 5
+
+
+def test_calendar_items_filter_by_kind_without_a_window(client):
+    for kind, day in (("event", "2025-09-01"), ("goal", "2023-01-01"), ("workout", "2024-06-01")):
+        assert client.post("/calendar-items", json={"kind": kind, "date": day, "title": kind}).status_code == 200
+
+    events = client.get("/calendar-items", params={"kind": "event"}).json()
+    window = client.get("/calendar-items", params={"from": "2024-05-01", "to": "2024-06-30"}).json()
+
+    assert [item["date"] for item in events] == ["2025-09-01"]
+    assert [item["kind"] for item in window] == ["workout"]